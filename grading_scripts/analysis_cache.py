@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for per-file analysis results.
+
+Tier 2 analyzers (docstring scanning, notebook analysis, ...) store their
+result for a file under the SHA-256 of the file's contents, so a file that
+is unchanged between two submissions - or shared by several students - is
+analyzed once. Entries live in .tier2_analysis_cache/<analyzer>-v<version>/,
+one small JSON per digest (sharded by the first two hex digits), so worker
+processes can write concurrently without a shared index file. Bumping an
+analyzer's version starts a fresh namespace.
+
+Reads touch the entry's mtime, so evict() can trim the whole cache to a
+size limit by deleting the least recently used entries first.
+
+analyze_files() is the shared driver of the analyzers: cache lookups, the
+analysis of the remaining files (in-process, or across a process pool for
+the CLIs) and storing fresh results. parse_python() keeps recently parsed
+Python trees in memory, so the analyzers looking at the same sources during
+one assessment parse each of them once.
+
+Usage:
+    python grading_scripts/analysis_cache.py            # show cache size per analyzer
+    python grading_scripts/analysis_cache.py --limit-mb 256   # evict down to 256 MB
+    python grading_scripts/analysis_cache.py --clear    # delete the cache
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+CACHE_DIR = Path(".tier2_analysis_cache")
+
+# Default size limit enforced by evict()
+DEFAULT_LIMIT_BYTES = 512 << 20
+
+# evict() trims to this fraction of the limit, leaving room before the next eviction
+EVICT_TARGET = 0.9
+
+# Below this many uncached files, analyzing in-process beats starting a pool
+PARALLEL_MIN_FILES = 200
+
+# Source bytes whose parsed trees parse_python() keeps in memory; a tree
+# takes roughly 45 times the size of its source, so this is about 180 MB
+AST_MEMO_BYTES = 4 << 20
+
+_AST_MEMO = OrderedDict()
+_AST_MEMO_GUARD = threading.Lock()
+_ast_memo_bytes = 0
+
+
+def content_digest(data):
+    """SHA-256 hex digest of a file's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisCache:
+    """Results of one analyzer version, keyed by content digest."""
+
+    def __init__(self, analyzer, version, cache_dir=CACHE_DIR):
+        self.directory = Path(cache_dir) / f"{analyzer}-v{version}"
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, digest):
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, digest):
+        """The cached result for digest, or None. A hit marks the entry as recently used."""
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, digest, result):
+        """Store result atomically; a failed write only costs a future re-analysis."""
+        path = self._path(digest)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=path.parent)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def parse_python(data):
+    """
+    The ast.Module of a Python source (bytes), or None if it does not parse.
+    Trees are shared between callers, so they must not be modified. The
+    least recently used trees are dropped once their sources add up to more
+    than AST_MEMO_BYTES.
+    """
+    global _ast_memo_bytes
+    with _AST_MEMO_GUARD:
+        entry = _AST_MEMO.get(data)
+        if entry is None:
+            entry = _AST_MEMO[data] = [threading.Lock(), None, False]
+            _ast_memo_bytes += len(data)
+            while _ast_memo_bytes > AST_MEMO_BYTES and len(_AST_MEMO) > 1:
+                evicted, _ = _AST_MEMO.popitem(last=False)
+                _ast_memo_bytes -= len(evicted)
+        else:
+            _AST_MEMO.move_to_end(data)
+
+    # Parsed under the entry's own lock: concurrent callers wait for the first parse
+    with entry[0]:
+        if not entry[2]:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    entry[1] = ast.parse(data.decode('utf-8', errors='replace'))
+            except (SyntaxError, ValueError):
+                entry[1] = None
+            entry[2] = True
+    return entry[1]
+
+
+def _analyze_path(task):
+    """Read and analyze one file. Runs inside a worker process when the pool is used."""
+    analyze, abs_path, ext, by_ext = task
+    try:
+        with open(abs_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return analyze(data, ext) if by_ext else analyze(data)
+
+
+def analyze_files(repo_files, analyze, cache=None, workers=1, by_ext=False):
+    """
+    Run analyze(data) - analyze(data, ext) with by_ext - over RepoFiles.
+    Results come from cache when it has them (keyed by content digest, and
+    by extension as well with by_ext); the rest are analyzed and stored.
+    With workers > 1 and at least PARALLEL_MIN_FILES uncached files they are
+    analyzed across a process pool; analyze must then be a module-level
+    function. Returns ({path: result}, number of files analyzed now).
+    """
+    results = {}
+    pending = []
+    for repo_file in repo_files:
+        if cache is None:
+            pending.append((repo_file, None))
+            continue
+
+        data = repo_file.read_bytes()
+        digest = content_digest(repo_file.ext.encode('utf-8') + b'\0' + data if by_ext else data)
+        cached = cache.get(digest)
+        if cached is not None:
+            results[repo_file.path] = cached
+        else:
+            pending.append((repo_file, digest))
+
+    if workers > 1 and len(pending) >= PARALLEL_MIN_FILES:
+        tasks = [(analyze, repo_file.abs_path, repo_file.ext, by_ext) for repo_file, _ in pending]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            analyzed = list(executor.map(_analyze_path, tasks, chunksize=32))
+    elif by_ext:
+        analyzed = [analyze(repo_file.read_bytes(), repo_file.ext) for repo_file, _ in pending]
+    else:
+        analyzed = [analyze(repo_file.read_bytes()) for repo_file, _ in pending]
+
+    for (repo_file, digest), result in zip(pending, analyzed):
+        if result is None:
+            continue
+        results[repo_file.path] = result
+        if cache is not None:
+            cache.put(digest, result)
+
+    return results, len(pending)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=DEFAULT_LIMIT_BYTES):
+    """
+    Delete least recently used entries until the cache is under max_bytes
+    (trimming to EVICT_TARGET of it). Returns (entries removed, bytes remaining).
+    """
+    entries = []
+    total = 0
+    for path in Path(cache_dir).glob("*/*/*.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return 0, total
+
+    removed = 0
+    target = max_bytes * EVICT_TARGET
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed, total
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the Tier 2 analysis cache")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR), help=f"Cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached result")
+    parser.add_argument("--limit-mb", type=float, help="Evict least recently used entries down to this size")
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir)
+    if args.clear:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        print(f"Cleared {cache_dir}")
+    elif args.limit_mb is not None:
+        removed, remaining = evict(cache_dir, int(args.limit_mb * (1 << 20)))
+        print(f"Evicted {removed} entries; {remaining / (1 << 20):.1f} MB remaining")
+    elif not cache_dir.exists():
+        print(f"No cache at {cache_dir}")
+    else:
+        for namespace in sorted(p for p in cache_dir.iterdir() if p.is_dir()):
+            entries = list(namespace.glob("*/*.json"))
+            size = sum(entry.stat().st_size for entry in entries)
+            print(f"{namespace.name}: {len(entries)} entries ({size / 1024:.0f} KB)")
@@ -2,16 +2,159 @@
 """
 Clean up old Complete_Submission PDFs and create new merged PDFs
 with the Detailed_Feedback_Report and submission PDFs.
+
+Pages are streamed to the output one object at a time (see pdf_merge.py),
+so memory does not grow with the size of a student's upload, and students
+can be merged concurrently with --workers.
+
+A manifest in the submissions folder records the hashes of the inputs each
+Complete_Submission was built from; unchanged students are skipped. Merges
+are written to a temp file and renamed into place, so an interrupted run
+never leaves a student without a merged PDF.
 """
+import argparse
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from PyPDF2 import PdfMerger
 
-def cleanup_and_merge_reports(submissions_dir):
+from pdf_merge import merge_pdfs
+from file_utils import file_sha256, load_manifest, save_manifest, set_default_mode
+
+MERGE_MANIFEST_NAME = ".merge_manifest.json"
+
+# Bump whenever the merged PDF layout changes so every student is re-merged
+MERGE_VERSION = "1"
+
+# PDFs in a participant folder that are grading artifacts, not the submission
+GENERATED_PDF_MARKERS = [
+    "Detailed_Feedback_Report",
+    "Complete_Submission",
+    "Grade_Report",
+    "Detailed_Grade_Breakdown",
+]
+
+def find_submission_pdf(participant_dir):
+    """Return the student's own PDF in participant_dir (None if there is none)."""
+    for pdf_file in participant_dir.glob("*.pdf"):
+        # Skip the detailed report, old complete submission and other reports
+        if any(marker in pdf_file.name for marker in GENERATED_PDF_MARKERS):
+            continue
+
+        # This should be the submission PDF
+        return pdf_file
+
+    return None
+
+def merge_student(task):
+    """Merge one student's PDFs. Runs inside a worker process when workers > 1."""
+    student_id, detailed_report, submission_pdf, output_path = task
+
+    # Write next to the final file and rename, so readers never see a partial PDF
+    fd, tmp_path = tempfile.mkstemp(prefix=".merge_", suffix=".pdf.tmp", dir=output_path.parent)
+    os.close(fd)
+
+    try:
+        report_pages, submission_pages = merge_pdfs(tmp_path, [detailed_report, submission_pdf])
+        set_default_mode(tmp_path)
+        os.replace(tmp_path, output_path)
+        return student_id, report_pages, submission_pages, None
+    except Exception as e:
+        return student_id, 0, 0, str(e)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def run_merges(tasks, workers=1):
+    """Merge every task and yield results in task order, across a process pool if workers > 1."""
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield merge_student(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(merge_student, tasks)
+
+def _input_fingerprint(path, previous):
     """
-    1. Delete old Student_*_Complete_Submission.pdf files
-    2. Find submission PDFs and Detailed_Feedback_Report PDFs
-    3. Merge them into new Complete_Submission PDFs
+    Describe an input file by size, mtime and SHA-256. The hash recorded in
+    previous is reused when size and mtime are unchanged, so current students
+    cost a stat() instead of a full read.
+    """
+    stat = path.stat()
+    if (previous and previous.get('size') == stat.st_size
+            and previous.get('mtime_ns') == stat.st_mtime_ns and previous.get('sha256')):
+        sha256 = previous['sha256']
+    else:
+        sha256 = file_sha256(path)
+
+    return {'name': path.name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+
+def _is_current(entry, report, submission, output_path):
+    """True when output_path was merged from exactly these inputs."""
+    return (
+        output_path.exists()
+        and entry.get('merge_version') == MERGE_VERSION
+        and entry.get('report', {}).get('sha256') == report['sha256']
+        and entry.get('submission', {}).get('sha256') == submission['sha256']
+        and entry.get('submission', {}).get('name') == submission['name']
+    )
+
+def prepare_student_merge(participant_dir, entries, force=False):
+    """
+    Decide what to do for one participant folder. Returns (student_id, action, detail):
+      'missing' - an input is missing; detail is (reason, stale_pdf_deleted)
+      'current' - the merged PDF matches the manifest; detail is None
+      'merge'   - detail is (task, fingerprints) for merge_student/record_merge
+    """
+    # Extract student ID
+    student_id = participant_dir.name.split("_")[1]
+
+    # Find the submission PDF and detailed feedback report
+    detailed_report = participant_dir / f"Detailed_Feedback_Report_{student_id}.pdf"
+    submission_pdf = find_submission_pdf(participant_dir)
+    output_path = participant_dir / f"Student_{student_id}_Complete_Submission.pdf"
+
+    skip_reason = None
+    if not submission_pdf or not submission_pdf.exists():
+        skip_reason = "Missing submission PDF"
+    elif not detailed_report.exists():
+        skip_reason = f"Missing Detailed_Feedback_Report_{student_id}.pdf"
+
+    if skip_reason:
+        # A merged PDF built from inputs that no longer exist is stale
+        deleted = output_path.exists()
+        if deleted:
+            output_path.unlink()
+        entries.pop(student_id, None)
+        return student_id, 'missing', (skip_reason, deleted)
+
+    # Compare the inputs with the manifest
+    entry = entries.get(student_id, {})
+    report = _input_fingerprint(detailed_report, entry.get('report'))
+    submission = _input_fingerprint(submission_pdf, entry.get('submission'))
+
+    if not force and _is_current(entry, report, submission, output_path):
+        return student_id, 'current', None
+
+    # Detailed Report FIRST, then Submission
+    task = (student_id, detailed_report, submission_pdf, output_path)
+    return student_id, 'merge', (task, (report, submission))
+
+def record_merge(entries, student_id, fingerprints):
+    """Record a successful merge in the manifest entries."""
+    report, submission = fingerprints
+    entries[student_id] = {
+        'merge_version': MERGE_VERSION,
+        'report': report,
+        'submission': submission,
+    }
+
+def cleanup_and_merge_reports(submissions_dir, workers=1, force=False):
+    """
+    1. Find submission PDFs and Detailed_Feedback_Report PDFs
+    2. Skip students whose inputs match the merge manifest
+    3. Merge the rest into new Complete_Submission PDFs (atomic replace)
     """
 
     submissions_path = Path(submissions_dir)
@@ -23,14 +166,22 @@ def cleanup_and_merge_reports(submissions_dir):
     print("CLEANUP AND MERGE ASSIGNMENT 1 REPORTS")
     print("=" * 70)
 
+    manifest_path = submissions_path / MERGE_MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    entries = manifest.setdefault('students', {})
+
     stats = {
         'folders_found': 0,
-        'old_pdfs_deleted': 0,
+        'up_to_date': 0,
+        'stale_pdfs_deleted': 0,
         'merges_successful': 0,
         'merges_failed': 0,
         'missing_files': 0
     }
 
+    tasks = []
+    fingerprints = {}
+
     # Process each student folder
     for participant_dir in sorted(submissions_path.glob("Participant_*_assignsubmission_file")):
         if not participant_dir.is_dir():
@@ -38,98 +189,66 @@ def cleanup_and_merge_reports(submissions_dir):
 
         stats['folders_found'] += 1
 
-        # Extract student ID
-        student_id = participant_dir.name.split("_")[1]
-
-        print(f"\n[Student {student_id}]")
-
-        # Step 1: Delete old Complete_Submission PDF
-        old_complete_pdf = participant_dir / f"Student_{student_id}_Complete_Submission.pdf"
-        if old_complete_pdf.exists():
-            old_complete_pdf.unlink()
-            stats['old_pdfs_deleted'] += 1
-            print(f"  - Deleted old: Student_{student_id}_Complete_Submission.pdf")
-
-        # Step 2: Find the submission PDF and detailed feedback report
-        submission_pdf = None
-        detailed_report = participant_dir / f"Detailed_Feedback_Report_{student_id}.pdf"
-
-        # Find submission PDF (various possible names)
-        possible_submission_names = [
-            f"submission_form.pdf",
-            f"submission.pdf",
-            f"Assignment_1_Cover_Page.pdf",
-            f"Assignment 1 - Cover Page.pdf"
-        ]
-
-        for pdf_file in participant_dir.glob("*.pdf"):
-            # Skip if it's the detailed report or old complete submission
-            if "Detailed_Feedback_Report" in pdf_file.name:
-                continue
-            if "Complete_Submission" in pdf_file.name:
-                continue
-            if "Grade_Report" in pdf_file.name:
-                continue
-            if "Detailed_Grade_Breakdown" in pdf_file.name:
-                continue
-
-            # This should be the submission PDF
-            submission_pdf = pdf_file
-            break
-
-        # Step 3: Verify both files exist
-        if not submission_pdf or not submission_pdf.exists():
-            print(f"  [SKIP] Missing submission PDF")
-            stats['missing_files'] += 1
-            continue
+        student_id, action, detail = prepare_student_merge(participant_dir, entries, force)
 
-        if not detailed_report.exists():
-            print(f"  [SKIP] Missing Detailed_Feedback_Report_{student_id}.pdf")
+        if action == 'missing':
+            skip_reason, deleted = detail
+            print(f"\n[Student {student_id}]")
+            if deleted:
+                stats['stale_pdfs_deleted'] += 1
+                print(f"  - Deleted stale: Student_{student_id}_Complete_Submission.pdf")
+            print(f"  [SKIP] {skip_reason}")
             stats['missing_files'] += 1
-            continue
-
-        # Step 4: Merge PDFs (Detailed Report FIRST, then Submission)
-        output_path = participant_dir / f"Student_{student_id}_Complete_Submission.pdf"
-
-        try:
-            merger = PdfMerger()
-
-            # Add detailed feedback report FIRST
-            merger.append(str(detailed_report))
-            report_pages = len(merger.pages)
-
-            # Add submission PDF SECOND
-            merger.append(str(submission_pdf))
-            total_pages = len(merger.pages)
-            submission_pages = total_pages - report_pages
-
-            # Write merged PDF
-            merger.write(str(output_path))
-            merger.close()
-
-            print(f"  [OK] Merged: {report_pages} report pages + {submission_pages} submission pages = {total_pages} total")
-            print(f"       Output: Student_{student_id}_Complete_Submission.pdf")
-            stats['merges_successful'] += 1
-
-        except Exception as e:
-            print(f"  [FAIL] Merge error: {e}")
-            stats['merges_failed'] += 1
+        elif action == 'current':
+            stats['up_to_date'] += 1
+        else:
+            task, fingerprints[student_id] = detail
+            tasks.append(task)
+
+    print(f"\nMerging {len(tasks)} students ({stats['up_to_date']} up to date)...")
+
+    try:
+        for student_id, report_pages, submission_pages, error in run_merges(tasks, workers):
+            print(f"\n[Student {student_id}]")
+            if error is None:
+                total_pages = report_pages + submission_pages
+                print(f"  [OK] Merged: {report_pages} report pages + {submission_pages} submission pages = {total_pages} total")
+                print(f"       Output: Student_{student_id}_Complete_Submission.pdf")
+                record_merge(entries, student_id, fingerprints[student_id])
+                stats['merges_successful'] += 1
+            else:
+                print(f"  [FAIL] Merge error: {error}")
+                stats['merges_failed'] += 1
+    finally:
+        # Record finished merges even if the run is interrupted
+        save_manifest(manifest_path, manifest)
 
     # Print summary
     print("\n" + "=" * 70)
     print("SUMMARY")
     print("=" * 70)
     print(f"Student folders found: {stats['folders_found']}")
-    print(f"Old Complete_Submission PDFs deleted: {stats['old_pdfs_deleted']}")
+    print(f"Up to date (skipped): {stats['up_to_date']}")
     print(f"Successful merges: {stats['merges_successful']}")
     print(f"Failed merges: {stats['merges_failed']}")
     print(f"Missing files (skipped): {stats['missing_files']}")
+    if stats['stale_pdfs_deleted']:
+        print(f"Stale Complete_Submission PDFs deleted: {stats['stale_pdfs_deleted']}")
     print("=" * 70)
 
-    if stats['merges_successful'] == stats['folders_found']:
+    if stats['merges_successful'] + stats['up_to_date'] == stats['folders_found']:
         print("\nSUCCESS: All reports merged successfully!")
     else:
-        print(f"\nWARNING: {stats['folders_found'] - stats['merges_successful']} students not processed")
+        print(f"\nWARNING: {stats['folders_found'] - stats['merges_successful'] - stats['up_to_date']} students not processed")
 
 if __name__ == '__main__':
-    cleanup_and_merge_reports("WorkSubmissions01")
+    parser = argparse.ArgumentParser(description="Merge feedback reports with submission PDFs")
+    parser.add_argument("submissions_dir", nargs="?", default="WorkSubmissions01",
+                        help="WorkSubmissions folder to process (default: WorkSubmissions01)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to merge students (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-merge every student, ignoring the merge manifest")
+    args = parser.parse_args()
+
+    cleanup_and_merge_reports(args.submissions_dir, workers=args.workers, force=args.force)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Inverted term index over the documentation files of a student repository.
+
+project_planning and costs_pricing both classify documents by their words
+("functional requirements", "success metrics", "per 1K tokens", "budget").
+Instead of each skill running its regexes over every document, the docs
+(.md, .rst, .txt, .ipynb) are tokenized once per repository into a
+positional inverted index (term -> {doc: [positions]}) with their Markdown
+headings, and every query is answered from the index: term counts, prefix
+lookups against the vocabulary and phrase matches anchored on a posting
+list. The index is built on first use and shared by all skills scoring the
+same RepoIndex.
+
+Usage:
+    python grading_scripts/doc_index.py path/to/repo [phrase ...]
+"""
+import re
+import threading
+import weakref
+
+DOC_INDEX_EXTS = ('.md', '.rst', '.txt', '.ipynb')
+
+# Documents larger than this are not indexed
+MAX_DOC_SIZE = 2 << 20
+
+# Words, numbers (with their unit: 1k, 0.002, 1,000) and the $ and / signs of prices
+TOKEN = re.compile(r'\$|/|\d+(?:[.,]\d+)*\w*|\w+')
+HEADING = re.compile(r'^#{1,6}\s*(.+?)\s*#*\s*$', re.MULTILINE)
+
+_INDEXES = weakref.WeakKeyDictionary()
+_INDEXES_GUARD = threading.Lock()
+
+
+def tokenize(text):
+    """Lower-case tokens of text."""
+    return TOKEN.findall(text.lower())
+
+
+def is_number(token):
+    """Query slot matching any number token."""
+    return token[0].isdigit()
+
+
+def starts_with(prefix):
+    """Query slot matching tokens that start with prefix."""
+    return lambda token: token.startswith(prefix)
+
+
+def phrase(*slots):
+    """
+    A phrase query: one slot per consecutive token. A slot is a term, a tuple
+    of alternative terms, or a predicate on the token; at least one slot must
+    be a term or tuple of terms.
+    """
+    query = []
+    for slot in slots:
+        if isinstance(slot, str):
+            slot = frozenset((slot,))
+        elif not callable(slot):
+            slot = frozenset(slot)
+        query.append(slot)
+    if not any(isinstance(slot, frozenset) for slot in query):
+        raise ValueError("a phrase needs at least one literal slot")
+    return tuple(query)
+
+
+class DocIndex:
+    """Tokens, headings and the positional inverted index of a set of documents."""
+
+    def __init__(self, docs):
+        self.docs = []
+        self.tokens = []
+        self.headings = []
+        self.postings = {}
+
+        for repo_file in docs:
+            if repo_file.size > MAX_DOC_SIZE:
+                continue
+            text = repo_file.read_text()
+            doc_id = len(self.docs)
+            tokens = tokenize(text)
+            self.docs.append(repo_file)
+            self.tokens.append(tokens)
+            self.headings.append([heading.lower() for heading in HEADING.findall(text)])
+            for position, token in enumerate(tokens):
+                self.postings.setdefault(token, {}).setdefault(doc_id, []).append(position)
+
+        self._ids = {repo_file.path: doc_id for doc_id, repo_file in enumerate(self.docs)}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def doc_id(self, repo_file):
+        """Position of repo_file in the index (None if it was not indexed)."""
+        return self._ids.get(repo_file.path)
+
+    def term_counts(self, *terms):
+        """{doc_id: occurrences of any of terms}."""
+        counts = {}
+        for term in terms:
+            for doc_id, positions in self.postings.get(term, {}).items():
+                counts[doc_id] = counts.get(doc_id, 0) + len(positions)
+        return counts
+
+    def prefix_docs(self, prefix):
+        """Ids of the documents containing a token that starts with prefix."""
+        found = set()
+        for term, docs in self.postings.items():
+            if term.startswith(prefix):
+                found.update(docs)
+        return found
+
+    def phrase_counts(self, query):
+        """{doc_id: occurrences of a phrase() query}."""
+        anchor = next(i for i, slot in enumerate(query) if isinstance(slot, frozenset))
+        counts = {}
+        for term in query[anchor]:
+            for doc_id, positions in self.postings.get(term, {}).items():
+                tokens = self.tokens[doc_id]
+                for position in positions:
+                    start = position - anchor
+                    if start < 0 or start + len(query) > len(tokens):
+                        continue
+                    if all(i == anchor or _slot_matches(slot, tokens[start + i]) for i, slot in enumerate(query)):
+                        counts[doc_id] = counts.get(doc_id, 0) + 1
+        return counts
+
+    def matches(self, doc_id, *queries):
+        """True if the document contains any of queries (terms or phrase() queries)."""
+        for query in queries:
+            if isinstance(query, str):
+                if doc_id in self.postings.get(query, {}):
+                    return True
+            elif doc_id in self.phrase_counts(query):
+                return True
+        return False
+
+    def heading_docs(self, keywords, exts=None):
+        """Ids of the documents with a heading containing one of keywords (optionally only exts)."""
+        return [doc_id for doc_id, headings in enumerate(self.headings)
+                if (exts is None or self.docs[doc_id].ext in exts)
+                and any(keyword in heading for heading in headings for keyword in keywords)]
+
+
+def _slot_matches(slot, token):
+    if isinstance(slot, frozenset):
+        return token in slot
+    return slot(token)
+
+
+def doc_index_for(index):
+    """The DocIndex of a RepoIndex, built once and shared by every caller."""
+    with _INDEXES_GUARD:
+        entry = _INDEXES.get(index)
+        if entry is None:
+            entry = _INDEXES[index] = [threading.Lock(), None]
+    lock = entry[0]
+    with lock:
+        if entry[1] is None:
+            entry[1] = DocIndex(index.with_ext(*DOC_INDEX_EXTS))
+    return entry[1]
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+
+    parser = argparse.ArgumentParser(description="Index a repository's documentation and count phrases")
+    parser.add_argument("repository", help="Path to the repository")
+    parser.add_argument("phrases", nargs="*", help="Phrases to count (e.g. 'success metrics')")
+    args = parser.parse_args()
+
+    index = build_repo_index(args.repository)
+    start = time.perf_counter()
+    docs = doc_index_for(index)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(docs)} documents, {sum(len(t) for t in docs.tokens)} tokens, "
+          f"{len(docs.postings)} terms indexed in {elapsed * 1000:.1f} ms")
+    for text in args.phrases:
+        counts = docs.phrase_counts(phrase(*tokenize(text)))
+        print(f"\n'{text}': {sum(counts.values())} occurrence(s)")
+        for doc_id, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {count:4d}  {docs.docs[doc_id].path}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+AST-based docstring and structure scanner for Python sources.
+
+Every .py file in a repository is parsed with ast and its modules, classes
+and functions are counted along with how many of each carry a docstring.
+Parse results are cached by file content (analysis_cache.py), so resubmitted
+or shared files are never parsed twice, and the tree is shared in memory with
+the other analyzers (test_analyzer.py, import_graph.py). The command line
+parses uncached files across a process pool once there are enough of them to
+pay for it; the library default is in-process, as the Tier 2 skills already
+run inside worker processes.
+
+Usage:
+    python grading_scripts/docstring_scanner.py path/to/repo
+    python grading_scripts/docstring_scanner.py path/to/repo --workers 4 --no-cache
+"""
+import ast
+import os
+
+from analysis_cache import AnalysisCache, analyze_files, parse_python
+
+# Bump when the per-file result below changes so cached parses are ignored
+SCANNER_VERSION = "1"
+
+# Undocumented definitions listed per file
+MAX_UNDOCUMENTED = 20
+
+KINDS = ('modules', 'classes', 'functions')
+
+
+def _is_public_api(name):
+    """Dunder methods other than __init__ are not expected to have docstrings."""
+    return not (name.startswith('__') and name.endswith('__')) or name == '__init__'
+
+
+def scan_source(data):
+    """
+    Parse one Python source and return its docstring counts:
+      {'parsed', 'lines', 'modules': [total, documented], 'classes': [...],
+       'functions': [...], 'undocumented': [qualified names]}
+    Functions nested inside functions are implementation details and skipped.
+    Sources that do not parse (e.g. Python 2) fall back to a textual check.
+    """
+    text = data.decode('utf-8', errors='replace')
+    result = {
+        'parsed': True,
+        'lines': text.count('\n') + (1 if text and not text.endswith('\n') else 0),
+        'modules': [1, 0],
+        'classes': [0, 0],
+        'functions': [0, 0],
+        'undocumented': [],
+    }
+
+    tree = parse_python(data)
+    if tree is None:
+        result['parsed'] = False
+        result['modules'][1] = int('"""' in text or "'''" in text)
+        return result
+
+    result['modules'][1] = int(ast.get_docstring(tree, clean=False) is not None)
+
+    stack = [(node, "") for node in tree.body]
+    while stack:
+        node, prefix = stack.pop()
+        if isinstance(node, ast.ClassDef):
+            kind = 'classes'
+            stack.extend((child, f"{prefix}{node.name}.") for child in node.body)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if not _is_public_api(node.name):
+                continue
+            kind = 'functions'
+        else:
+            continue
+
+        result[kind][0] += 1
+        if ast.get_docstring(node, clean=False) is not None:
+            result[kind][1] += 1
+        elif len(result['undocumented']) < MAX_UNDOCUMENTED:
+            result['undocumented'].append(f"{prefix}{node.name}")
+
+    result['undocumented'].sort()
+    return result
+
+
+def _has_docstring(file_result):
+    return file_result['modules'][1] > 0 or file_result['classes'][1] > 0 or file_result['functions'][1] > 0
+
+
+def summarize(file_results):
+    """Aggregate per-file results (path -> result) into repository totals."""
+    totals = {kind: [0, 0] for kind in KINDS}
+    syntax_errors = []
+    documented_files = 0
+
+    for path, file_result in file_results.items():
+        if not file_result['parsed']:
+            syntax_errors.append(path)
+        if _has_docstring(file_result):
+            documented_files += 1
+        for kind in KINDS:
+            totals[kind][0] += file_result[kind][0]
+            totals[kind][1] += file_result[kind][1]
+
+    definitions = sum(total for total, _ in totals.values())
+    docstring_count = sum(documented for _, documented in totals.values())
+    files = len(file_results)
+
+    return {
+        'files': files,
+        'lines': sum(file_result['lines'] for file_result in file_results.values()),
+        'syntax_errors': sorted(syntax_errors),
+        'docstring_count': docstring_count,
+        'definitions': definitions,
+        # Share of modules, classes and functions with a docstring
+        'docstring_coverage': round(docstring_count / definitions, 2) if definitions else 0.0,
+        # Share of files with at least one docstring (what the rubric grades)
+        'file_coverage': round(documented_files * 100 / files, 1) if files else 0.0,
+        'coverage_by_kind': {
+            kind: {'total': total, 'documented': documented,
+                   'coverage': round(documented / total, 2) if total else None}
+            for kind, (total, documented) in totals.items()
+        },
+    }
+
+
+def scan_repository(index, workers=1, use_cache=True):
+    """
+    Scan every non-empty .py file of a RepoIndex, across a process pool of
+    workers processes when there are many uncached files.
+    Returns (summary, {path: file result}); summary includes cache hit counts.
+    """
+    cache = AnalysisCache('docstrings', SCANNER_VERSION) if use_cache else None
+    py_files = [repo_file for repo_file in index.with_ext('.py') if repo_file.size > 0]
+    file_results, parsed_now = analyze_files(py_files, scan_source, cache, workers)
+
+    summary = summarize(file_results)
+    summary['cache_hits'] = cache.hits if cache else 0
+    summary['parsed_now'] = parsed_now
+    return summary, file_results
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+
+    parser = argparse.ArgumentParser(description="Report Python docstring coverage for a repository")
+    parser.add_argument("repository", help="Path to the repository")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to parse uncached files (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file, ignoring the cache")
+    parser.add_argument("--undocumented", action="store_true", help="List undocumented definitions per file")
+    args = parser.parse_args()
+
+    start = time.time()
+    summary, file_results = scan_repository(build_repo_index(args.repository), workers=args.workers,
+                                            use_cache=not args.no_cache)
+    elapsed = time.time() - start
+
+    print("=" * 70)
+    print(f"DOCSTRING SCAN: {args.repository}")
+    print("=" * 70)
+    print(f"Python files: {summary['files']} ({summary['lines']} lines), "
+          f"parsed {summary['parsed_now']}, cached {summary['cache_hits']} in {elapsed:.2f}s")
+    print(f"Docstrings: {summary['docstring_count']} of {summary['definitions']} definitions "
+          f"({summary['docstring_coverage']:.0%})")
+    for kind, counts in summary['coverage_by_kind'].items():
+        coverage = f"{counts['coverage']:.0%}" if counts['coverage'] is not None else "n/a"
+        print(f"  {kind}: {counts['documented']}/{counts['total']} ({coverage})")
+    print(f"Files with docstrings: {summary['file_coverage']}%")
+    if summary['syntax_errors']:
+        print(f"Could not parse: {', '.join(summary['syntax_errors'][:10])}")
+
+    if args.undocumented:
+        for path, file_result in sorted(file_results.items()):
+            if file_result['undocumented']:
+                print(f"\n{path}:")
+                for name in file_result['undocumented']:
+                    print(f"  - {name}")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+File helpers shared by the grading scripts: content hashing, JSON manifests
+written atomically, and default file modes for files created via mkstemp().
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """Load a JSON manifest, returning an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(manifest_path, manifest, indent=2):
+    """Write a JSON manifest atomically (temp file + rename)."""
+    manifest_path = os.fspath(manifest_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".manifest_", suffix=".tmp",
+                                    dir=os.path.dirname(manifest_path) or ".")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=indent, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def set_default_mode(path):
+    """Give a mkstemp() file (mode 0600) the mode a normally created file gets: 0666 minus the umask."""
+    # os.umask() can only be queried by setting it, so restore it straight away
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(path, 0o666 & ~umask)
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Pure-Python git history reader for the version_management skill.
+
+Reads refs, loose objects and packfiles (through their .idx v2 indexes)
+straight from a repository's .git directory - no git binary, no
+subprocesses. Every commit reachable from any branch, remote branch, tag
+or HEAD is visited exactly once, and the statistics the skill needs
+(commit and merge counts, message quality, authors, branches) are
+accumulated while walking, so nothing but the visited set is kept in
+memory.
+
+Usage:
+    python grading_scripts/git_history.py path/to/repo
+"""
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG, OBJ_OFS_DELTA, OBJ_REF_DELTA = 1, 2, 3, 4, 6, 7
+TYPE_NAMES = {b'commit': OBJ_COMMIT, b'tree': OBJ_TREE, b'blob': OBJ_BLOB, b'tag': OBJ_TAG}
+
+IDX_MAGIC = b'\377tOc'
+
+# Resolved delta bases kept per pack (commits rarely chain deeply)
+DELTA_BASE_CACHE = 64
+
+MEANINGFUL_MIN_LENGTH = 10
+TRIVIAL_COMMIT_MESSAGES = {
+    'update', 'updates', 'updated', 'fix', 'fixes', 'wip', 'commit', 'changes', 'change',
+    'initial commit', 'first commit', 'init', 'test', 'stuff', 'misc', '.', 'add files via upload',
+}
+CONVENTIONAL_PREFIXES = ('feat', 'fix', 'docs', 'style', 'refactor', 'perf', 'test', 'build', 'ci', 'chore', 'revert')
+
+
+class GitFormatError(Exception):
+    """Raised when the repository uses a layout this reader does not understand."""
+
+
+def find_git_dir(repo_path):
+    """Return the .git directory of repo_path (following 'gitdir:' files), or None."""
+    dot_git = Path(repo_path) / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding='utf-8', errors='replace').strip()
+        if content.startswith('gitdir:'):
+            git_dir = Path(content[len('gitdir:'):].strip())
+            git_dir = git_dir if git_dir.is_absolute() else Path(repo_path) / git_dir
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _apply_delta(base, delta):
+    """Rebuild an object from its base and a git delta instruction stream."""
+    pos = 0
+    # Source and target sizes (little-endian base-128); only the target size is needed
+    for _ in range(2):
+        shift = size = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+    target_size = size
+
+    out = bytearray()
+    length = len(delta)
+    while pos < length:
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = copy_size = 0
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    offset |= delta[pos] << (8 * bit)
+                    pos += 1
+            for bit in range(3):
+                if opcode & (0x10 << bit):
+                    copy_size |= delta[pos] << (8 * bit)
+                    pos += 1
+            out += base[offset:offset + (copy_size or 0x10000)]
+        elif opcode:
+            out += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise GitFormatError("invalid delta opcode 0")
+
+    if len(out) != target_size:
+        raise GitFormatError("delta produced an object of the wrong size")
+    return bytes(out)
+
+
+class PackFile:
+    """One pack-*.pack with its .idx, both memory-mapped."""
+
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path.with_suffix('.pack')
+        self._idx_file = open(idx_path, 'rb')
+        self._pack_file = open(self.pack_path, 'rb')
+        self.idx = mmap.mmap(self._idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.pack = mmap.mmap(self._pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._bases = OrderedDict()
+
+        if self.idx[:4] != IDX_MAGIC or struct.unpack('>I', self.idx[4:8])[0] != 2:
+            raise GitFormatError(f"unsupported pack index {idx_path.name} (only version 2 is read)")
+        if self.pack[:4] != b'PACK':
+            raise GitFormatError(f"{self.pack_path.name} is not a packfile")
+
+        self.fanout = struct.unpack('>256I', self.idx[8:8 + 1024])
+        self.count = self.fanout[255]
+        self._sha_start = 8 + 1024
+        self._offset_start = self._sha_start + self.count * 24      # after shas and CRCs
+        self._large_start = self._offset_start + self.count * 4
+
+    def close(self):
+        self.idx.close()
+        self.pack.close()
+        self._idx_file.close()
+        self._pack_file.close()
+
+    def _sha_at(self, position):
+        start = self._sha_start + position * 20
+        return self.idx[start:start + 20]
+
+    def find(self, sha):
+        """Pack offset of a binary sha, or None. Binary search within the fanout bucket."""
+        first = sha[0]
+        low = self.fanout[first - 1] if first else 0
+        high = self.fanout[first]
+
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._sha_at(middle)
+            if candidate < sha:
+                low = middle + 1
+            elif candidate > sha:
+                high = middle
+            else:
+                return self._offset_at(middle)
+        return None
+
+    def _offset_at(self, position):
+        start = self._offset_start + position * 4
+        offset = struct.unpack('>I', self.idx[start:start + 4])[0]
+        if offset & 0x80000000:
+            start = self._large_start + (offset & 0x7fffffff) * 8
+            offset = struct.unpack('>Q', self.idx[start:start + 8])[0]
+        return offset
+
+    def _inflate(self, pos, size):
+        """Inflate the zlib stream at pos into an object of size bytes."""
+        decompressor = zlib.decompressobj()
+        # Compressed data is rarely much larger than the object, so one read usually suffices
+        chunk = size + 512
+        data = decompressor.decompress(self.pack[pos:pos + chunk], size)
+        pos += chunk
+        while len(data) < size and not decompressor.eof and pos < len(self.pack):
+            data += decompressor.decompress(self.pack[pos:pos + 65536], size - len(data))
+            pos += 65536
+        return data
+
+    def read(self, offset, resolve_ref):
+        """Return (type, data) of the object at offset; resolve_ref(sha) loads REF_DELTA bases."""
+        cached = self._bases.get(offset)
+        if cached is not None:
+            self._bases.move_to_end(offset)
+            return cached
+
+        pos = offset
+        byte = self.pack[pos]
+        pos += 1
+        obj_type = (byte >> 4) & 7
+        size = byte & 0x0f
+        shift = 4
+        while byte & 0x80:
+            byte = self.pack[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+        if obj_type == OBJ_OFS_DELTA:
+            byte = self.pack[pos]
+            pos += 1
+            base_distance = byte & 0x7f
+            while byte & 0x80:
+                byte = self.pack[pos]
+                pos += 1
+                base_distance = ((base_distance + 1) << 7) | (byte & 0x7f)
+            base_type, base = self.read(offset - base_distance, resolve_ref)
+            result = (base_type, _apply_delta(base, self._inflate(pos, size)))
+        elif obj_type == OBJ_REF_DELTA:
+            base_sha = bytes(self.pack[pos:pos + 20])
+            base_type, base = resolve_ref(base_sha)
+            result = (base_type, _apply_delta(base, self._inflate(pos + 20, size)))
+        else:
+            result = (obj_type, self._inflate(pos, size))
+
+        if result[0] != OBJ_BLOB:
+            self._bases[offset] = result
+            if len(self._bases) > DELTA_BASE_CACHE:
+                self._bases.popitem(last=False)
+        return result
+
+
+class ObjectStore:
+    """Loose objects plus packfiles of one repository (and its alternates)."""
+
+    def __init__(self, git_dir):
+        self.object_dirs = [git_dir / 'objects']
+        alternates = git_dir / 'objects' / 'info' / 'alternates'
+        if alternates.is_file():
+            for line in alternates.read_text(encoding='utf-8', errors='replace').splitlines():
+                if line.strip() and not line.startswith('#'):
+                    path = Path(line.strip())
+                    self.object_dirs.append(path if path.is_absolute() else git_dir / 'objects' / path)
+
+        self.packs = []
+        for object_dir in self.object_dirs:
+            pack_dir = object_dir / 'pack'
+            if pack_dir.is_dir():
+                for idx_path in sorted(pack_dir.glob('pack-*.idx')):
+                    try:
+                        self.packs.append(PackFile(idx_path))
+                    except (OSError, ValueError, GitFormatError):
+                        # Missing, empty or unsupported packs are treated as absent
+                        continue
+
+    def close(self):
+        for pack in self.packs:
+            pack.close()
+
+    def read(self, sha):
+        """Return (type, data) for a binary sha, or None if the object is missing."""
+        hex_sha = sha.hex()
+        for object_dir in self.object_dirs:
+            loose = object_dir / hex_sha[:2] / hex_sha[2:]
+            try:
+                with open(loose, 'rb') as f:
+                    raw = zlib.decompress(f.read())
+            except OSError:
+                continue
+            header, _, data = raw.partition(b'\0')
+            return TYPE_NAMES.get(header.split(b' ', 1)[0]), data
+
+        for pack in self.packs:
+            offset = pack.find(sha)
+            if offset is not None:
+                return pack.read(offset, self._read_required)
+        return None
+
+    def _read_required(self, sha):
+        found = self.read(sha)
+        if found is None:
+            raise GitFormatError(f"missing delta base {sha.hex()}")
+        return found
+
+
+def read_refs(git_dir):
+    """Return {ref name: hex sha} for HEAD, branches, remote branches and tags."""
+    refs = {}
+
+    packed = git_dir / 'packed-refs'
+    if packed.is_file():
+        previous = None
+        for line in packed.read_text(encoding='utf-8', errors='replace').splitlines():
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('^') and previous:
+                # Peeled tag: record the commit it points to
+                refs[previous + '^{}'] = line[1:].strip()
+                continue
+            sha, _, name = line.partition(' ')
+            refs[name.strip()] = sha
+            previous = name.strip()
+
+    refs_dir = git_dir / 'refs'
+    for root, _, files in os.walk(refs_dir):
+        for name in files:
+            path = Path(root) / name
+            try:
+                value = path.read_text(encoding='utf-8', errors='replace').strip()
+            except OSError:
+                continue
+            if len(value) == 40:
+                refs[path.relative_to(git_dir).as_posix()] = value
+
+    head = git_dir / 'HEAD'
+    if head.is_file():
+        value = head.read_text(encoding='utf-8', errors='replace').strip()
+        if value.startswith('ref:'):
+            target = refs.get(value[4:].strip())
+            if target:
+                refs['HEAD'] = target
+        elif len(value) == 40:
+            refs['HEAD'] = value
+
+    return refs
+
+
+def branch_names(refs):
+    """Distinct branch names across local and remote-tracking refs."""
+    names = set()
+    for ref in refs:
+        if ref.startswith('refs/heads/'):
+            names.add(ref[len('refs/heads/'):])
+        elif ref.startswith('refs/remotes/') and not ref.endswith('/HEAD'):
+            names.add(ref[len('refs/remotes/'):].split('/', 1)[-1])
+    return sorted(names)
+
+
+def is_meaningful_commit(subject):
+    subject = subject.strip().lower()
+    return (len(subject) >= MEANINGFUL_MIN_LENGTH and subject not in TRIVIAL_COMMIT_MESSAGES
+            and len(subject.split()) >= 2)
+
+
+def _parse_commit(data):
+    """Return (parents, author email, author timestamp, subject, has_body)."""
+    header, _, message = data.partition(b'\n\n')
+    parents = []
+    author = None
+    timestamp = None
+    for line in header.split(b'\n'):
+        if line.startswith(b'parent '):
+            parents.append(bytes.fromhex(line[7:47].decode('ascii')))
+        elif line.startswith(b'author '):
+            identity, _, when = line[7:].rpartition(b'> ')
+            author = identity.rpartition(b'<')[2].decode('utf-8', errors='replace').lower()
+            try:
+                timestamp = int(when.split(b' ', 1)[0])
+            except ValueError:
+                timestamp = None
+
+    lines = message.decode('utf-8', errors='replace').strip().split('\n')
+    subject = lines[0].strip() if lines else ''
+    has_body = any(line.strip() for line in lines[1:])
+    return parents, author, timestamp, subject, has_body
+
+
+def _commit_sha(store, hex_sha):
+    """Peel a ref target (commit or annotated tag) down to a commit sha, or None."""
+    sha = bytes.fromhex(hex_sha)
+    for _ in range(10):
+        found = store.read(sha)
+        if found is None:
+            return None
+        obj_type, data = found
+        if obj_type == OBJ_COMMIT:
+            return sha
+        if obj_type != OBJ_TAG or not data.startswith(b'object '):
+            return None
+        sha = bytes.fromhex(data[7:47].decode('ascii'))
+    return None
+
+
+def read_history(repo_path):
+    """
+    Walk every reachable commit once. Returns None when repo_path has no
+    readable .git directory, otherwise a dict of history statistics.
+    """
+    git_dir = find_git_dir(repo_path)
+    if git_dir is None:
+        return None
+
+    refs = read_refs(git_dir)
+    store = ObjectStore(git_dir)
+
+    # Shallow clones list the commits whose parents were not fetched
+    shallow = set()
+    shallow_file = git_dir / 'shallow'
+    if shallow_file.is_file():
+        shallow = {bytes.fromhex(line.strip()) for line in shallow_file.read_text().splitlines()
+                   if len(line.strip()) == 40}
+
+    stats = {
+        'commits': 0,
+        'merge_commits': 0,
+        'root_commits': 0,
+        'shallow': bool(shallow),
+        'meaningful_commits': 0,
+        'conventional_commits': 0,
+        'commits_with_body': 0,
+        'subject_length_total': 0,
+        'authors': set(),
+        'first_commit_time': None,
+        'last_commit_time': None,
+        'missing_objects': 0,
+    }
+    try:
+        tips = {_commit_sha(store, sha) for name, sha in refs.items() if len(sha) == 40}
+        tips.discard(None)
+        seen = set(tips)
+        pending = list(tips)
+
+        while pending:
+            sha = pending.pop()
+            found = store.read(sha)
+            if found is None or found[0] != OBJ_COMMIT:
+                # Partial fetches and broken repositories stop the walk here
+                stats['missing_objects'] += 1
+                continue
+
+            parents, author, timestamp, subject, has_body = _parse_commit(found[1])
+            if sha in shallow:
+                parents = []
+            stats['commits'] += 1
+            if len(parents) > 1:
+                stats['merge_commits'] += 1
+            elif not parents:
+                stats['root_commits'] += 1
+            if is_meaningful_commit(subject):
+                stats['meaningful_commits'] += 1
+            if subject.lower().startswith(CONVENTIONAL_PREFIXES) and ':' in subject[:20]:
+                stats['conventional_commits'] += 1
+            if has_body:
+                stats['commits_with_body'] += 1
+            stats['subject_length_total'] += len(subject)
+            if author:
+                stats['authors'].add(author)
+            if timestamp is not None:
+                if stats['first_commit_time'] is None or timestamp < stats['first_commit_time']:
+                    stats['first_commit_time'] = timestamp
+                if stats['last_commit_time'] is None or timestamp > stats['last_commit_time']:
+                    stats['last_commit_time'] = timestamp
+
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    pending.append(parent)
+    finally:
+        store.close()
+
+    stats['authors'] = len(stats['authors'])
+    stats['branches'] = branch_names(refs)
+    stats['tags'] = sorted(ref[len('refs/tags/'):] for ref in refs
+                           if ref.startswith('refs/tags/') and not ref.endswith('^{}'))
+    stats['meaningful_percent'] = (stats['meaningful_commits'] * 100 / stats['commits']) if stats['commits'] else 0.0
+    stats['average_subject_length'] = (stats['subject_length_total'] / stats['commits']) if stats['commits'] else 0.0
+    del stats['subject_length_total']
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Summarize the git history of a repository without git")
+    parser.add_argument("repository", help="Path to the repository")
+    args = parser.parse_args()
+
+    start = time.time()
+    history = read_history(args.repository)
+    elapsed = time.time() - start
+
+    if history is None:
+        print(f"No git repository found at {args.repository}")
+        raise SystemExit(1)
+
+    print(f"Commits: {history['commits']} ({history['merge_commits']} merges, "
+          f"{history['root_commits']} roots) read in {elapsed * 1000:.0f} ms")
+    print(f"Meaningful messages: {history['meaningful_commits']} ({history['meaningful_percent']:.0f}%), "
+          f"conventional: {history['conventional_commits']}, with body: {history['commits_with_body']}")
+    print(f"Authors: {history['authors']}")
+    print(f"Branches ({len(history['branches'])}): {', '.join(history['branches'])}")
+    if history['tags']:
+        print(f"Tags: {', '.join(history['tags'])}")
+    if history['first_commit_time']:
+        first = datetime.fromtimestamp(history['first_commit_time']).strftime('%Y-%m-%d')
+        last = datetime.fromtimestamp(history['last_commit_time']).strftime('%Y-%m-%d')
+        print(f"Active: {first} to {last}")
+    if history['missing_objects']:
+        print(f"Missing objects: {history['missing_objects']}")
+    if history['shallow']:
+        print("Shallow clone: history is truncated")
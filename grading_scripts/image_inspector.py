@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Header-only image inspection for the ui_ux skill.
+
+Format and dimensions come from the first few bytes of each file (PNG IHDR,
+GIF logical screen, JPEG SOF segment, WebP VP8/VP8L/VP8X chunk, the root
+<svg> element); no pixel data is read or decoded. Identical images are
+found by size first and hashed only when sizes collide, and README image
+references (Markdown, reference-style and <img> tags) are resolved against
+the indexed files, so a repository with hundreds of assets is inspected in
+milliseconds.
+
+Usage:
+    python grading_scripts/image_inspector.py path/to/repo
+"""
+import posixpath
+import re
+import struct
+from urllib.parse import unquote, urlparse
+
+from file_utils import file_sha256
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes read for formats whose dimensions sit at a fixed offset
+HEADER_SIZE = 32
+
+# Bytes of an SVG searched for the root element
+SVG_HEADER_SIZE = 8192
+
+# JPEG segments walked before giving up on finding a SOF marker
+MAX_JPEG_SEGMENTS = 256
+
+# SOF0-SOF15 carry dimensions; C4 (DHT), C8 (JPG) and CC (DAC) do not
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers with no length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+SVG_ROOT = re.compile(rb'<svg\b[^>]*>', re.I | re.S)
+SVG_ATTRIBUTE = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']*)["\']', re.I)
+SVG_LENGTH = re.compile(rb'^\s*([0-9]*\.?[0-9]+)\s*(?:px)?\s*$')
+
+MARKDOWN_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)')
+MARKDOWN_IMAGE_REF = re.compile(r'!\[([^\]]*)\]\[([^\]]*)\]')
+MARKDOWN_LINK_DEF = re.compile(r'^ {0,3}\[([^\]]+)\]:\s*<?([^\s>]+)', re.MULTILINE)
+HTML_IMAGE = re.compile(r'<img\b[^>]*?\bsrc\s*=\s*["\']?([^"\'\s>]+)', re.I)
+
+
+def _png_size(header):
+    if header[:8] == PNG_SIGNATURE and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+
+def _gif_size(header):
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', header[6:10])
+    return None
+
+
+def _webp_size(header):
+    if header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and len(header) >= 30:
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(header) >= 25:
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(header) >= 30:
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    return None
+
+
+def _jpeg_size(f):
+    """Walk JPEG segment headers (seeking over their bodies) to the first SOF marker."""
+    f.seek(2)
+    for _ in range(MAX_JPEG_SEGMENTS):
+        byte = f.read(1)
+        if byte != b'\xff':
+            return None
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:
+            return None
+
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        length = struct.unpack('>H', length)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        f.seek(length - 2, 1)
+    return None
+
+
+def _svg_length(value):
+    match = SVG_LENGTH.match(value)
+    return round(float(match.group(1))) if match else None
+
+
+def _svg_size(header):
+    root = SVG_ROOT.search(header)
+    if root is None:
+        return None
+    attributes = {name.lower(): value for name, value in SVG_ATTRIBUTE.findall(root.group(0))}
+    width = _svg_length(attributes.get(b'width', b''))
+    height = _svg_length(attributes.get(b'height', b''))
+    if (width is None or height is None) and b'viewbox' in attributes:
+        box = attributes[b'viewbox'].replace(b',', b' ').split()
+        if len(box) == 4:
+            try:
+                width, height = round(float(box[2])), round(float(box[3]))
+            except ValueError:
+                pass
+    return width or 0, height or 0
+
+
+def read_image_header(path):
+    """
+    Return {'format', 'width', 'height'} read from the file's header, or
+    None if it is not a PNG, JPEG, GIF, WebP or SVG image. SVGs without a
+    size or viewBox report 0 x 0.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            size = None
+            if header[:8] == PNG_SIGNATURE:
+                image_format, size = 'png', _png_size(header)
+            elif header[:3] == b'GIF':
+                image_format, size = 'gif', _gif_size(header)
+            elif header[:4] == b'RIFF':
+                image_format, size = 'webp', _webp_size(header)
+            elif header[:2] == b'\xff\xd8':
+                image_format, size = 'jpeg', _jpeg_size(f)
+            else:
+                header += f.read(SVG_HEADER_SIZE - len(header))
+                image_format, size = 'svg', _svg_size(header)
+    except (OSError, struct.error):
+        return None
+
+    if size is None:
+        return None
+    return {'format': image_format, 'width': size[0], 'height': size[1]}
+
+
+def duplicate_groups(images):
+    """Groups (lists of RepoFiles) of byte-identical images; only same-size files are hashed."""
+    by_size = {}
+    for image in images:
+        by_size.setdefault(image.size, []).append(image)
+
+    groups = []
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        by_digest = {}
+        for image in candidates:
+            try:
+                by_digest.setdefault(file_sha256(image.abs_path), []).append(image)
+            except OSError:
+                continue
+        groups.extend(group for group in by_digest.values() if len(group) > 1)
+    return groups
+
+
+def readme_image_targets(text):
+    """Image targets referenced by Markdown/HTML text, in order of appearance."""
+    definitions = {label.lower(): target for label, target in MARKDOWN_LINK_DEF.findall(text)}
+    targets = MARKDOWN_IMAGE.findall(text) + HTML_IMAGE.findall(text)
+    for alt, label in MARKDOWN_IMAGE_REF.findall(text):
+        target = definitions.get((label or alt).lower())
+        if target:
+            targets.append(target)
+    return targets
+
+
+def resolve_image_target(target, readme_path):
+    """
+    Repository-relative path of a local image reference, or None for a
+    remote URL (http(s), data: URIs).
+    """
+    parsed = urlparse(target)
+    if parsed.scheme or parsed.netloc:
+        return None
+    path = unquote(parsed.path)
+    if path.startswith('/'):
+        return posixpath.normpath(path.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(readme_path), path))
+
+
+def inspect_images(index, image_files, readme=None):
+    """
+    Inspect image_files (RepoFiles) and the README's image references.
+
+    Returns a dict with:
+        images      - {path: header dict} for every readable image
+        invalid     - paths with an image extension but no recognizable header
+        unique      - readable images counted once per distinct content
+        duplicates  - groups of paths with identical content
+        referenced  - local images the README embeds that exist in the index
+        missing     - local images the README embeds that do not exist
+        remote      - README image references to URLs
+    """
+    images = {}
+    invalid = []
+    for image in image_files:
+        header = read_image_header(image.abs_path)
+        if header is None:
+            invalid.append(image.path)
+        else:
+            images[image.path] = header
+
+    groups = duplicate_groups([image for image in image_files if image.path in images])
+    duplicate_count = sum(len(group) - 1 for group in groups)
+
+    referenced, missing, remote = [], [], []
+    if readme is not None:
+        indexed = {repo_file.path.lower() for repo_file in index}
+        for target in readme_image_targets(readme.read_text()):
+            path = resolve_image_target(target, readme.path)
+            if path is None:
+                remote.append(target)
+            elif path.lower() in indexed:
+                referenced.append(path)
+            else:
+                missing.append(path)
+
+    return {
+        'images': images,
+        'invalid': invalid,
+        'unique': len(images) - duplicate_count,
+        'duplicates': [[image.path for image in group] for group in groups],
+        'referenced': sorted(set(referenced)),
+        'missing': sorted(set(missing)),
+        'remote': remote,
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+    from tier2_skills import IMAGE_EXTS, README_NAMES
+
+    parser = argparse.ArgumentParser(description="Report image formats, sizes, duplicates and README references")
+    parser.add_argument("repository", help="Repository directory")
+    args = parser.parse_args()
+
+    index = build_repo_index(args.repository)
+    start = time.perf_counter()
+    report = inspect_images(index, index.with_ext(*IMAGE_EXTS), index.first_named(*README_NAMES))
+    elapsed = time.perf_counter() - start
+
+    for path, header in sorted(report['images'].items()):
+        print(f"  {path}: {header['format']} {header['width']}x{header['height']}")
+    for path in report['invalid']:
+        print(f"  {path}: not a recognizable image")
+    print(f"\nImages: {len(report['images'])} ({report['unique']} unique), {len(report['invalid'])} invalid")
+    for group in report['duplicates']:
+        print(f"  Identical: {', '.join(group)}")
+    print(f"README references: {len(report['referenced'])} local, {len(report['missing'])} missing, "
+          f"{len(report['remote'])} remote")
+    for path in report['missing']:
+        print(f"  Missing: {path}")
+    print(f"Inspected in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Module dependency graph of a Python repository for the extensibility skill.
+
+Every .py file is parsed with ast once - the tree is shared in memory with
+docstring_scanner.py and test_analyzer.py - and reduced to the facts the
+graph needs: its imports (as written), the interface classes it defines (ABC or
+Protocol subclasses, ABCMeta classes, classes with abstract methods), the
+base classes it extends, and plugin patterns (entry point lookups, dynamic
+imports, registries, register decorators, __init_subclass__ / __subclasses__
+hooks). These facts depend only on the file's bytes, so they are cached by
+content (analysis_cache.py): after a resubmission only changed files are
+parsed again and the graph is re-linked from cached facts.
+
+Module names follow Python's import rules: a file's name is its path below
+the first ancestor directory that is not a package (no __init__.py), so
+both flat layouts and src/ layouts resolve. Imports that resolve to a
+repository module become edges; fan-in/fan-out is reported per module and
+import cycles are found as strongly connected components (Tarjan). A
+submodule importing its own package (`from . import __version__` in
+pkg/core.py) is an edge but not a cycle: the package is always initialized
+before its submodules, so that idiom is not reported.
+
+Usage:
+    python grading_scripts/import_graph.py path/to/repo
+    python grading_scripts/import_graph.py path/to/repo --no-cache
+"""
+import ast
+import os
+import sys
+from collections import Counter
+
+from analysis_cache import AnalysisCache, analyze_files, parse_python
+
+# Bump when the per-file facts below change so cached parses are ignored
+GRAPH_VERSION = "1"
+
+INTERFACE_BASES = ('ABC', 'Protocol')
+ENTRY_POINT_CALLS = ('entry_points', 'iter_entry_points', 'load_entry_point')
+DYNAMIC_IMPORT_CALLS = ('import_module', '__import__', 'spec_from_file_location')
+REGISTRY_WORDS = ('registry', 'plugins', 'handlers', 'registered')
+
+
+def _dotted(node):
+    """'abc.ABC' for a Name/Attribute chain (or a Call of one), '' otherwise."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _last(name):
+    return name.rsplit('.', 1)[-1]
+
+
+def _is_interface(node):
+    bases = [_last(_dotted(base)) for base in node.bases]
+    if any(base in INTERFACE_BASES for base in bases):
+        return True
+    if any(keyword.arg == 'metaclass' and _last(_dotted(keyword.value)) == 'ABCMeta' for keyword in node.keywords):
+        return True
+    return any(isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+               and any(_last(_dotted(d)) in ('abstractmethod', 'abstractproperty') for d in child.decorator_list)
+               for child in node.body)
+
+
+def _is_registry_name(name):
+    lowered = name.lower()
+    return any(word in lowered for word in REGISTRY_WORDS)
+
+
+def parse_module(data):
+    """
+    Parse one Python source into its graph facts:
+      {'parsed', 'imports': [[module, level, [names]]], 'interfaces': [class names],
+       'bases': [base class names], 'plugins': [pattern kinds]}
+    """
+    facts = {'parsed': True, 'imports': [], 'interfaces': [], 'bases': [], 'plugins': []}
+    tree = parse_python(data)
+    if tree is None:
+        facts['parsed'] = False
+        return facts
+
+    plugins = set()
+    bases = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            facts['imports'].extend([alias.name, 0, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            facts['imports'].append([node.module or '', node.level, [alias.name for alias in node.names]])
+        elif isinstance(node, ast.ClassDef):
+            if _is_interface(node):
+                facts['interfaces'].append(node.name)
+            if any(_last(_dotted(d)).startswith('register') for d in node.decorator_list):
+                plugins.add('register_decorator')
+            bases.update(_last(_dotted(base)) for base in node.bases)
+            bases.discard('')
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name == '__init_subclass__':
+                plugins.add('subclass_hook')
+            elif node.name.startswith('register'):
+                plugins.add('register_function')
+            if any(_last(_dotted(d)).startswith('register') for d in node.decorator_list):
+                plugins.add('register_decorator')
+        elif isinstance(node, ast.Call):
+            name = _last(_dotted(node))
+            if name in ENTRY_POINT_CALLS:
+                plugins.add('entry_points')
+            elif name in DYNAMIC_IMPORT_CALLS:
+                plugins.add('dynamic_import')
+            elif name == '__subclasses__':
+                plugins.add('subclass_discovery')
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            is_mapping = isinstance(node.value, ast.Dict) or _last(_dotted(node.value)) in ('dict', 'defaultdict')
+            if is_mapping and any(isinstance(t, ast.Name) and _is_registry_name(t.id) for t in targets):
+                plugins.add('registry')
+
+    facts['bases'] = sorted(bases)
+    facts['plugins'] = sorted(plugins)
+    return facts
+
+
+def module_names(paths):
+    """
+    Map each .py path to its importable module name: the path below the
+    first ancestor directory without an __init__.py.
+    """
+    packages = {path.rsplit('/', 1)[0] for path in paths if path.endswith('/__init__.py')}
+    names = {}
+    for path in paths:
+        parts = path[:-3].split('/')
+        if parts[-1] == '__init__':
+            parts = parts[:-1]
+        directories = path.split('/')[:-1]
+        root = len(directories)
+        while root > 0 and '/'.join(directories[:root]) in packages:
+            root -= 1
+        names[path] = '.'.join(parts[root:]) or '__init__'
+    return names
+
+
+def _resolve(module, level, imported, current, is_package, known):
+    """Repository modules an import statement in module `current` refers to."""
+    if level:
+        package = current.split('.') if is_package else current.split('.')[:-1]
+        if level > 1:
+            package = package[:-(level - 1)] if level - 1 <= len(package) else []
+        base = '.'.join(package + ([module] if module else []))
+    else:
+        base = module
+
+    targets = []
+    if imported:
+        # `from base import name` may import submodules
+        targets = [f"{base}.{name}" if base else name for name in imported if name != '*']
+        targets = [target for target in targets if target in known]
+    if not targets:
+        candidate = base
+        while candidate and candidate not in known:
+            candidate = candidate.rsplit('.', 1)[0] if '.' in candidate else ''
+        if candidate:
+            targets = [candidate]
+    return targets
+
+
+def strongly_connected_components(graph):
+    """Tarjan's algorithm (iterative); returns the components as sorted lists of nodes."""
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in sorted(graph):
+        if root in index_of:
+            continue
+        work = [(root, iter(sorted(graph.get(root, ()))))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index_of:
+                    index_of[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(graph.get(child, ())))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+    return components
+
+
+def build_import_graph(index, workers=1, use_cache=True):
+    """
+    Build the module graph of a RepoIndex's .py files. Returns a dict with
+    modules {name: path}, edges {name: [names]}, fan_in/fan_out {name: n},
+    cycles (components of more than one module), interfaces {name: [classes]},
+    implementations (classes extending a repository interface), plugins
+    {name: [kinds]}, external (third-party top-level imports, stdlib excluded), syntax_errors,
+    and cache statistics. Uncached files are parsed across a process pool of
+    workers processes when there are many of them.
+    """
+    cache = AnalysisCache('imports', GRAPH_VERSION) if use_cache else None
+    facts, parsed_now = analyze_files(index.with_ext('.py'), parse_module, cache, workers)
+
+    names = module_names(sorted(facts))
+    modules = {}
+    for path, name in names.items():
+        modules.setdefault(name, path)
+    known = set(modules)
+
+    edges = {name: set() for name in modules}
+    external = Counter()
+    for path, file_facts in facts.items():
+        name = names[path]
+        is_package = path.endswith('__init__.py')
+        for module, level, imported in file_facts['imports']:
+            targets = _resolve(module, level, imported, name, is_package, known)
+            if targets:
+                edges[name].update(target for target in targets if target != name)
+            elif not level and module and module.split('.')[0] not in sys.stdlib_module_names:
+                external[module.split('.')[0]] += 1
+
+    fan_in = Counter()
+    for name, targets in edges.items():
+        fan_in.update(targets)
+
+    # Edges from a submodule to a package containing it cannot form a real cycle
+    cycle_edges = {name: [target for target in targets if not name.startswith(target + '.')]
+                   for name, targets in edges.items()}
+
+    interfaces = {names[path]: file_facts['interfaces'] for path, file_facts in facts.items() if file_facts['interfaces']}
+    interface_names = {cls for classes in interfaces.values() for cls in classes}
+    implementations = sum(1 for path, file_facts in facts.items()
+                          for base in file_facts['bases'] if base in interface_names)
+
+    return {
+        'modules': modules,
+        'edges': {name: sorted(targets) for name, targets in edges.items()},
+        'fan_in': {name: fan_in.get(name, 0) for name in modules},
+        'fan_out': {name: len(targets) for name, targets in edges.items()},
+        'cycles': [component for component in strongly_connected_components(cycle_edges) if len(component) > 1],
+        'interfaces': interfaces,
+        'implementations': implementations,
+        'plugins': {names[path]: file_facts['plugins'] for path, file_facts in facts.items() if file_facts['plugins']},
+        'external': dict(external.most_common()),
+        'syntax_errors': sorted(path for path, file_facts in facts.items() if not file_facts['parsed']),
+        'cache_hits': cache.hits if cache else 0,
+        'parsed_now': parsed_now,
+    }
+
+
+def summarize(graph):
+    """Headline numbers of a graph from build_import_graph()."""
+    modules = len(graph['modules'])
+    dependencies = sum(graph['fan_out'].values())
+    hub = max(graph['fan_in'], key=lambda name: (graph['fan_in'][name], name), default=None)
+    widest = max(graph['fan_out'], key=lambda name: (graph['fan_out'][name], name), default=None)
+    return {
+        'modules': modules,
+        'dependencies': dependencies,
+        'average_fan_out': round(dependencies / modules, 1) if modules else 0.0,
+        'max_fan_in': (hub, graph['fan_in'][hub]) if hub else (None, 0),
+        'max_fan_out': (widest, graph['fan_out'][widest]) if widest else (None, 0),
+        'cycles': len(graph['cycles']),
+        'modules_in_cycles': sum(len(component) for component in graph['cycles']),
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+
+    parser = argparse.ArgumentParser(description="Report the module dependency graph of a Python repository")
+    parser.add_argument("repository", help="Path to the repository")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to parse uncached files (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file, ignoring the cache")
+    parser.add_argument("--edges", action="store_true", help="List every module's dependencies")
+    args = parser.parse_args()
+
+    start = time.time()
+    graph = build_import_graph(build_repo_index(args.repository), workers=args.workers, use_cache=not args.no_cache)
+    elapsed = time.time() - start
+    summary = summarize(graph)
+
+    print("=" * 70)
+    print(f"IMPORT GRAPH: {args.repository}")
+    print("=" * 70)
+    print(f"Modules: {summary['modules']} (parsed {graph['parsed_now']}, cached {graph['cache_hits']}) "
+          f"in {elapsed:.2f}s")
+    print(f"Internal dependencies: {summary['dependencies']} (avg fan-out {summary['average_fan_out']})")
+    print(f"Most depended on: {summary['max_fan_in'][0]} (fan-in {summary['max_fan_in'][1]})")
+    print(f"Most dependencies: {summary['max_fan_out'][0]} (fan-out {summary['max_fan_out'][1]})")
+    print(f"Import cycles: {summary['cycles']}")
+    for component in graph['cycles']:
+        print(f"  {' <-> '.join(component)}")
+    print(f"Interfaces: {sum(len(c) for c in graph['interfaces'].values())} "
+          f"in {len(graph['interfaces'])} module(s), {graph['implementations']} implementation(s)")
+    for name, kinds in sorted(graph['plugins'].items()):
+        print(f"  Plugin pattern in {name}: {', '.join(kinds)}")
+    print(f"Third-party imports: {', '.join(list(graph['external'])[:10]) or 'none'}")
+    if graph['syntax_errors']:
+        print(f"Could not parse: {', '.join(graph['syntax_errors'][:10])}")
+
+    if args.edges:
+        for name, targets in sorted(graph['edges'].items()):
+            print(f"  {name} -> {', '.join(targets) or '-'}")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Moodle gradebook CSV reader/writer and one-pass grade merge.
+
+Moodle exports and imports grades as a UTF-8 CSV with a BOM, Hebrew column
+headers (מספר מזהה, ציונים, הערות למשוב, ...), "משתתף:NNNNN" identifiers,
+CRLF record separators and bare LF newlines inside quoted feedback. The
+file is streamed row by row with the csv module, and written back the same
+way (BOM, CRLF, minimal quoting), so untouched rows are reproduced byte for
+byte and no workbook is ever loaded.
+
+merge_gradebook() fills in each participant's grade, grade date and
+feedback from their assessment JSON. merge_student() and
+weighted_calculations() are shared with update_moodle_grades_single_pass.py,
+so the CSV and the Excel workbook get exactly the same values. For
+self-graded assignments the published grade is the self-submitted grade and
+the weighted grade, computed for the whole cohort in one batch, goes into an
+extra "Calculated Grade (Tier 2)" column. The export is therefore streamed
+twice: once to grade every participant, once to write the rows.
+
+The Assignment 1 export is work1-runi-grade-format.csv in the project root;
+other assignments default to StudentGradesMoodleFormat/AssignmentN_Moodle_Grades.csv.
+
+Usage:
+    python grading_scripts/moodle_csv.py --assignment 1
+    python grading_scripts/moodle_csv.py --assignment 1 --source export.csv --output Assignment1_FINAL.csv
+    python grading_scripts/moodle_csv.py --index work1-runi-grade-format.csv
+"""
+import argparse
+import csv
+import math
+import os
+import tempfile
+from pathlib import Path
+
+from calculate_weighted_grades_assignment1 import print_penalty_statistics
+from file_utils import set_default_mode
+from update_moodle_grades_assignment1 import (
+    OPENING_MESSAGE, generate_feedback_text, get_assessment_data, get_self_submitted_grade,
+)
+from weighted_grades import calculate_weighted_grades
+
+ENCODING = 'utf-8-sig'
+LINE_TERMINATOR = '\r\n'
+
+ID_COLUMN = 'מספר מזהה'
+GRADE_COLUMN = 'ציונים'
+MODIFIED_COLUMN = 'תאריך שינוי אחרון (ציון)'
+FEEDBACK_COLUMN = 'הערות למשוב'
+WEIGHTED_COLUMN = 'Calculated Grade (Tier 2)'
+
+# Assignments whose published grade is the self-submitted grade
+SELF_GRADED_ASSIGNMENTS = (1,)
+
+# Moodle CSV exports that do not follow the AssignmentN_Moodle_Grades.csv naming
+MOODLE_EXPORTS = {
+    1: Path("work1-runi-grade-format.csv"),
+}
+
+
+class GradebookFormatError(Exception):
+    """Raised when a CSV is not a Moodle gradebook export."""
+
+
+def parse_student_id(identifier):
+    """Extract the student ID from a Moodle "משתתף:XXXXX" identifier."""
+    if isinstance(identifier, str) and ':' in identifier:
+        parts = identifier.split(':')
+        if len(parts) == 2 and parts[1].strip().isdigit():
+            return parts[1].strip()
+    return None
+
+
+def read_rows(path):
+    """Yield the rows of a Moodle CSV one at a time, the header row first."""
+    with open(path, 'r', encoding=ENCODING, newline='') as f:
+        yield from csv.reader(f)
+
+
+def open_writer(f):
+    """A csv.writer producing Moodle's quoting and CRLF records on a text file opened with newline=''."""
+    return csv.writer(f, lineterminator=LINE_TERMINATOR, quoting=csv.QUOTE_MINIMAL)
+
+
+def column_positions(header, *names):
+    """Position of each named column in the header row."""
+    missing = [name for name in names if name not in header]
+    if missing:
+        raise GradebookFormatError(f"Missing column(s): {', '.join(missing)}")
+    return [header.index(name) for name in names]
+
+
+def build_student_index(path):
+    """Map each student ID to its row number (the header is row 1), parsing identifiers once."""
+    rows = read_rows(path)
+    id_column, = column_positions(next(rows, []), ID_COLUMN)
+
+    index = {}
+    for row_num, row in enumerate(rows, start=2):
+        student_id = parse_student_id(row[id_column]) if len(row) > id_column else None
+        if student_id:
+            index[student_id] = row_num
+    return index
+
+
+def format_grade(grade):
+    """A grade the way Moodle writes it: 95, 5.41."""
+    return f"{grade:g}" if isinstance(grade, float) else str(grade)
+
+
+def merge_student(assessment, self_grade, self_graded, updates):
+    """
+    The gradebook fields of one assessed student: (grade, grade date or None,
+    feedback). For self-graded assignments the self-submitted grade is used
+    when there is one, else the calculated grade; updates counts both cases
+    and the feedback added.
+    """
+    grade_used = math.ceil(assessment.get('final_grade', 0))
+    if self_graded:
+        if self_grade is not None:
+            grade_used = self_grade
+            updates['self_grades_found'] += 1
+        else:
+            updates['self_grades_missing'] += 1
+
+    opening = OPENING_MESSAGE if self_graded else ""
+    updates['feedback_added'] += 1
+    return grade_used, assessment.get('assessment_date'), opening + generate_feedback_text(assessment)
+
+
+def weighted_calculations(graded):
+    """
+    Weighted grades of (student_id, row, grade used, base grade) tuples,
+    computed in one batch. Returns one calculation dict per tuple (the
+    format print_penalty_statistics() takes) and prints a line per student.
+    """
+    results = calculate_weighted_grades([g[2] for g in graded], [g[3] for g in graded])
+    calculations = []
+
+    for (student_id, row, grade_used, base_grade), weighted_grade, weighted_display in zip(
+            graded, results['weighted'], results['display']):
+        weighted_grade = float(weighted_grade)
+        weighted_display = int(weighted_display)
+
+        penalty = base_grade - weighted_grade
+        calculations.append({
+            'student_id': student_id,
+            'self_grade': grade_used,
+            'base_grade': base_grade,
+            'weighted_grade': weighted_grade,
+            'weighted_display': weighted_display,
+            'penalty': penalty,
+        })
+
+        penalty_str = f"-{penalty:.1f}" if penalty > 0 else "0"
+        print(f"Row {row}: Student {student_id} - Used grade: {grade_used}, "
+              f"Base={base_grade:.1f}, Weighted={weighted_grade:.1f} ({weighted_display}), Penalty={penalty_str}")
+
+    return calculations
+
+
+def merge_gradebook(source, output, submissions_dir, assessments_dir, self_graded=True):
+    """
+    Copy a Moodle CSV from source to output, filling in grades, grade dates
+    and feedback from the assessment JSONs. source and output may be the same
+    file: output is written to a temporary file and moved into place.
+    """
+    source = Path(source)
+    output = Path(output)
+    submissions_dir = Path(submissions_dir)
+    assessments_dir = Path(assessments_dir)
+
+    print("=" * 80)
+    print(f"MERGING GRADES INTO MOODLE CSV: {source}")
+    print("=" * 80)
+
+    rows = read_rows(source)
+    header = next(rows, None)
+    if header is None:
+        raise GradebookFormatError(f"{source} is empty")
+    id_column, grade_column, modified_column, feedback_column = column_positions(
+        header, ID_COLUMN, GRADE_COLUMN, MODIFIED_COLUMN, FEEDBACK_COLUMN)
+
+    weighted_column = None
+    if self_graded:
+        if WEIGHTED_COLUMN not in header:
+            header = header + [WEIGHTED_COLUMN]
+        weighted_column = header.index(WEIGHTED_COLUMN)
+
+    updates = {
+        'processed': 0,
+        'self_grades_found': 0,
+        'self_grades_missing': 0,
+        'feedback_added': 0,
+    }
+
+    # First pass: grade every participant (row number -> grade, date, feedback)
+    merged = {}
+    graded = []
+    for row_num, row in enumerate(rows, start=2):
+        student_id = parse_student_id(row[id_column]) if len(row) > id_column else None
+        if not student_id:
+            if len(row) > id_column and row[id_column]:
+                print(f"Row {row_num}: Could not extract student ID from {row[id_column]}")
+            continue
+
+        updates['processed'] += 1
+        assessment = get_assessment_data(student_id, assessments_dir)
+        if not assessment:
+            print(f"Row {row_num}: Student {student_id} - No assessment data found")
+            continue
+
+        self_grade = get_self_submitted_grade(student_id, submissions_dir) if self_graded else None
+        merged[row_num] = merge_student(assessment, self_grade, self_graded, updates)
+        grade_used = merged[row_num][0]
+        graded.append((student_id, row_num, grade_used, assessment.get('total_score', 0)))
+        if not self_graded:
+            print(f"Row {row_num}: Student {student_id} - Grade: {grade_used}")
+
+    calculations = weighted_calculations(graded) if self_graded else []
+    weighted = {row_num: calc['weighted_display'] for (_, row_num, _, _), calc in zip(graded, calculations)}
+
+    # Second pass: write every row, untouched rows exactly as read
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".moodle_", suffix=".csv.tmp", dir=output.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding=ENCODING, newline='') as f:
+            writer = open_writer(f)
+            rows = read_rows(source)
+            next(rows)
+            writer.writerow(header)
+
+            for row_num, row in enumerate(rows, start=2):
+                row = row + [''] * (len(header) - len(row))
+                if row_num in merged:
+                    grade_used, assessment_date, feedback = merged[row_num]
+                    row[grade_column] = format_grade(grade_used)
+                    if assessment_date is not None:
+                        row[modified_column] = assessment_date
+                    row[feedback_column] = feedback
+                    if weighted_column is not None:
+                        row[weighted_column] = str(weighted[row_num])
+                writer.writerow(row)
+        set_default_mode(tmp_path)
+        os.replace(tmp_path, output)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Students processed: {updates['processed']}")
+    if self_graded:
+        print(f"Self-grades found and used: {updates['self_grades_found']}")
+        print(f"Self-grades missing (used calculated): {updates['self_grades_missing']}")
+    print(f"Feedback messages added: {updates['feedback_added']}")
+
+    if self_graded:
+        print_penalty_statistics(calculations)
+
+    print(f"\nFile saved: {output}")
+    print("=" * 80)
+
+    return updates
+
+
+def default_paths(assignment_num):
+    """Return (source CSV, FINAL CSV) for an assignment."""
+    moodle_dir = Path("StudentGradesMoodleFormat")
+    source = MOODLE_EXPORTS.get(assignment_num, moodle_dir / f"Assignment{assignment_num}_Moodle_Grades.csv")
+    return source, moodle_dir / f"Assignment{assignment_num}_Moodle_Grades_FINAL.csv"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Merge assessment grades and feedback into a Moodle gradebook CSV")
+    parser.add_argument("--assignment", type=int, choices=[1, 2, 3],
+                        help="Assignment number")
+    parser.add_argument("--source", help="Moodle CSV export (default: work1-runi-grade-format.csv for assignment 1, "
+                                         "else StudentGradesMoodleFormat/AssignmentN_Moodle_Grades.csv)")
+    parser.add_argument("--output", help="CSV to write (default: StudentGradesMoodleFormat/AssignmentN_Moodle_Grades_FINAL.csv)")
+    parser.add_argument("--index", metavar="CSV",
+                        help="Only list the participants of a Moodle CSV and their rows")
+    args = parser.parse_args()
+
+    if args.index:
+        student_index = build_student_index(args.index)
+        for student_id, row_num in student_index.items():
+            print(f"{student_id}\trow {row_num}")
+        print(f"\n{len(student_index)} participants")
+    elif args.assignment is None:
+        parser.error("--assignment is required unless --index is given")
+    else:
+        source, output = default_paths(args.assignment)
+        source = Path(args.source) if args.source else source
+        if not source.is_file():
+            parser.error(f"Moodle CSV export not found: {source} (pass the export with --source)")
+        merge_gradebook(source, args.output or output,
+                        Path(f"WorkSubmissions0{args.assignment}"),
+                        Path(f"assessments_tier2_assignment{args.assignment}"),
+                        self_graded=args.assignment in SELF_GRADED_ASSIGNMENTS)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Streaming Jupyter notebook analyzer for the research_analysis skill.
+
+Notebooks are read in fixed-size chunks by a small incremental JSON reader
+that walks the cells one at a time. Only cell types, output MIME types and
+(a capped prefix of) cell sources are decoded; everything else - above all
+base64 plot payloads - is skipped in place without being copied or
+decoded, so memory stays bounded however heavy a notebook is.
+
+Handles nbformat 4 ("cells") and nbformat 3 ("worksheets") layouts.
+
+Usage:
+    python grading_scripts/notebook_analyzer.py path/to/notebook.ipynb [...]
+"""
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+# Bytes of each source string kept for library detection
+SOURCE_LIMIT = 1 << 16
+
+ANALYSIS_LIBRARIES = re.compile(r'\b(pandas|numpy|scipy|sklearn|statsmodels|torch|tensorflow)\b')
+VISUALIZATION_LIBRARIES = re.compile(r'\b(matplotlib|seaborn|plotly|altair|bokeh)\b|\bplt\.')
+
+IMAGE_MIME_PREFIX = 'image/'
+# nbformat 3 stored images directly on the output under these keys
+V3_IMAGE_KEYS = ('png', 'jpeg', 'svg')
+
+_NON_SPACE = re.compile(rb'[^ \t\r\n]')
+_STRING_SPECIAL = re.compile(rb'[\\"]')
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb'[,}\] \t\r\n]')
+
+
+class NotebookFormatError(Exception):
+    """Raised when a notebook is not valid JSON."""
+
+
+class _Reader:
+    """Chunked JSON reader: consumes values without materializing what it skips."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = b''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping consumed bytes. False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace byte (not consumed), or None at end of file."""
+        while True:
+            match = _NON_SPACE.search(self.buf, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise NotebookFormatError(f"expected {chr(char)!r}")
+        self.pos += 1
+
+    def read_string(self, limit):
+        """Consume a string, returning its first `limit` bytes decoded ('' when limit is 0)."""
+        self.expect(ord('"'))
+        parts = []
+        kept = 0
+
+        while True:
+            match = _STRING_SPECIAL.search(self.buf, self.pos)
+            end = match.start() if match else len(self.buf)
+            if kept < limit:
+                piece = self.buf[self.pos:min(end, self.pos + limit - kept)]
+                parts.append(piece)
+                kept += len(piece)
+
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise NotebookFormatError("unterminated string")
+                continue
+
+            if self.buf[end] == ord('"'):
+                self.pos = end + 1
+                break
+
+            # Backslash: the escaped byte must be in the buffer before skipping it
+            if end + 1 >= len(self.buf):
+                self.pos = end
+                if not self._fill():
+                    raise NotebookFormatError("unterminated string")
+                continue
+            if kept < limit:
+                parts.append(self.buf[end:end + 2])
+                kept += 2
+            self.pos = end + 2
+
+        raw = b''.join(parts)
+        try:
+            return json.loads(b'"' + raw + b'"')
+        except ValueError:
+            # Truncated mid-escape or mid-character
+            return raw.decode('utf-8', errors='replace')
+
+    def skip_value(self):
+        """Consume one value of any type."""
+        char = self.peek()
+        if char == ord('"'):
+            self.read_string(0)
+        elif char in (ord('{'), ord('[')):
+            self.pos += 1
+            depth = 1
+            while depth:
+                match = _STRUCTURE.search(self.buf, self.pos)
+                if match is None:
+                    self.pos = len(self.buf)
+                    if not self._fill():
+                        raise NotebookFormatError("unterminated container")
+                    continue
+                token = self.buf[match.start()]
+                if token == ord('"'):
+                    self.pos = match.start()
+                    self.read_string(0)
+                    continue
+                self.pos = match.start() + 1
+                depth += 1 if token in (ord('{'), ord('[')) else -1
+        else:
+            self.read_scalar()
+
+    def read_scalar(self):
+        """Consume a number, true, false or null and return it."""
+        self.peek()
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match or self.eof:
+                end = match.start() if match else len(self.buf)
+                break
+            if not self._fill():
+                end = len(self.buf)
+                break
+        raw = self.buf[self.pos:end]
+        self.pos = end
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise NotebookFormatError(f"invalid value {raw[:20]!r}")
+
+    def _separator(self, close):
+        """Consume ',' or the closing bracket; True if another item follows."""
+        char = self.peek()
+        if char == close:
+            self.pos += 1
+            return False
+        if char != ord(','):
+            raise NotebookFormatError("expected ',' or closing bracket")
+        self.pos += 1
+        return True
+
+    def iter_object(self):
+        """Yield each key of an object; the caller must consume the value."""
+        self.expect(ord('{'))
+        if self.peek() == ord('}'):
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string(256)
+            self.expect(ord(':'))
+            yield key
+            if not self._separator(ord('}')):
+                return
+
+    def iter_array(self):
+        """Yield once per element of an array; the caller must consume the element."""
+        self.expect(ord('['))
+        if self.peek() == ord(']'):
+            self.pos += 1
+            return
+        while True:
+            yield
+            if not self._separator(ord(']')):
+                return
+
+
+def _read_source(reader, cell):
+    """Scan a cell's source (string or list of strings) for library usage."""
+    if reader.peek() == ord('['):
+        for _ in reader.iter_array():
+            _read_source(reader, cell)
+        return
+    if reader.peek() != ord('"'):
+        reader.skip_value()
+        return
+
+    text = reader.read_string(SOURCE_LIMIT)
+    cell['analysis'].update(match.group(1) for match in ANALYSIS_LIBRARIES.finditer(text))
+    cell['visualization'].update(match.group(1) or 'matplotlib' for match in VISUALIZATION_LIBRARIES.finditer(text))
+
+
+def _read_output(reader, stats):
+    stats['outputs'] += 1
+    for key in reader.iter_object():
+        if key == 'output_type':
+            if reader.peek() == ord('"') and reader.read_string(64) == 'error':
+                stats['error_outputs'] += 1
+        elif key == 'data' and reader.peek() == ord('{'):
+            for mime in reader.iter_object():
+                if mime.startswith(IMAGE_MIME_PREFIX):
+                    stats['image_outputs'] += 1
+                reader.skip_value()
+        elif key in V3_IMAGE_KEYS:
+            stats['image_outputs'] += 1
+            reader.skip_value()
+        else:
+            reader.skip_value()
+
+
+def _read_cell(reader, stats):
+    cell = {'type': None, 'analysis': set(), 'visualization': set()}
+    for key in reader.iter_object():
+        if key == 'cell_type':
+            cell['type'] = reader.read_string(64)
+        elif key in ('source', 'input'):
+            _read_source(reader, cell)
+        elif key == 'outputs' and reader.peek() == ord('['):
+            for _ in reader.iter_array():
+                _read_output(reader, stats)
+        else:
+            reader.skip_value()
+
+    stats['cells'] += 1
+    if cell['type'] == 'code':
+        stats['code_cells'] += 1
+        stats['analysis_libraries'].update(cell['analysis'])
+        stats['visualization_libraries'].update(cell['visualization'])
+    elif cell['type'] in ('markdown', 'heading'):
+        stats['markdown_cells'] += 1
+
+
+def _read_cells(reader, stats):
+    for _ in reader.iter_array():
+        _read_cell(reader, stats)
+
+
+def _read_metadata(reader, stats):
+    for key in reader.iter_object():
+        if key in ('kernelspec', 'language_info') and reader.peek() == ord('{'):
+            for inner in reader.iter_object():
+                if inner in ('language', 'name') and reader.peek() == ord('"') and not stats['language']:
+                    stats['language'] = reader.read_string(64)
+                else:
+                    reader.skip_value()
+        else:
+            reader.skip_value()
+
+
+def analyze_notebook(path):
+    """
+    Stream one notebook and return its statistics: cells, code_cells,
+    markdown_cells, outputs, image_outputs, error_outputs, the analysis and
+    visualization libraries its code cells use, language and nbformat.
+    'error' is set (and the counts are partial) if the file is not valid JSON.
+    """
+    stats = {
+        'cells': 0,
+        'code_cells': 0,
+        'markdown_cells': 0,
+        'outputs': 0,
+        'image_outputs': 0,
+        'error_outputs': 0,
+        'analysis_libraries': set(),
+        'visualization_libraries': set(),
+        'language': None,
+        'nbformat': None,
+        'error': None,
+    }
+
+    try:
+        with open(path, 'rb') as f:
+            reader = _Reader(f)
+            for key in reader.iter_object():
+                if key == 'cells':
+                    _read_cells(reader, stats)
+                elif key == 'worksheets':
+                    for _ in reader.iter_array():
+                        for sheet_key in reader.iter_object():
+                            if sheet_key == 'cells':
+                                _read_cells(reader, stats)
+                            else:
+                                reader.skip_value()
+                elif key == 'metadata':
+                    _read_metadata(reader, stats)
+                elif key == 'nbformat':
+                    stats['nbformat'] = reader.read_scalar()
+                else:
+                    reader.skip_value()
+    except (OSError, NotebookFormatError) as e:
+        stats['error'] = str(e)
+
+    stats['analysis_libraries'] = sorted(stats['analysis_libraries'])
+    stats['visualization_libraries'] = sorted(stats['visualization_libraries'])
+    return stats
+
+
+def has_visualizations(stats):
+    """True if the notebook renders plots or imports a plotting library."""
+    return stats['image_outputs'] > 0 or bool(stats['visualization_libraries'])
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Summarize Jupyter notebooks without loading them whole")
+    parser.add_argument("notebooks", nargs="+", help="Notebook files")
+    args = parser.parse_args()
+
+    for notebook in args.notebooks:
+        stats = analyze_notebook(notebook)
+        print(f"{notebook} ({os.path.getsize(notebook) / 1024:.0f} KB)")
+        if stats['error']:
+            print(f"  ERROR: {stats['error']}")
+        print(f"  Cells: {stats['cells']} ({stats['code_cells']} code, {stats['markdown_cells']} markdown)")
+        print(f"  Outputs: {stats['outputs']} ({stats['image_outputs']} images, {stats['error_outputs']} errors)")
+        print(f"  Analysis libraries: {', '.join(stats['analysis_libraries']) or 'none'}")
+        print(f"  Visualization libraries: {', '.join(stats['visualization_libraries']) or 'none'}")
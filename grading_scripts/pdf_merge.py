@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Streaming PDF concatenation on top of PyPDF2's object model.
+
+PdfMerger/PdfWriter keep every copied object in memory until write(), so
+peak memory grows with the size of the uploads. merge_pdfs() instead copies
+one object at a time straight to the output file: references are renumbered
+on the fly, each object is written as soon as it is read and then dropped
+from the reader's cache. Memory stays bounded by the largest single object
+(usually one page's content stream) rather than the whole document.
+
+Outlines (bookmarks) are rebuilt with explicit page destinations, the same
+way PdfMerger imports them. Named destinations - the catalog's /Dests
+dictionary and the /Names /Dests name tree, which links and bookmarks can
+refer to by name - are carried over pointing at the new pages; when two
+inputs define the same name, the first one is kept.
+"""
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject,
+    IndirectObject, NameObject, NullObject, NumberObject, StreamObject,
+    create_string_object,
+)
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+
+# Fixed object numbers in the output
+CATALOG_NUM = 1
+PAGES_NUM = 2
+
+
+def _ref(num):
+    """Reference to object num in the output file."""
+    return IndirectObject(num, 0, None)
+
+
+def _remap(obj, ref_map, pending, allocate):
+    """
+    Copy a direct object, replacing references into the input with references
+    into the output. Newly seen references are queued on pending.
+    """
+    if isinstance(obj, IndirectObject):
+        key = (obj.idnum, obj.generation)
+        num = ref_map.get(key)
+        if num is None:
+            num = ref_map[key] = allocate()
+            pending.append((obj, num))
+        return _ref(num)
+
+    if isinstance(obj, StreamObject):
+        copy = EncodedStreamObject() if "/Filter" in obj else DecodedStreamObject()
+        copy._data = obj._data
+        for key, value in obj.items():
+            copy[key] = _remap(value, ref_map, pending, allocate)
+        return copy
+
+    if isinstance(obj, DictionaryObject):
+        copy = DictionaryObject()
+        for key, value in obj.items():
+            copy[key] = _remap(value, ref_map, pending, allocate)
+        return copy
+
+    if isinstance(obj, ArrayObject):
+        return ArrayObject(_remap(value, ref_map, pending, allocate) for value in obj)
+
+    return obj
+
+
+def _write_object(output, offsets, num, obj):
+    """Serialize one indirect object at the current position."""
+    offsets[num] = output.tell()
+    output.write(b"%d 0 obj\n" % num)
+    obj.write_to_stream(output, None)
+    output.write(b"\nendobj\n")
+
+
+def _copy_pending(output, offsets, reader, ref_map, pending, allocate):
+    """Write every queued object (and whatever it references) from reader."""
+    while pending:
+        ref, num = pending.pop()
+        obj = reader.get_object(ref)
+        if obj is None:
+            obj = NullObject()
+        _write_object(output, offsets, num, _remap(obj, ref_map, pending, allocate))
+
+        # The object is on disk now; let the reader forget it
+        reader.resolved_objects.pop((ref.generation, ref.idnum), None)
+
+
+def _collect_outline(outline, page_nums, ref_map):
+    """
+    Convert reader.outline into [(title, dest_array, children)] pointing at
+    output pages. Entries whose page cannot be found are dropped.
+    """
+    items = []
+    for entry in outline:
+        if isinstance(entry, list):
+            children = _collect_outline(entry, page_nums, ref_map)
+            if items:
+                items[-1][2].extend(children)
+            else:
+                items.extend(children)
+            continue
+
+        page = entry.raw_get("/Page")
+        if isinstance(page, IndirectObject):
+            num = ref_map.get((page.idnum, page.generation))
+        elif isinstance(page, int) and 0 <= page < len(page_nums):
+            num = page_nums[page]
+        else:
+            num = None
+
+        if num is None or num not in page_nums:
+            continue
+
+        dest = entry.dest_array
+        dest[0] = _ref(num)
+        items.append((entry.title, dest, []))
+
+    return items
+
+
+def _named_dest_array(value, page_nums, ref_map):
+    """A named destination's explicit array pointing at an output page, or None."""
+    value = value.get_object()
+    if isinstance(value, DictionaryObject):
+        value = value.get("/D")
+        value = value.get_object() if value is not None else None
+    if not isinstance(value, ArrayObject) or not value:
+        return None
+
+    page = value[0]
+    if not isinstance(page, IndirectObject):
+        return None
+    num = ref_map.get((page.idnum, page.generation))
+    if num is None or num not in page_nums:
+        return None
+    return ArrayObject([_ref(num)] + list(value[1:]))
+
+
+def _collect_named_dests(reader, page_nums, ref_map, dests, tree):
+    """
+    Add the reader's named destinations to dests (the /Dests dictionary,
+    {name: array}) and tree (the /Names /Dests name tree, {string: array}).
+    Names already present are kept.
+    """
+    root = reader.trailer["/Root"].get_object()
+
+    old_style = root.get("/Dests")
+    if old_style is not None:
+        for name, value in old_style.get_object().items():
+            array = _named_dest_array(value, page_nums, ref_map)
+            if array is not None and name not in dests:
+                dests[NameObject(name)] = array
+
+    names = root.get("/Names")
+    nodes = [names.get_object().get("/Dests")] if names is not None else []
+    visited = set()
+    while nodes:
+        node = nodes.pop()
+        if node is None:
+            continue
+        if isinstance(node, IndirectObject):
+            if (node.idnum, node.generation) in visited:
+                continue
+            visited.add((node.idnum, node.generation))
+        node = node.get_object()
+        pairs = node.get("/Names")
+        if pairs is not None:
+            pairs = pairs.get_object()
+            for name, value in zip(pairs[0::2], pairs[1::2]):
+                name = str(name.get_object())
+                array = _named_dest_array(value, page_nums, ref_map)
+                if array is not None and name not in tree:
+                    tree[name] = array
+        kids = node.get("/Kids")
+        if kids is not None:
+            nodes.extend(reversed(kids.get_object()))
+
+
+def _write_outline(output, offsets, allocate, items, parent_num):
+    """Write outline items under parent_num. Returns (first, last, descendant count)."""
+    nums = [allocate() for _ in items]
+    descendants = 0
+
+    for idx, (title, dest, children) in enumerate(items):
+        item = DictionaryObject({
+            NameObject("/Title"): create_string_object(title or ""),
+            NameObject("/Parent"): _ref(parent_num),
+            NameObject("/Dest"): dest,
+        })
+        if idx > 0:
+            item[NameObject("/Prev")] = _ref(nums[idx - 1])
+        if idx < len(items) - 1:
+            item[NameObject("/Next")] = _ref(nums[idx + 1])
+
+        if children:
+            first, last, count = _write_outline(output, offsets, allocate, children, nums[idx])
+            item[NameObject("/First")] = _ref(first)
+            item[NameObject("/Last")] = _ref(last)
+            item[NameObject("/Count")] = NumberObject(count)
+            descendants += count
+
+        _write_object(output, offsets, nums[idx], item)
+
+    descendants += len(items)
+    return nums[0], nums[-1], descendants
+
+
+def merge_pdfs(output_path, input_paths):
+    """
+    Write the pages of input_paths, in order, to output_path.
+    Returns the page count of each input.
+    """
+    offsets = {}
+    next_num = [PAGES_NUM + 1]
+
+    def allocate():
+        num = next_num[0]
+        next_num[0] += 1
+        return num
+
+    kids = []
+    outline_items = []
+    named_dests = {}
+    named_tree = {}
+    page_counts = []
+
+    with open(output_path, 'wb') as output:
+        output.write(PDF_HEADER)
+
+        for input_path in input_paths:
+            with open(input_path, 'rb') as handle:
+                reader = PdfReader(handle)
+                if reader.is_encrypted:
+                    reader.decrypt("")
+
+                # Number every page up front so links between pages resolve to
+                # the new page objects instead of dragging in the old page tree
+                ref_map = {}
+                page_nums = []
+                for page in reader.pages:
+                    num = allocate()
+                    if page.indirect_reference is not None:
+                        ref = page.indirect_reference
+                        ref_map[(ref.idnum, ref.generation)] = num
+                    page_nums.append(num)
+
+                pending = []
+                for page, num in zip(reader.pages, page_nums):
+                    page_copy = DictionaryObject()
+                    for key, value in page.items():
+                        if key != "/Parent":
+                            page_copy[key] = _remap(value, ref_map, pending, allocate)
+                    page_copy[NameObject("/Parent")] = _ref(PAGES_NUM)
+
+                    _write_object(output, offsets, num, page_copy)
+                    _copy_pending(output, offsets, reader, ref_map, pending, allocate)
+
+                try:
+                    outline_items.extend(_collect_outline(reader.outline, page_nums, ref_map))
+                except Exception:
+                    # A broken outline should not block the merge
+                    pass
+                try:
+                    _collect_named_dests(reader, page_nums, ref_map, named_dests, named_tree)
+                except Exception:
+                    # Neither should broken named destinations
+                    pass
+
+                kids.extend(page_nums)
+                page_counts.append(len(page_nums))
+
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): _ref(PAGES_NUM),
+        })
+
+        if outline_items:
+            outlines_num = allocate()
+            first, last, count = _write_outline(output, offsets, allocate, outline_items, outlines_num)
+            _write_object(output, offsets, outlines_num, DictionaryObject({
+                NameObject("/Type"): NameObject("/Outlines"),
+                NameObject("/First"): _ref(first),
+                NameObject("/Last"): _ref(last),
+                NameObject("/Count"): NumberObject(count),
+            }))
+            catalog[NameObject("/Outlines")] = _ref(outlines_num)
+
+        if named_dests:
+            catalog[NameObject("/Dests")] = DictionaryObject(named_dests)
+        if named_tree:
+            # A single leaf, its keys in sorted order as name trees require
+            leaf = ArrayObject()
+            for name in sorted(named_tree):
+                leaf.extend([create_string_object(name), named_tree[name]])
+            catalog[NameObject("/Names")] = DictionaryObject({
+                NameObject("/Dests"): DictionaryObject({NameObject("/Names"): leaf}),
+            })
+
+        _write_object(output, offsets, PAGES_NUM, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(_ref(num) for num in kids),
+            NameObject("/Count"): NumberObject(len(kids)),
+        }))
+        _write_object(output, offsets, CATALOG_NUM, catalog)
+
+        # Cross-reference table and trailer
+        size = next_num[0]
+        xref_offset = output.tell()
+        output.write(b"xref\n0 %d\n" % size)
+        output.write(b"0000000000 65535 f \n")
+        for num in range(1, size):
+            output.write(b"%010d 00000 n \n" % offsets[num])
+        output.write(b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (size, CATALOG_NUM))
+        output.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+    return page_counts
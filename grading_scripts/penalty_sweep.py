@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Sensitivity sweep of the self-grading penalty constants.
+
+Evaluates a grid of (A, B) candidates for
+    scale = A × e^(B × self_grade)
+against every cohort in assessments_tier2_assignment{1,2,3}. Self grades are
+read exactly as the Moodle publish path reads them (get_self_submitted_grade,
+the first grade found in submission_info.xlsx), base grades are the Tier 2
+total_score. For every pair it reports the grade distribution, pass rate and
+number of students zeroed out.
+
+The grid is split across a process pool and results are cached in
+.penalty_sweep_cache/ by a hash of the cohort inputs and the grid, so
+re-running the same sweep is instant.
+
+Usage:
+    python grading_scripts/penalty_sweep.py
+    python grading_scripts/penalty_sweep.py --a-range 0.05 0.12 200 --b-range 0.02 0.035 200 --workers 8
+    python grading_scripts/penalty_sweep.py --a 0.086603 0.07 --b 0.027465 --output sweep.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from file_utils import load_manifest, save_manifest
+from update_moodle_grades_assignment1 import get_self_submitted_grade
+from weighted_grades import (
+    SCALE_COEFFICIENT_A, SCALE_EXPONENT_B, calculate_weighted_grades, np,
+)
+
+CACHE_DIR = Path(".penalty_sweep_cache")
+
+# Bump when the statistics below change so stale cache entries are ignored
+SWEEP_VERSION = "1"
+
+PASSING_GRADE = 60
+
+# Letter bands from the grading summary (on the rounded-up weighted grade)
+GRADE_BANDS = [('A', 90), ('B', 80), ('C', 70), ('D', 60), ('F', 0)]
+
+# Per-pair statistics, stored column-wise
+STAT_FIELDS = ['pass_rate', 'mean_weighted', 'mean_penalty', 'zeroed', 'bands']
+
+# Grid pairs evaluated per worker task
+CHUNK_SIZE = 2000
+
+
+def load_cohort(assignment_num):
+    """
+    Return [(student_id, self_grade, base_grade)] for one assignment.
+    Students without a self-grade use their calculated grade, as in Moodle.
+    """
+    assessments_dir = Path(f"assessments_tier2_assignment{assignment_num}")
+    submissions_dir = Path(f"WorkSubmissions0{assignment_num}")
+    cohort = []
+
+    for json_file in sorted(assessments_dir.glob("tier2_assessment_*.json")):
+        student_id = json_file.stem.replace("tier2_assessment_", "")
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            assessment = json.load(f)
+
+        # The grade Moodle publishes: the self-grade, else the calculated grade
+        self_grade = get_self_submitted_grade(student_id, submissions_dir)
+        if self_grade is None:
+            self_grade = math.ceil(assessment.get('final_grade', 0))
+
+        cohort.append((student_id, float(self_grade), float(assessment.get('total_score', 0))))
+
+    return cohort
+
+
+def build_grid(a_values, b_values):
+    """Cartesian product of the candidate constants as two flat lists."""
+    grid_a = [a for a in a_values for _ in b_values]
+    grid_b = [b for _ in a_values for b in b_values]
+    return grid_a, grid_b
+
+
+def _linspace(start, stop, num):
+    """Evenly spaced values including both ends (numpy.linspace without numpy)."""
+    num = int(num)
+    if num <= 1:
+        return [float(start)]
+    step = (stop - start) / (num - 1)
+    return [start + i * step for i in range(num)]
+
+
+def _mean(values):
+    """Exactly rounded mean, so NumPy and pure-Python runs agree to the bit."""
+    return math.fsum(values) / len(values) if len(values) else 0.0
+
+
+def _evaluate_chunk(task):
+    """
+    Evaluate one slice of the grid. Runs inside a worker process.
+    Returns column lists keyed by STAT_FIELDS, one entry per (A, B) pair.
+    """
+    self_grades, base_grades, grid_a, grid_b = task
+    stats = {field: [] for field in STAT_FIELDS}
+
+    if np is None:
+        for a, b in zip(grid_a, grid_b):
+            result = calculate_weighted_grades(self_grades, base_grades, a, b)
+            _append_stats(stats, result['display'], result['weighted'], result['penalty'])
+        return stats
+
+    # One (pairs × students) evaluation for the whole chunk
+    result = calculate_weighted_grades(self_grades, base_grades,
+                                       np.asarray(grid_a)[:, None], np.asarray(grid_b)[:, None])
+    display = result['display']
+    count = len(self_grades)
+
+    # Band index = number of band minimums the grade falls below
+    minimums = np.array([minimum for _, minimum in GRADE_BANDS])
+    band_idx = (display[..., None] < minimums).sum(axis=-1)
+    bands = (band_idx[..., None] == np.arange(len(GRADE_BANDS))).sum(axis=1)
+    passed = (display >= PASSING_GRADE).sum(axis=1)
+
+    stats['pass_rate'] = [int(n) / count if count else 0.0 for n in passed]
+    stats['mean_weighted'] = [_mean(row) for row in result['weighted']]
+    stats['mean_penalty'] = [_mean(row) for row in result['penalty']]
+    stats['zeroed'] = (result['weighted'] == 0).sum(axis=1).tolist()
+    stats['bands'] = bands.tolist()
+    return stats
+
+
+def _append_stats(stats, displays, weighted, penalties):
+    """Append the statistics of one (A, B) pair to the column lists."""
+    bands = [0] * len(GRADE_BANDS)
+    for grade in displays:
+        for idx, (_, minimum) in enumerate(GRADE_BANDS):
+            if grade >= minimum:
+                bands[idx] += 1
+                break
+
+    passed = sum(1 for grade in displays if grade >= PASSING_GRADE)
+    stats['pass_rate'].append(passed / len(displays) if len(displays) else 0.0)
+    stats['mean_weighted'].append(_mean(weighted))
+    stats['mean_penalty'].append(_mean(penalties))
+    stats['zeroed'].append(sum(1 for grade in weighted if grade == 0))
+    stats['bands'].append(bands)
+
+
+def _cache_key(cohort, a_values, b_values):
+    """Hash of everything that determines a sweep result."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([SWEEP_VERSION, PASSING_GRADE, GRADE_BANDS, cohort,
+                              list(a_values), list(b_values)]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def sweep_cohort(cohort, a_values, b_values, workers=1, use_cache=True):
+    """
+    Evaluate every (A, B) pair of the grid for one cohort.
+    Returns (grid_a, grid_b, stats) with stats as column lists per STAT_FIELDS.
+    """
+    grid_a, grid_b = build_grid(a_values, b_values)
+
+    cache_path = CACHE_DIR / f"{_cache_key(cohort, a_values, b_values)}.json"
+    if use_cache:
+        cached = load_manifest(cache_path)
+        if all(field in cached for field in STAT_FIELDS):
+            return grid_a, grid_b, cached
+
+    self_grades = [self_grade for _, self_grade, _ in cohort]
+    base_grades = [base_grade for _, _, base_grade in cohort]
+    tasks = [(self_grades, base_grades, grid_a[i:i + CHUNK_SIZE], grid_b[i:i + CHUNK_SIZE])
+             for i in range(0, len(grid_a), CHUNK_SIZE)]
+
+    if workers <= 1 or len(tasks) <= 1:
+        chunks = [_evaluate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_evaluate_chunk, tasks))
+
+    stats = {field: [] for field in STAT_FIELDS}
+    for chunk in chunks:
+        for field in STAT_FIELDS:
+            stats[field].extend(chunk[field])
+
+    if use_cache:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # Compact JSON: these files hold one entry per grid pair
+        save_manifest(cache_path, stats, indent=None)
+
+    return grid_a, grid_b, stats
+
+
+def print_cohort_summary(assignment_num, cohort, grid_a, grid_b, stats, top):
+    """Print the current constants and the best pairs by pass rate."""
+    pairs = len(grid_a)
+    print("\n" + "=" * 80)
+    print(f"ASSIGNMENT {assignment_num} - {len(cohort)} students, {pairs} (A, B) pairs")
+    print("=" * 80)
+
+    if not cohort:
+        print("No assessments found.")
+        return
+
+    baseline = _evaluate_chunk(([c[1] for c in cohort], [c[2] for c in cohort],
+                                [SCALE_COEFFICIENT_A], [SCALE_EXPONENT_B]))
+    print(f"Current constants (A={SCALE_COEFFICIENT_A}, B={SCALE_EXPONENT_B}):")
+    print(f"  {format_stats(baseline, 0)}")
+
+    pass_rate, mean_weighted = stats['pass_rate'], stats['mean_weighted']
+    order = sorted(range(pairs), key=lambda i: (pass_rate[i], mean_weighted[i]), reverse=True)
+    print(f"\nTop {min(top, pairs)} pairs by pass rate:")
+    for i in order[:top]:
+        print(f"  A={grid_a[i]:.6f}, B={grid_b[i]:.6f}: {format_stats(stats, i)}")
+
+    if pairs > top:
+        worst = order[-1]
+        print(f"\nHarshest pair: A={grid_a[worst]:.6f}, B={grid_b[worst]:.6f}: {format_stats(stats, worst)}")
+
+
+def format_stats(stats, i):
+    """One-line summary of pair i's statistics."""
+    bands = ", ".join(f"{band}={count}" for (band, _), count in zip(GRADE_BANDS, stats['bands'][i]))
+    return (f"Pass {stats['pass_rate'][i]*100:.1f}%, Mean {stats['mean_weighted'][i]:.2f}, "
+            f"Penalty {stats['mean_penalty'][i]:.2f}, Zeroed {stats['zeroed'][i]} [{bands}]")
+
+
+def write_csv(output_path, results):
+    """Write every (assignment, A, B) row to a CSV file."""
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['assignment', 'a', 'b', 'pass_rate', 'mean_weighted', 'mean_penalty',
+                         'zeroed'] + [f"band_{band}" for band, _ in GRADE_BANDS])
+        for assignment_num, grid_a, grid_b, stats in results:
+            for i, (a, b) in enumerate(zip(grid_a, grid_b)):
+                writer.writerow([assignment_num, a, b, round(stats['pass_rate'][i], 4),
+                                 round(stats['mean_weighted'][i], 4), round(stats['mean_penalty'][i], 4),
+                                 stats['zeroed'][i]] + stats['bands'][i])
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Sweep the penalty formula constants")
+    parser.add_argument("--assignments", type=int, nargs="+", default=[1, 2, 3],
+                        help="Assignments to evaluate (default: 1 2 3)")
+    parser.add_argument("--a", type=float, nargs="+", help="Explicit values for A")
+    parser.add_argument("--b", type=float, nargs="+", help="Explicit values for B")
+    parser.add_argument("--a-range", type=float, nargs=3, metavar=("START", "STOP", "NUM"),
+                        default=[0.05, 0.12, 100], help="Evenly spaced A values (default: 0.05 0.12 100)")
+    parser.add_argument("--b-range", type=float, nargs=3, metavar=("START", "STOP", "NUM"),
+                        default=[0.02, 0.035, 100], help="Evenly spaced B values (default: 0.02 0.035 100)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the grid (default: CPU count)")
+    parser.add_argument("--top", type=int, default=5, help="Pairs to print per assignment")
+    parser.add_argument("--output", type=Path, help="Write every pair to this CSV file")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute instead of using the cache")
+    args = parser.parse_args()
+
+    a_values = args.a or _linspace(*args.a_range)
+    b_values = args.b or _linspace(*args.b_range)
+
+    print("=" * 80)
+    print(f"PENALTY CONSTANT SWEEP: {len(a_values)} A × {len(b_values)} B = "
+          f"{len(a_values) * len(b_values)} pairs")
+    print("=" * 80)
+
+    results = []
+    for assignment_num in args.assignments:
+        cohort = load_cohort(assignment_num)
+        grid_a, grid_b, stats = sweep_cohort(cohort, a_values, b_values, workers=args.workers,
+                                             use_cache=not args.no_cache)
+        print_cohort_summary(assignment_num, cohort, grid_a, grid_b, stats, args.top)
+        results.append((assignment_num, grid_a, grid_b, stats))
+
+    if args.output:
+        write_csv(args.output, results)
+        print(f"\nAll pairs saved to: {args.output}")
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Generate repo_assessment.md (the 22-criterion table of grading step 3) and
+keep a cohort-wide index of the results.
+
+Each criterion is decided from the shared repository index: most from the
+Tier 2 skill sub-scores (reused from the result cache when the repository
+is unchanged), the rest from direct index queries. The report follows the
+layout of the existing hand-written assessments.
+
+WorkSubmissionsN/.repo_assessment_index.json records every student's
+criteria and TRUE count. Hand-written repo_assessment.md files are parsed
+into it once (keyed by mtime and size) and never overwritten without
+--overwrite; generated ones are rebuilt only when the repository tree hash
+or CRITERIA_VERSION changes. The Tier 1 / Tier 2 split of step 4 is then
+read straight from the index with --tiers.
+
+Usage:
+    python grading_scripts/repo_assessment.py --assignment 2
+    python grading_scripts/repo_assessment.py --assignment 3 --students 63698 63709 --overwrite
+    python grading_scripts/repo_assessment.py --assignment 3 --tiers
+"""
+import argparse
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from file_utils import load_manifest, save_manifest
+from repo_index import build_repo_index
+from result_cache import SkillResultCache, tree_hash
+from submission_info_index import FOLDER_PREFIX, FOLDER_SUFFIX, build_submission_index
+from tier2_orchestrator import checkout_root, find_repository, performance_tier, repo_name_from_url, run_skills
+from tier2_skills import CODE_EXTS, DOC_EXTS, file_text, find_readme, headings, is_test_file, name_has
+
+INDEX_NAME = ".repo_assessment_index.json"
+ASSESSMENT_NAME = "repo_assessment.md"
+
+# Bump when a criterion's rule or the report layout changes
+CRITERIA_VERSION = "1"
+
+GENERATED_MARKER = "**Generated by:** repo_assessment.py"
+
+# Self-grade from which a student is graded with the ten Tier 2 skills (step 4)
+TIER2_SELF_GRADE = 80
+
+CONFIG_FILES = (
+    'requirements.txt', 'pyproject.toml', 'setup.cfg', 'setup.py', 'package.json', 'environment.yml',
+    'pipfile', 'poetry.lock', '.env.example', 'config.yaml', 'config.yml', 'config.json', 'settings.py',
+)
+CONFIG_DIRS = ('config', 'configs', 'conf', 'settings')
+CONFIG_EXTS = ('.yaml', '.yml', '.json', '.toml', '.ini', '.cfg')
+
+EDGE_CASE_PATTERN = re.compile(
+    r'pytest\.raises|assertRaises|toThrow|\bedge[\s_]?case|\binvalid\w*|\bempty\w*|boundary|\bexcept\b', re.I)
+TEST_RESULTS_KEYWORDS = ('test', 'coverage', 'qa')
+TEST_RESULTS_HEADING = re.compile(r'test|coverage|result', re.I)
+TEST_REPORT_FILES = ('coverage.xml', 'coverage.json', '.coverage', 'junit.xml', 'test-results.xml')
+
+PARAMETER_DOC_KEYWORDS = ('experiment', 'sensitivity', 'parameter', 'tuning', 'ablation', 'sweep')
+PARAMETER_PATTERN = re.compile(
+    r'sensitivity\s+analysis|hyper-?parameter|parameter\s+(?:study|investigation|sweep|tuning|exploration)|ablation',
+    re.I)
+
+INTERFACE_DOC_KEYWORDS = ('api', 'cli', 'interface', 'usage', 'guide', 'manual')
+
+PRODUCT_QUALITY_PATTERN = re.compile(
+    r'iso\s*(?:/\s*iec\s*)?25010|non-?functional\s+requirements|quality\s+(?:attributes|characteristics)', re.I)
+
+MIN_MODULE_FILES = 3
+
+
+def _notes(details, skill, limit=2):
+    return details[skill]['notes'][:limit]
+
+
+def _files(found, label, limit=3):
+    return [f"{label}: {', '.join(f.path for f in found[:limit])}"] if found else []
+
+
+def _skill(skill, predicate):
+    """A criterion decided by one skill's sub-scores; that skill's notes are the evidence."""
+    def check(index, details):
+        return predicate(details[skill]), _notes(details, skill)
+    return check
+
+
+def _modular_structure(index, details):
+    code = [f for f in index.with_ext(*CODE_EXTS) if not is_test_file(f)]
+    packages = sorted({f.path.rsplit('/', 1)[0] for f in code if '/' in f.path})
+    evidence = [f"{len(code)} source file(s) in {len(packages)} package director(ies)"]
+    return len(code) >= MIN_MODULE_FILES and bool(packages), evidence + _notes(details, 'extensibility', 1)
+
+
+def _configuration_files(index, details):
+    found = index.named(*CONFIG_FILES)
+    found += [f for f in index.with_ext(*CONFIG_EXTS)
+              if any(part.lower() in CONFIG_DIRS for part in f.parts[:-1]) and f not in found]
+    return bool(found), _files(found, "Configuration")
+
+
+def _edge_cases(index, details):
+    found = [f for f in index if is_test_file(f) and EDGE_CASE_PATTERN.search(file_text(f))]
+    return bool(found), _files(found, "Error/edge-case tests")
+
+
+def _expected_test_results(index, details):
+    found = [f for f in index.with_ext(*DOC_EXTS) if name_has(f, TEST_RESULTS_KEYWORDS)]
+    found += index.named(*TEST_REPORT_FILES)
+    if found:
+        return True, _files(found, "Test results documented")
+    readme_section = any(TEST_RESULTS_HEADING.search(h) for h in headings(file_text(find_readme(index))))
+    return readme_section, ["README.md test/results section"] if readme_section else []
+
+
+def _parameter_investigation(index, details):
+    found = [f for f in index.with_ext(*DOC_EXTS, '.ipynb') if name_has(f, PARAMETER_DOC_KEYWORDS)]
+    if found:
+        return True, _files(found, "Experiments")
+    found = [f for f in index.with_ext(*DOC_EXTS, '.ipynb') if PARAMETER_PATTERN.search(file_text(f))]
+    return bool(found), _files(found, "Parameter discussion")
+
+
+def _results_notebook(index, details):
+    found = index.with_ext('.ipynb')
+    return bool(found), _files(found, "Notebooks") + _notes(details, 'research_analysis', 3)[1:]
+
+
+def _interface_documentation(index, details):
+    found = [f for f in index.with_ext(*DOC_EXTS) if name_has(f, INTERFACE_DOC_KEYWORDS)]
+    return bool(found) or details['ui_ux']['user_guide_score'] > 0, _files(found, "Interface docs")
+
+
+def _product_quality(index, details):
+    found = [f for f in index.with_ext(*DOC_EXTS) if PRODUCT_QUALITY_PATTERN.search(file_text(f))]
+    return bool(found), _files(found, "Quality characteristics")
+
+
+# (criterion, check(index, skill_details) -> (met, evidence lines)), in report order
+CRITERIA = [
+    ("Product Requirements Document", _skill('project_planning', lambda d: d['prd_found'])),
+    ("Architecture Document", _skill('project_planning', lambda d: d['architecture_found'])),
+    ("README File (Comprehensive)", _skill('code_documentation', lambda d: d['readme_score'] >= 3.0)),
+    ("Modular Project Structure", _modular_structure),
+    ("Code Quality and Comments", _skill('code_documentation', lambda d: d['docstring_score'] > 0)),
+    ("Configuration Files", _configuration_files),
+    ("Information Security", _skill('config_security', lambda d: d['secrets_score'] > 0 and d['gitignore_score'] > 0)),
+    ("Unit Tests", _skill('testing_quality', lambda d: d['test_exists_score'] > 0)),
+    ("Handling Edge Cases and Failures", _edge_cases),
+    ("Expected Test Results", _expected_test_results),
+    ("Parameter Investigation", _parameter_investigation),
+    ("Results Analysis Notebook", _results_notebook),
+    ("Visual Presentation of Results", _skill('research_analysis', lambda d: d['visualizations_score'] > 0)),
+    ("Quality Criteria", _skill('quality_standards', lambda d: d['linting_score'] > 0 or d['ci_score'] > 0
+                                or d['style_score'] > 0)),
+    ("Interface Documentation", _interface_documentation),
+    ("Best Practices with Git", _skill('version_management', lambda d: d['commits_score'] > 0
+                                       and d['meaningful_score'] > 0)),
+    ("The Prompt Book", _skill('version_management', lambda d: d['prompt_book_score'] > 0)),
+    ("Cost Analysis", _skill('costs_pricing', lambda d: d['cost_analysis_score'] > 0)),
+    ("Budget Management", _skill('costs_pricing', lambda d: d['budget_tracking_score'] >= 1.5)),
+    ("Extension Points", _skill('extensibility', lambda d: d['plugin_score'] >= 3.0
+                                or d['extension_docs_score'] >= 1.0)),
+    ("Maintainability", _skill('extensibility', lambda d: d['modular_score'] >= 2.0)),
+    ("Product Quality Characteristics", _product_quality),
+]
+
+CRITERIA_COUNT = len(CRITERIA)
+
+TABLE_ROW = re.compile(r'^\|\s*\d+\s*\|\s*(.+?)\s*\|\s*\**\s*(TRUE|FALSE)\b', re.MULTILINE)
+SCORE_LINE = re.compile(r'Score:\s*\**\s*(\d+)\s*/\s*22')
+
+
+def assess_criteria(index, skill_details):
+    """Return [(criterion, met, evidence lines)] in report order."""
+    results = []
+    for criterion, check in CRITERIA:
+        met, evidence = check(index, skill_details)
+        results.append((criterion, bool(met), evidence))
+    return results
+
+
+def render_assessment(student_id, repository_name, github_url, team, results):
+    """The repo_assessment.md text for one student."""
+    true_count = sum(1 for _, met, _ in results if met)
+    lines = [
+        f"# Repository Assessment: {repository_name}",
+        f"**Repository:** {github_url}",
+        f"**Assessment Date:** {date.today().isoformat()}",
+        f"**Group:** {team or 'N/A'}",
+        f"**Participant ID:** {student_id}",
+        f"{GENERATED_MARKER} v{CRITERIA_VERSION}",
+        "",
+        "---",
+        "",
+        "## Assessment Results",
+        "",
+        "| # | Criterion | Met (TRUE/FALSE) |",
+        "|---|-----------|------------------|",
+    ]
+    for number, (criterion, met, _) in enumerate(results, 1):
+        lines.append(f"| {number} | {criterion} | {'TRUE' if met else 'FALSE'} |")
+
+    lines += [
+        "",
+        "---",
+        "",
+        f"**Score: {true_count}/{CRITERIA_COUNT} criteria met ({true_count / CRITERIA_COUNT:.0%})**",
+        "",
+        "---",
+        "",
+        "## Key Findings",
+        "",
+        f"### ✅ Strengths ({true_count}/{CRITERIA_COUNT} criteria met)",
+        "",
+    ]
+    for criterion, met, evidence in results:
+        if met:
+            lines.append(f"**{criterion} (TRUE):**")
+            lines += [f"- {line}" for line in evidence] or ["- Criterion met"]
+            lines.append("")
+
+    missing = CRITERIA_COUNT - true_count
+    lines += [f"### ❌ Missing Criteria ({missing}/{CRITERIA_COUNT} not met)", ""]
+    for criterion, met, evidence in results:
+        if not met:
+            lines.append(f"**{criterion} (FALSE):**")
+            lines += [f"- {line}" for line in evidence] or ["- No supporting evidence found"]
+            lines.append("")
+
+    return "\n".join(lines)
+
+
+def render_unassessable(student_id, github_url, reason):
+    return "\n".join([
+        "# Repository Assessment: UNABLE TO ASSESS",
+        "",
+        f"**Participant ID:** {student_id}",
+        f"**Assessment Date:** {date.today().isoformat()}",
+        f"**Repository URL:** {github_url or 'N/A'}",
+        f"{GENERATED_MARKER} v{CRITERIA_VERSION}",
+        "",
+        "---",
+        "",
+        f"**Reason:** {reason}",
+        "",
+        "## Assessment Result",
+        "",
+        f"**Score: 0/{CRITERIA_COUNT} criteria met (0%)**",
+        "",
+    ])
+
+
+def parse_assessment(text):
+    """
+    Read {criterion: met} and the TRUE count from a repo_assessment.md.
+    The count comes from the table when it has one, else from the Score line.
+    """
+    criteria = {criterion: verdict == 'TRUE' for criterion, verdict in TABLE_ROW.findall(text)}
+    if criteria:
+        return criteria, sum(criteria.values())
+    score = SCORE_LINE.search(text)
+    return criteria, int(score.group(1)) if score else 0
+
+
+def _write(path, text):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _file_entry(path, source, criteria, true_count, tree=None):
+    stat = path.stat()
+    return {
+        'source': source,
+        'criteria_version': CRITERIA_VERSION if source == 'generated' else None,
+        'tree': tree,
+        'criteria': criteria,
+        'true_count': true_count,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+
+
+def update_student(student_id, participant_dir, info, entry, overwrite=False, use_cache=True):
+    """
+    Bring one student's repo_assessment.md and index entry up to date.
+    Returns (entry or None, status, message).
+    """
+    assessment_path = participant_dir / ASSESSMENT_NAME
+    github_url = info.get('github_repository')
+
+    try:
+        stat = assessment_path.stat()
+    except OSError:
+        stat = None
+    entry_current = (entry is not None and stat is not None
+                     and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size)
+
+    if stat is not None and not entry_current:
+        # Unindexed or edited by hand since it was indexed
+        text = assessment_path.read_text(encoding='utf-8', errors='replace')
+        criteria, true_count = parse_assessment(text)
+        source = 'generated' if GENERATED_MARKER in text else 'existing'
+        entry = _file_entry(assessment_path, source, criteria, true_count)
+        entry_current = True
+        if source == 'existing' and not overwrite:
+            return entry, 'indexed', f"{true_count}/{CRITERIA_COUNT} (existing report)"
+
+    if entry_current and entry['source'] == 'existing' and not overwrite:
+        return entry, 'current', f"{entry['true_count']}/{CRITERIA_COUNT} (existing report)"
+
+    if not github_url:
+        if entry_current and entry['source'] == 'generated' and entry['tree'] is None and not overwrite:
+            return entry, 'current', "no repository URL"
+        _write(assessment_path, render_unassessable(student_id, None, "No GitHub repository URL provided in submission"))
+        return _file_entry(assessment_path, 'generated', {}, 0), 'no_repository', "no repository URL"
+
+    repository = find_repository(participant_dir, github_url)
+    if repository is None:
+        return entry, 'failed', f"Repository not found in {participant_dir.name} ({github_url})"
+
+    index = build_repo_index(repository, git_root=checkout_root(participant_dir, repository))
+    tree = tree_hash(index)
+    if (entry_current and entry['source'] == 'generated' and entry['tree'] == tree
+            and entry['criteria_version'] == CRITERIA_VERSION and not overwrite):
+        return entry, 'current', f"{entry['true_count']}/{CRITERIA_COUNT} (unchanged)"
+
+    skill_details, errors, _ = run_skills(index, result_cache=SkillResultCache() if use_cache else None)
+    if errors:
+        return entry, 'failed', "; ".join(errors)
+
+    results = assess_criteria(index, skill_details)
+    text = render_assessment(student_id, repo_name_from_url(github_url) or repository.name, github_url,
+                             info.get('team'), results)
+    _write(assessment_path, text)
+    criteria = {criterion: met for criterion, met, _ in results}
+    true_count = sum(criteria.values())
+    return (_file_entry(assessment_path, 'generated', criteria, true_count, tree), 'generated',
+            f"{true_count}/{CRITERIA_COUNT}")
+
+
+def update_cohort(assignment_num, students=None, overwrite=False, use_cache=True):
+    """Generate or index repo_assessment.md for every participant; returns (index entries, stats)."""
+    submissions_dir = Path(f"WorkSubmissions0{assignment_num}")
+
+    print("=" * 70)
+    print(f"REPOSITORY ASSESSMENT (22 CRITERIA) - ASSIGNMENT {assignment_num}")
+    print("=" * 70)
+
+    if not submissions_dir.exists():
+        print(f"ERROR: Submissions directory not found: {submissions_dir}")
+        return None, None
+
+    index_path = submissions_dir / INDEX_NAME
+    entries = load_manifest(index_path).get('students', {})
+    submission_info = build_submission_index(submissions_dir)
+
+    stats = {'generated': 0, 'indexed': 0, 'current': 0, 'no_repository': 0, 'failed': 0}
+    for participant_dir in sorted(submissions_dir.glob(f"{FOLDER_PREFIX}*{FOLDER_SUFFIX}")):
+        student_id = participant_dir.name[len(FOLDER_PREFIX):-len(FOLDER_SUFFIX)]
+        if students and student_id not in students:
+            continue
+
+        try:
+            entry, status, message = update_student(student_id, participant_dir,
+                                                    submission_info.get(student_id) or {},
+                                                    entries.get(student_id), overwrite, use_cache)
+        except Exception as e:
+            entry, status, message = entries.get(student_id), 'failed', f"{type(e).__name__}: {e}"
+
+        stats[status] += 1
+        if entry is not None:
+            entries[student_id] = entry
+        if status != 'current':
+            label = {'generated': "OK", 'indexed': "INDEXED", 'no_repository': "NO REPO"}.get(status, "FAIL")
+            print(f"  [{label}] {student_id}: {message}")
+
+    save_manifest(index_path, {'criteria_version': CRITERIA_VERSION, 'students': entries})
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Generated: {stats['generated']}")
+    print(f"Indexed existing reports: {stats['indexed']}")
+    print(f"Unchanged: {stats['current']}")
+    print(f"No repository URL: {stats['no_repository']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Index: {index_path}")
+    print("=" * 70)
+    return entries, stats
+
+
+def print_tiers(assignment_num):
+    """Step 4: split the cohort by self-grade using the TRUE counts in the index."""
+    submissions_dir = Path(f"WorkSubmissions0{assignment_num}")
+    entries = load_manifest(submissions_dir / INDEX_NAME).get('students', {})
+    if not entries:
+        print(f"No index in {submissions_dir} - run without --tiers first")
+        return
+
+    submission_info = build_submission_index(submissions_dir)
+    tier1, tier2, ungraded = [], [], []
+    for student_id, entry in sorted(entries.items()):
+        self_grade = (submission_info.get(student_id) or {}).get('suggested_grade')
+        if self_grade is None:
+            ungraded.append(student_id)
+        elif self_grade < TIER2_SELF_GRADE:
+            tier1.append((student_id, self_grade, entry['true_count']))
+        else:
+            tier2.append((student_id, self_grade, entry['true_count']))
+
+    print(f"Tier 1 Students (Self-Grade < {TIER2_SELF_GRADE}): {len(tier1)}")
+    for student_id, self_grade, true_count in tier1:
+        final_grade = round(true_count / CRITERIA_COUNT * 100, 1)
+        print(f"  Participant {student_id}: Self={self_grade:g}, TRUE={true_count}/{CRITERIA_COUNT} "
+              f"-> Final={final_grade} ({performance_tier(final_grade)[0]})")
+
+    print(f"\nTier 2 Students (Self-Grade >= {TIER2_SELF_GRADE}): {len(tier2)}")
+    for student_id, self_grade, true_count in tier2:
+        print(f"  Participant {student_id}: Self={self_grade:g}, TRUE={true_count}/{CRITERIA_COUNT} -> Run 10 skills")
+
+    if ungraded:
+        print(f"\nNo self-grade in submission_info.xlsx: {', '.join(ungraded)}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate repo_assessment.md files and the cohort criteria index")
+    parser.add_argument("--assignment", type=int, required=True, choices=[1, 2, 3],
+                        help="Assignment number")
+    parser.add_argument("--students", nargs="+",
+                        help="Only assess these student IDs")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Regenerate every report, including hand-written ones")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every skill, ignoring cached results from earlier grading runs")
+    parser.add_argument("--tiers", action="store_true",
+                        help="Only print the Tier 1 / Tier 2 split from the existing index")
+    args = parser.parse_args()
+
+    if args.tiers:
+        print_tiers(args.assignment)
+    else:
+        _, stats = update_cohort(args.assignment, students=args.students, overwrite=args.overwrite,
+                                 use_cache=not args.no_cache)
+        if stats is None or stats['failed']:
+            raise SystemExit(1)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Fetch every participant's repository for an assignment.
+
+The GitHub URL of each participant comes from the submission_info index
+(submission_info_index.py). Each repository is mirrored once into a local
+bare-repository cache (.repo_mirrors/<host>/<owner>/<repo>.git) and then
+cloned from the mirror into the participant folder, where the Tier 2
+orchestrator and repo_assessment.py look for it. Up to --concurrency
+repositories are fetched at a time.
+
+Re-running is incremental: existing mirrors are updated with `git fetch`
+(only new objects cross the network), and existing checkouts are fast-
+forwarded from their mirror. Any URL git understands works, including
+file:// remotes for offline testing. GitHub page titles pasted instead of a
+link ("GitHub - owner/repo") are turned back into the repository URL, and a
+link into a folder (.../tree/main/ex1) clones the whole repository; the
+orchestrator then assesses only that folder. Git never prompts for
+credentials, so a private or deleted repository fails instead of hanging
+the batch.
+
+Usage:
+    python grading_scripts/repo_fetcher.py --assignment 3
+    python grading_scripts/repo_fetcher.py --assignment 3 --students 63698 63709 --concurrency 4
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from submission_info_index import FOLDER_PREFIX, FOLDER_SUFFIX, build_submission_index
+
+MIRROR_DIR = Path(".repo_mirrors")
+
+DEFAULT_CONCURRENCY = 8
+
+# Seconds a single git command may run (a first clone of a large repository included)
+DEFAULT_GIT_TIMEOUT = 600
+
+GIT_ENV = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_ASKPASS="", GCM_INTERACTIVE="never")
+
+# Browser page titles pasted instead of a URL:
+#   "GitHub - owner/repo[: description]"
+#   "repo/sub/dir at main · owner/repo · GitHub"
+GITHUB_TITLE = re.compile(r'^GitHub\s+-\s+([\w.-]+)/([\w.-]+)')
+GITHUB_TREE_TITLE = re.compile(r'^(\S+) at \S+ · ([\w.-]+)/([\w.-]+) · GitHub$')
+
+# One lock per mirror: team members submit the same URL
+_MIRROR_LOCKS = {}
+_MIRROR_LOCKS_GUARD = threading.Lock()
+
+
+class FetchError(Exception):
+    """Raised when a git command fails or times out."""
+
+
+def _github_url(owner, repo):
+    repo = repo[:-4] if repo.endswith('.git') else repo
+    return f"https://github.com/{owner}/{repo}"
+
+
+def parse_repository_url(submitted_url):
+    """
+    Split a submitted repository link into (URL to clone, subdirectory or
+    None). GitHub links are cut to https://github.com/<owner>/<repo>, keeping
+    the folder of a /tree/<branch>/<folder> link as the subdirectory; GitHub
+    page titles pasted instead of a link are recognized as well. Other URLs
+    are used as given. None if there is nothing to clone.
+    """
+    if not submitted_url:
+        return None
+    text = submitted_url.strip()
+
+    match = GITHUB_TREE_TITLE.match(text)
+    if match:
+        path, owner, repo = match.groups()
+        # The title's path starts with the repository name
+        subpath = path.split('/', 1)[1] if '/' in path else None
+        return _github_url(owner, repo), subpath or None
+    match = GITHUB_TITLE.match(text)
+    if match:
+        return _github_url(*match.groups()), None
+
+    url = text.rstrip('/')
+    parsed = urlparse(url)
+    if not parsed.scheme:
+        return None
+    if parsed.netloc.lower() in ('github.com', 'www.github.com'):
+        segments = [s for s in parsed.path.split('/') if s]
+        if len(segments) < 2:
+            return None
+        subpath = None
+        if len(segments) > 4 and segments[2] == 'tree':
+            subpath = unquote('/'.join(segments[4:]))
+        return _github_url(segments[0], segments[1]), subpath
+    return url, None
+
+
+def clone_url(submitted_url):
+    """The URL to clone for a submitted repository link (None if there is nothing to clone)."""
+    parsed = parse_repository_url(submitted_url)
+    return parsed[0] if parsed else None
+
+
+def checkout_name(url):
+    """Folder name of the checkout: the repository name without .git."""
+    name = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    return name[:-4] if name.endswith('.git') else name
+
+
+def mirror_path(url, mirror_dir=MIRROR_DIR):
+    """Location of the bare mirror for url inside mirror_dir."""
+    parsed = urlparse(url)
+    if parsed.scheme == 'file' or not parsed.netloc:
+        # Local remotes: keyed by their full path so equal names cannot collide
+        digest = hashlib.sha1(parsed.path.encode('utf-8')).hexdigest()[:12]
+        return Path(mirror_dir) / "local" / f"{digest}-{checkout_name(url)}.git"
+    segments = [s for s in parsed.path.split('/') if s]
+    segments[-1] = checkout_name(url) + ".git"
+    return Path(mirror_dir).joinpath(parsed.netloc.lower(), *(s.lower() for s in segments))
+
+
+def _git(args, cwd=None, timeout=DEFAULT_GIT_TIMEOUT):
+    """Run git and return its stdout; raises FetchError with git's (first fatal) error line."""
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, env=GIT_ENV, stdin=subprocess.DEVNULL,
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise FetchError(f"git {args[0]} timed out after {timeout}s")
+    if result.returncode != 0:
+        lines = [line.strip() for line in result.stderr.splitlines() if line.strip()]
+        fatal = [line for line in lines if line.startswith(('fatal:', 'error:'))]
+        raise FetchError((fatal or lines or [f"git {args[0]} exited with {result.returncode}"])[0])
+    return result.stdout.strip()
+
+
+def _head(repo, timeout):
+    try:
+        return _git(['rev-parse', '--verify', '--quiet', 'HEAD'], cwd=repo, timeout=timeout)
+    except FetchError:
+        # Empty repository
+        return None
+
+
+def _mirror_lock(mirror):
+    with _MIRROR_LOCKS_GUARD:
+        return _MIRROR_LOCKS.setdefault(mirror, threading.Lock())
+
+
+def update_mirror(url, mirror, timeout=DEFAULT_GIT_TIMEOUT):
+    """Create the bare mirror of url, or fetch new objects into it. Returns 'cloned' or 'fetched'."""
+    with _mirror_lock(mirror):
+        if mirror.exists():
+            _git(['fetch', '--prune', '--quiet', 'origin'], cwd=mirror, timeout=timeout)
+            return 'fetched'
+
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+        tmp_mirror = mirror.with_name(mirror.name + ".tmp")
+        shutil.rmtree(tmp_mirror, ignore_errors=True)
+        try:
+            _git(['clone', '--mirror', '--quiet', url, str(tmp_mirror)], timeout=timeout)
+            os.replace(tmp_mirror, mirror)
+        finally:
+            shutil.rmtree(tmp_mirror, ignore_errors=True)
+        return 'cloned'
+
+
+def update_checkout(mirror, checkout, timeout=DEFAULT_GIT_TIMEOUT):
+    """
+    Clone the mirror into checkout, or bring an existing checkout up to the
+    mirror's default branch. Returns (cloned, HEAD before, HEAD after);
+    HEAD is None for an empty repository.
+    """
+    if not (checkout / '.git').exists():
+        if checkout.exists():
+            raise FetchError(f"{checkout.name} exists but is not a git checkout")
+        _git(['clone', '--quiet', str(mirror.resolve()), str(checkout)], timeout=timeout)
+        return True, None, _head(checkout, timeout)
+
+    before = _head(checkout, timeout)
+    _git(['fetch', '--prune', '--quiet', 'origin'], cwd=checkout, timeout=timeout)
+    try:
+        _git(['remote', 'set-head', 'origin', '--auto'], cwd=checkout, timeout=timeout)
+        target = 'origin/HEAD'
+    except FetchError:
+        # The remote's HEAD names no branch (it was empty when mirrored): use its only branch
+        branches = _git(['for-each-ref', '--format=%(refname:short)', 'refs/remotes/origin'],
+                        cwd=checkout, timeout=timeout).split()
+        target = branches[0] if len(branches) == 1 else None
+    if target is not None:
+        _git(['reset', '--hard', '--quiet', target], cwd=checkout, timeout=timeout)
+    return False, before, _head(checkout, timeout)
+
+
+def fetch_student(task):
+    """Mirror and check out one participant's repository. Returns (student_id, status, message)."""
+    student_id, participant_dir, submitted_url, mirror_dir, timeout = task
+
+    url = clone_url(submitted_url)
+    if url is None:
+        if submitted_url:
+            return student_id, 'failed', f"Not a repository URL: {submitted_url}"
+        return student_id, 'no_repository', "No GitHub repository URL provided in submission"
+
+    start = time.time()
+    try:
+        mirror = mirror_path(url, mirror_dir)
+        update_mirror(url, mirror, timeout)
+        cloned, before, after = update_checkout(mirror, participant_dir / checkout_name(url), timeout)
+    except (FetchError, OSError) as e:
+        return student_id, 'failed', f"{url}: {e}"
+
+    elapsed = f"{time.time() - start:.1f}s"
+    short = after[:7] if after else "empty"
+    if cloned:
+        return student_id, 'cloned', f"{url} ({short}, {elapsed})"
+    if before != after:
+        return student_id, 'updated', f"{url} ({before[:7] if before else 'empty'} -> {short}, {elapsed})"
+    return student_id, 'unchanged', f"{url} ({short}, {elapsed})"
+
+
+def fetch_cohort(assignment_num, students=None, concurrency=DEFAULT_CONCURRENCY, mirror_dir=MIRROR_DIR,
+                 timeout=DEFAULT_GIT_TIMEOUT):
+    """Fetch the repositories of every participant folder of an assignment (or just the given IDs)."""
+    submissions_dir = Path(f"WorkSubmissions0{assignment_num}")
+
+    print("=" * 70)
+    print(f"REPOSITORY FETCH - ASSIGNMENT {assignment_num}")
+    print("=" * 70)
+
+    if not submissions_dir.exists():
+        print(f"ERROR: Submissions directory not found: {submissions_dir}")
+        return None
+
+    submission_info = build_submission_index(submissions_dir)
+    tasks = []
+    for participant_dir in sorted(submissions_dir.glob(f"{FOLDER_PREFIX}*{FOLDER_SUFFIX}")):
+        student_id = participant_dir.name[len(FOLDER_PREFIX):-len(FOLDER_SUFFIX)]
+        if students and student_id not in students:
+            continue
+        github_url = (submission_info.get(student_id) or {}).get('github_repository')
+        tasks.append((student_id, participant_dir, github_url, Path(mirror_dir), timeout))
+
+    print(f"Fetching {len(tasks)} repositories, {concurrency} at a time...\n")
+
+    stats = {'cloned': 0, 'updated': 0, 'unchanged': 0, 'no_repository': 0, 'failed': 0}
+    labels = {'cloned': "CLONED", 'updated': "UPDATED", 'unchanged': "OK", 'no_repository': "NO REPO"}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for student_id, status, message in executor.map(fetch_student, tasks):
+            stats[status] += 1
+            print(f"  [{labels.get(status, 'FAIL')}] {student_id}: {message}")
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Cloned: {stats['cloned']}")
+    print(f"Updated: {stats['updated']}")
+    print(f"Unchanged: {stats['unchanged']}")
+    print(f"No repository URL: {stats['no_repository']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Mirror cache: {mirror_dir}")
+    print("=" * 70)
+
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mirror and check out every participant's repository")
+    parser.add_argument("--assignment", type=int, required=True, choices=[1, 2, 3],
+                        help="Assignment number")
+    parser.add_argument("--students", nargs="+",
+                        help="Only fetch these student IDs")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Repositories fetched at the same time (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--mirror-dir", default=str(MIRROR_DIR),
+                        help=f"Bare mirror cache directory (default: {MIRROR_DIR})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_GIT_TIMEOUT,
+                        help=f"Seconds a single git command may run (default: {DEFAULT_GIT_TIMEOUT})")
+    args = parser.parse_args()
+
+    stats = fetch_cohort(args.assignment, students=args.students, concurrency=args.concurrency,
+                         mirror_dir=args.mirror_dir, timeout=args.timeout)
+    if stats is None or stats['failed']:
+        raise SystemExit(1)
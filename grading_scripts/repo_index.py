@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Single-walk index of a student repository for the Tier 2 skill scorers.
+
+The tree is walked once with os.scandir; every skill then queries the index
+(by extension, file name, directory or glob) instead of walking the
+filesystem again. File contents are loaded lazily on first use and cached,
+so a README read by four skills is read from disk once.
+
+Heavy directories (.git, node_modules, virtualenvs, build output) are pruned
+by default. Pruned directories are still recorded so skills can tell that,
+say, a .git folder or a virtualenv exists.
+"""
+import fnmatch
+import os
+from pathlib import Path, PureWindowsPath
+
+# Directory names never descended into
+DEFAULT_PRUNE_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    "venv", ".venv", "env", ".env", "virtualenv",
+    "__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache", ".tox", ".nox",
+    ".ipynb_checkpoints", ".idea", ".vscode",
+    "dist", "build", ".next", ".cache", "site-packages",
+})
+
+# Glob patterns (matched against directory names) that are pruned as well
+DEFAULT_PRUNE_PATTERNS = ("*.egg-info",)
+
+# File contents larger than this are read on demand but never cached
+CONTENT_CACHE_LIMIT = 1 << 20
+
+
+def resolve_repository_path(repository_path):
+    """Turn a repository_path from an assessment JSON (often Windows-style) into a Path."""
+    if "\\" in repository_path:
+        return Path(*PureWindowsPath(repository_path).parts)
+    return Path(repository_path)
+
+
+class RepoFile:
+    """One indexed file. Content is read lazily on first access."""
+
+    __slots__ = ("path", "abs_path", "name", "ext", "size", "mtime_ns", "_data")
+
+    def __init__(self, path, abs_path, size, mtime_ns):
+        self.path = path
+        self.abs_path = abs_path
+        self.name = path.rsplit("/", 1)[-1]
+        self.ext = os.path.splitext(self.name)[1].lower()
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._data = None
+
+    def __repr__(self):
+        return f"RepoFile({self.path!r}, size={self.size})"
+
+    @property
+    def parts(self):
+        """Path components relative to the repository root."""
+        return self.path.split("/")
+
+    def read_bytes(self):
+        """Return the file contents (b'' if the file cannot be read)."""
+        if self._data is not None:
+            return self._data
+
+        try:
+            with open(self.abs_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b""
+
+        if len(data) <= CONTENT_CACHE_LIMIT:
+            self._data = data
+        return data
+
+    def read_text(self):
+        """Return the file contents decoded as UTF-8 (undecodable bytes replaced)."""
+        return self.read_bytes().decode('utf-8', errors='replace')
+
+    def open(self):
+        """Open the file for streaming reads (for files too large to load)."""
+        return open(self.abs_path, 'rb')
+
+
+class RepoIndex:
+    """All files of a repository, grouped for the queries the skills make."""
+
+    def __init__(self, root, files, dirs, pruned, git_root=None):
+        self.root = Path(root)
+        # The checkout whose .git holds the history (above root when only a folder of it is indexed)
+        self.git_root = Path(git_root) if git_root is not None else self.root
+        self.files = files
+        self.dirs = dirs
+        self.pruned = pruned
+
+        self.by_ext = {}
+        self.by_name = {}
+        for repo_file in files:
+            self.by_ext.setdefault(repo_file.ext, []).append(repo_file)
+            self.by_name.setdefault(repo_file.name.lower(), []).append(repo_file)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    @property
+    def total_size(self):
+        return sum(repo_file.size for repo_file in self.files)
+
+    def with_ext(self, *exts):
+        """Files whose extension (lower-case, with the dot) is one of exts."""
+        found = []
+        for ext in exts:
+            found.extend(self.by_ext.get(ext.lower(), ()))
+        return sorted(found, key=lambda repo_file: repo_file.path)
+
+    def named(self, *names):
+        """Files whose name matches one of names, case-insensitively."""
+        found = []
+        for name in names:
+            found.extend(self.by_name.get(name.lower(), ()))
+        return sorted(found, key=lambda repo_file: repo_file.path)
+
+    def first_named(self, *names):
+        """The shallowest file matching one of names (None if there is none)."""
+        found = self.named(*names)
+        if not found:
+            return None
+        return min(found, key=lambda repo_file: (repo_file.path.count("/"), repo_file.path))
+
+    def glob(self, pattern):
+        """Files whose relative path matches a case-insensitive glob pattern."""
+        pattern = pattern.lower()
+        return [repo_file for repo_file in self.files
+                if fnmatch.fnmatchcase(repo_file.path.lower(), pattern)]
+
+    def in_dir(self, dir_path):
+        """Files below a directory (relative path, '' for the whole repository)."""
+        prefix = dir_path.strip("/") + "/" if dir_path.strip("/") else ""
+        return [repo_file for repo_file in self.files if repo_file.path.startswith(prefix)]
+
+    def has_dir(self, name):
+        """True if any indexed or pruned directory is called name (case-insensitive)."""
+        name = name.lower()
+        return any(d.rsplit("/", 1)[-1].lower() == name for d in self.dirs + self.pruned)
+
+    def has_pruned(self, name):
+        """True if a directory called name was pruned (e.g. '.git', 'node_modules')."""
+        return any(d.rsplit("/", 1)[-1] == name for d in self.pruned)
+
+
+def _is_pruned(name, prune_dirs, prune_patterns):
+    """True if a directory called name should not be descended into."""
+    return name in prune_dirs or any(fnmatch.fnmatchcase(name, p) for p in prune_patterns)
+
+
+def build_repo_index(root, prune_dirs=DEFAULT_PRUNE_DIRS, prune_patterns=DEFAULT_PRUNE_PATTERNS,
+                     max_files=None, git_root=None):
+    """
+    Walk root once and return a RepoIndex.
+
+    Directories named in prune_dirs or matching prune_patterns are recorded
+    but not descended into. Symlinks are not followed. max_files stops the
+    walk early on pathological trees. git_root is the checkout containing
+    root when root is a folder of a repository rather than the repository.
+    """
+    root = os.fspath(root)
+    files = []
+    dirs = []
+    pruned = []
+
+    stack = [("", root)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        try:
+            entries = list(os.scandir(abs_dir))
+        except OSError:
+            continue
+
+        for entry in sorted(entries, key=lambda e: e.name):
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if _is_pruned(entry.name, prune_dirs, prune_patterns):
+                        pruned.append(rel_path)
+                    else:
+                        dirs.append(rel_path)
+                        stack.append((rel_path, entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append(RepoFile(rel_path, entry.path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+
+        if max_files is not None and len(files) >= max_files:
+            break
+
+    files.sort(key=lambda repo_file: repo_file.path)
+    return RepoIndex(root, files, sorted(dirs), sorted(pruned), git_root)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Index a student repository and print a summary")
+    parser.add_argument("repository", help="Path to the repository")
+    args = parser.parse_args()
+
+    start = time.time()
+    index = build_repo_index(args.repository)
+    elapsed = time.time() - start
+
+    print(f"Indexed {len(index)} files ({index.total_size / 1024:.0f} KB) in {elapsed * 1000:.1f} ms")
+    print(f"Directories: {len(index.dirs)}, pruned: {', '.join(index.pruned) or 'none'}")
+    by_count = sorted(index.by_ext.items(), key=lambda item: -len(item[1]))[:10]
+    for ext, ext_files in by_count:
+        print(f"  {ext or '(none)'}: {len(ext_files)}")
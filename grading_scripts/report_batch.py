@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Batch runner shared by the detailed feedback report generators.
+Builds one report per tier2_assessment JSON, optionally across a process pool,
+and skips reports whose assessment JSON and template have not changed.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from file_utils import file_sha256
+
+REPORT_MANIFEST_NAME = ".report_manifest.json"
+
+
+def collect_report_jobs(assessments_dir, submissions_dir):
+    """
+    Pair each tier2_assessment_<id>.json with the output path of its report.
+    Students without a submission folder are reported and skipped.
+    """
+    jobs = []
+
+    for json_file in sorted(assessments_dir.glob("tier2_assessment_*.json")):
+        student_id = json_file.stem.replace("tier2_assessment_", "")
+
+        # Find student folder
+        student_folder = submissions_dir / f"Participant_{student_id}_assignsubmission_file"
+
+        if student_folder.exists():
+            output_path = student_folder / f"Detailed_Feedback_Report_{student_id}.pdf"
+            jobs.append((student_id, json_file, output_path))
+        else:
+            print(f"Warning: Folder not found for student {student_id}")
+
+    return jobs
+
+
+def build_report(task):
+    """Build a single report. Runs inside a worker process when workers > 1."""
+    builder, student_id, json_file, output_path, builder_args = task
+
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            assessment_data = json.load(f)
+
+        builder(student_id, assessment_data, str(output_path), *builder_args)
+        return student_id, None
+    except Exception as e:
+        return student_id, str(e)
+
+
+def run_report_jobs(jobs, builder, builder_args=(), workers=1):
+    """
+    Build every report in jobs and yield (student_id, error) in job order.
+
+    builder must be a module-level function so it can be sent to worker
+    processes. error is None when the report was written successfully;
+    a failing student never aborts the rest of the batch.
+    """
+    tasks = [(builder, student_id, json_file, output_path, tuple(builder_args))
+             for student_id, json_file, output_path in jobs]
+
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield build_report(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() keeps results in submission order, so output is deterministic
+        yield from executor.map(build_report, tasks)
+
+
+def select_stale_jobs(jobs, manifest, template_version, force=False):
+    """
+    Split jobs into the ones that need rebuilding and the ones that are current.
+
+    A report is current when its PDF exists and the manifest records the same
+    assessment JSON hash and template version. Returns (stale_jobs, current_ids,
+    input_hashes) where input_hashes maps student_id to the JSON hash.
+    """
+    entries = manifest.get("reports", {})
+    stale_jobs = []
+    current_ids = []
+    input_hashes = {}
+
+    for student_id, json_file, output_path in jobs:
+        input_hash = file_sha256(json_file)
+        input_hashes[student_id] = input_hash
+
+        entry = entries.get(student_id, {})
+        is_current = (
+            not force
+            and output_path.exists()
+            and entry.get("input_sha256") == input_hash
+            and entry.get("template_version") == template_version
+        )
+
+        if is_current:
+            current_ids.append(student_id)
+        else:
+            stale_jobs.append((student_id, json_file, output_path))
+
+    return stale_jobs, current_ids, input_hashes
+
+
+def record_report(manifest, student_id, input_hash, template_version, output_path):
+    """Record a successfully built report in the manifest."""
+    manifest.setdefault("reports", {})[student_id] = {
+        "input_sha256": input_hash,
+        "template_version": template_version,
+        "output": str(output_path),
+    }
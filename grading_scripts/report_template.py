@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Shared template for the detailed feedback PDF reports (all assignments).
+
+Paragraph styles are built once per process and the static paragraphs
+(section headings, intro/closing text for each performance level) are
+parsed once and handed out as shallow copies, so only the student-specific
+text is parsed for each report. The assignment title is the only thing that
+differs between assignments.
+"""
+import copy
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+
+# Bump whenever the report layout or wording changes so every PDF is rebuilt
+TEMPLATE_VERSION = "1"
+
+INTRO_TEXTS = {
+    "excellent": """Your submission demonstrates a very solid foundation in software engineering
+        practices and LLM application development. You have successfully implemented most of the advanced
+        requirements with only minor areas for enhancement. Your work shows strong attention to detail,
+        comprehensive documentation, and professional development practices.""",
+    "good": """Your submission demonstrates a solid foundation in software engineering
+        practices and LLM application development. You have successfully addressed the core requirements
+        with some areas identified for enhancement. With focused improvements in the areas outlined below,
+        you can elevate your work to an excellent standard.""",
+    "developing": """Your submission demonstrates a good foundation with significant room for growth.
+        You have addressed several core requirements, and there is significant potential to elevate your work.
+        The areas identified below represent opportunities for substantial improvement that will strengthen
+        your software engineering practices and LLM application development skills.""",
+    "needs improvement": """Your submission demonstrates a foundation that shows potential but requires
+        substantial development. While there are fundamental elements in place, there are multiple critical
+        areas requiring attention. You have substantial potential to improve, and the recommendations below
+        outline a clear path forward to strengthen your software engineering practices and meet the
+        assignment requirements.""",
+}
+
+CLOSING_TEXTS = {
+    "excellent": """Your submission demonstrates excellence in software engineering and LLM application
+        development. The minor enhancements suggested above will help you maintain and further develop
+        your already strong skills. Continue to build on this solid foundation, and focus on the advanced
+        aspects that distinguish exceptional work from good work.""",
+    "good": """Your submission shows strong competency in software engineering and LLM application
+        development. By addressing the areas outlined above, particularly the priority items, you can
+        elevate your work to an excellent standard. You have demonstrated the foundational skills needed;
+        now focus on deepening and broadening your implementation of professional practices.""",
+    "developing": """Your submission shows good potential and a developing understanding of software
+        engineering principles. The areas identified above represent clear opportunities for growth.
+        Focus on the immediate priority items first, then systematically work through the other
+        recommendations. With dedicated effort on these areas, you can significantly strengthen your
+        skills and project quality.""",
+    "needs improvement": """Your submission demonstrates potential, but requires substantial development in
+        multiple critical areas. Focus first on the immediate priority items, which address fundamental
+        requirements. Work systematically through each area, seeking examples and best practices.
+        Remember that software engineering is a skill that develops through practice and iteration.
+        Use this feedback as a roadmap for improvement.""",
+}
+
+STRONG_IMPROVEMENT_INTRO = """While your submission is strong overall, the following areas present
+        opportunities for minor enhancements that would further strengthen your work:"""
+
+DEVELOPING_IMPROVEMENT_INTRO = """The following areas require focused attention and development.
+        Addressing these will significantly strengthen your software engineering practices and
+        overall project quality:"""
+
+IMMEDIATE_INTRO = """These items require your immediate attention as they represent
+        critical gaps in the current submission:"""
+
+HIGH_PRIORITY_INTRO = """These areas would significantly strengthen your submission
+        and should be addressed after the immediate focus items:"""
+
+# Built on first use in each process
+_styles = None
+_paragraph_cache = {}
+
+
+def get_styles():
+    """Return the report paragraph styles, building them once per process."""
+    global _styles
+    if _styles is not None:
+        return _styles
+
+    styles = getSampleStyleSheet()
+
+    # Colors are HexColor objects rather than '#rrggbb' strings so ReportLab
+    # does not re-parse them every time a paragraph is drawn
+    _styles = {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'student_id': ParagraphStyle(
+            'StudentID',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#666666'),
+            spaceAfter=20
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#2c5aa0'),
+            spaceAfter=12,
+            spaceBefore=16,
+            fontName='Helvetica-Bold'
+        ),
+        'subheading': ParagraphStyle(
+            'CustomSubHeading',
+            parent=styles['Heading3'],
+            fontSize=12,
+            textColor=colors.HexColor('#4a4a4a'),
+            spaceAfter=8,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ),
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['BodyText'],
+            fontSize=11,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=10,
+            alignment=TA_JUSTIFY,
+            leading=16
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#666666'),
+            alignment=TA_CENTER
+        ),
+    }
+    return _styles
+
+
+def static_paragraph(text, style_name):
+    """
+    Paragraph for text that is the same in every report.
+
+    The markup is parsed once; each call returns a shallow copy because
+    layout state (line breaks, width) is stored on the Paragraph instance.
+    """
+    key = (text, style_name)
+    prototype = _paragraph_cache.get(key)
+    if prototype is None:
+        prototype = Paragraph(text, get_styles()[style_name])
+        _paragraph_cache[key] = prototype
+    return copy.copy(prototype)
+
+
+def get_performance_level(total_score):
+    """Map a total score to the report's performance level."""
+    if total_score >= 80:
+        return "excellent"
+    elif total_score >= 70:
+        return "good"
+    elif total_score >= 55:
+        return "developing"
+    else:
+        return "needs improvement"
+
+
+def create_detailed_report(student_id, assessment_data, output_path, assignment_name):
+    """Create a detailed feedback PDF report without showing grades."""
+
+    doc = SimpleDocTemplate(
+        output_path,
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72
+    )
+
+    story = []
+    styles = get_styles()
+    body_style = styles['body']
+    subheading_style = styles['subheading']
+
+    # Extract data
+    total_score = assessment_data.get('total_score', 0)
+    skills = assessment_data.get('skill_details', {})
+    overall = assessment_data.get('overall_assessment', {})
+    strengths_list = overall.get('strengths', [])
+    weaknesses_list = overall.get('weaknesses', [])
+    recommendations = assessment_data.get('recommended_actions', {})
+
+    performance_level = get_performance_level(total_score)
+
+    # Title
+    story.append(static_paragraph(f"{assignment_name} - Detailed Feedback Report", 'title'))
+    story.append(Paragraph(f"Student ID: {student_id}", styles['student_id']))
+
+    story.append(Spacer(1, 0.2*inch))
+
+    # Introduction
+    story.append(static_paragraph("Assessment Overview", 'heading'))
+    story.append(static_paragraph(INTRO_TEXTS[performance_level], 'body'))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Strengths section
+    if strengths_list and strengths_list[0] != "No skills with excellent scores (8+/10)":
+        story.append(static_paragraph("Areas of Excellence", 'heading'))
+        story.append(static_paragraph(
+            "Your submission demonstrates particular strength in the following areas:", 'body'))
+        story.append(Spacer(1, 0.1*inch))
+
+        for strength in strengths_list:
+            # Parse skill name and score
+            if '(' in strength:
+                skill_name = strength.split('(')[0].strip()
+                # Get detailed info from skills
+                skill_key = skill_name.lower().replace(' ', '_')
+                skill_detail = skills.get(skill_key, {})
+                notes = skill_detail.get('notes', [])
+
+                story.append(Paragraph(f"<b>{skill_name}</b>", subheading_style))
+
+                if notes:
+                    for note in notes[:3]:  # Show top 3 notes
+                        story.append(Paragraph(f"• {note}", body_style))
+                else:
+                    story.append(Paragraph(f"• Excellent implementation of {skill_name.lower()} requirements", body_style))
+
+                story.append(Spacer(1, 0.1*inch))
+
+    # Areas for improvement
+    story.append(static_paragraph("Areas for Improvement and Development", 'heading'))
+
+    if performance_level in ["excellent", "good"]:
+        story.append(static_paragraph(STRONG_IMPROVEMENT_INTRO, 'body'))
+    else:
+        story.append(static_paragraph(DEVELOPING_IMPROVEMENT_INTRO, 'body'))
+    story.append(Spacer(1, 0.15*inch))
+
+    # Process weaknesses or skills needing improvement
+    skills_to_improve = []
+
+    if weaknesses_list and weaknesses_list[0] != "No critical weaknesses (<5/10)":
+        for weakness in weaknesses_list:
+            if '(' in weakness:
+                skill_name = weakness.split('(')[0].strip()
+                score_text = weakness.split('(')[1].replace(')', '')
+                skills_to_improve.append((skill_name, score_text))
+    else:
+        # Find skills with room for improvement (score < 8)
+        for skill_key, skill_data in skills.items():
+            score = skill_data.get('score', 0)
+            if score < 8:
+                skill_name = skill_key.replace('_', ' ').title()
+                skills_to_improve.append((skill_name, f"{score}/10"))
+
+    # Detail each skill needing improvement
+    for skill_name, score_text in skills_to_improve[:6]:  # Limit to top 6
+        skill_key = skill_name.lower().replace(' ', '_')
+        skill_detail = skills.get(skill_key, {})
+        recommendations_list = skill_detail.get('recommendations', [])
+        notes = skill_detail.get('notes', [])
+
+        story.append(Paragraph(f"<b>{skill_name}</b>", subheading_style))
+
+        # Add context from notes if available
+        if notes and len(notes) > 0:
+            context_note = notes[0] if not notes[0].startswith("Found") else (notes[1] if len(notes) > 1 else None)
+            if context_note:
+                story.append(Paragraph(f"Current Status: {context_note}", body_style))
+
+        # Add recommendations
+        if recommendations_list:
+            story.append(static_paragraph("Recommended Actions:", 'body'))
+            for rec in recommendations_list[:4]:  # Top 4 recommendations
+                # Clean up the recommendation text (remove point values)
+                clean_rec = rec.split('(+')[0].strip()
+                if clean_rec:
+                    story.append(Paragraph(f"• {clean_rec}", body_style))
+
+        story.append(Spacer(1, 0.15*inch))
+
+    # Priority actions
+    story.append(PageBreak())
+    story.append(static_paragraph("Priority Action Items", 'heading'))
+
+    immediate_actions = recommendations.get('immediate', [])
+    high_priority = recommendations.get('high_priority', [])
+
+    if immediate_actions and immediate_actions[0] != "All critical areas addressed - focus on optimization":
+        story.append(static_paragraph("<b>Immediate Focus Areas:</b>", 'subheading'))
+        story.append(static_paragraph(IMMEDIATE_INTRO, 'body'))
+
+        for action in immediate_actions[:5]:
+            clean_action = action.split('(')[0].strip()
+            story.append(Paragraph(f"• {clean_action}", body_style))
+
+        story.append(Spacer(1, 0.2*inch))
+
+    if high_priority and high_priority[0] != "Maintain current standards across all skills":
+        story.append(static_paragraph("<b>High Priority Enhancements:</b>", 'subheading'))
+        story.append(static_paragraph(HIGH_PRIORITY_INTRO, 'body'))
+
+        for action in high_priority[:5]:
+            clean_action = action.split('(')[0].strip()
+            story.append(Paragraph(f"• {clean_action}", body_style))
+
+        story.append(Spacer(1, 0.2*inch))
+
+    # Closing remarks
+    story.append(Spacer(1, 0.2*inch))
+    story.append(static_paragraph("Conclusion", 'heading'))
+    story.append(static_paragraph(CLOSING_TEXTS[performance_level], 'body'))
+
+    # Footer
+    story.append(Spacer(1, 0.4*inch))
+    story.append(Paragraph(f"Assessment Date: {assessment_data.get('assessment_date', 'N/A')}", styles['footer']))
+    story.append(static_paragraph(
+        "This report provides developmental feedback to support your learning and growth.", 'footer'))
+
+    # Build PDF
+    doc.build(story)
+    return True
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Skill result cache for Tier 2 regrades.
+
+A skill's result is stored under (repository tree hash, skill, skill
+version). The tree hash covers every indexed file's path and content, the
+directory layout and the git refs, so it only changes when the submission
+does. Rerunning the orchestrator after a rubric change to one skill (a bump
+of its entry in SKILL_VERSIONS) recomputes just that skill for every
+student and reuses the other nine.
+
+Hashing a repository needs its file contents once; after that the digests
+are remembered by path, size and mtime, so an untouched clone costs one
+stat per file. Entries live in the shared analysis cache and are evicted
+least recently used first (see analysis_cache.evict).
+"""
+import hashlib
+
+from analysis_cache import CACHE_DIR, AnalysisCache, content_digest
+from git_history import find_git_dir, read_refs
+from file_utils import file_sha256
+from tier2_skills import SKILL_VERSIONS
+
+# Bump when tree_hash() covers different inputs
+TREE_HASH_VERSION = "1"
+
+
+def tree_hash(index, cache_dir=CACHE_DIR):
+    """Content hash of a RepoIndex: file paths and contents, directories and git refs."""
+    memo_cache = AnalysisCache('tree-digests', TREE_HASH_VERSION, cache_dir)
+    root_key = content_digest(str(index.root.resolve()).encode('utf-8'))
+    memo = memo_cache.get(root_key) or {}
+
+    digests = {}
+    tree = hashlib.sha256()
+    for repo_file in index:
+        remembered = memo.get(repo_file.path)
+        if remembered and remembered[0] == repo_file.size and remembered[1] == repo_file.mtime_ns:
+            digest = remembered[2]
+        else:
+            try:
+                digest = file_sha256(repo_file.abs_path)
+            except OSError:
+                digest = "unreadable"
+        digests[repo_file.path] = [repo_file.size, repo_file.mtime_ns, digest]
+        tree.update(f"f {repo_file.path}\0{digest}\n".encode('utf-8'))
+
+    for directory in index.dirs:
+        tree.update(f"d {directory}\n".encode('utf-8'))
+    for directory in index.pruned:
+        tree.update(f"p {directory}\n".encode('utf-8'))
+
+    # Commit history is graded too; ref tips change whenever it does
+    git_dir = find_git_dir(index.git_root)
+    if git_dir is not None:
+        for name, sha in sorted(read_refs(git_dir).items()):
+            tree.update(f"r {name} {sha}\n".encode('utf-8'))
+
+    if digests != memo:
+        memo_cache.put(root_key, digests)
+    return tree.hexdigest()
+
+
+class SkillResultCache:
+    """Skill details keyed by tree hash, one namespace per skill version."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.caches = {skill: AnalysisCache(f"skill-{skill}", version, cache_dir)
+                       for skill, version in SKILL_VERSIONS.items()}
+
+    def get(self, tree, skill):
+        return self.caches[skill].get(tree)
+
+    def put(self, tree, skill, details):
+        self.caches[skill].put(tree, details)
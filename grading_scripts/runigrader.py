@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Run a full grading cycle for every assignment with one command.
+
+The cycle is modelled as a DAG with declared inputs and outputs:
+  report(n, student)  tier2_assessment_<id>.json -> Detailed_Feedback_Report_<id>.pdf
+  merge(n, student)   report + submission PDF     -> Student_<id>_Complete_Submission.pdf
+  moodle(n)           assessment JSONs + submission_info.xlsx + Moodle CSV export or workbook
+                      -> <Moodle grades>_FINAL.csv/.xlsx (self-grades, feedback, weighted grades)
+
+All tasks share one process pool, so students and assignments run side by
+side, and a student's merge is queued as soon as its report is written.
+Reports and merges are skipped through their own manifests; whole-assignment
+nodes are skipped when the fingerprint of their inputs matches the state
+file (.runigrader_state.json).
+
+Run from the repository root:
+  python grading_scripts/runigrader.py
+  python grading_scripts/runigrader.py --assignments 1 --stages report merge --workers 8
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from cleanup_and_merge_reports import (
+    MERGE_MANIFEST_NAME, merge_student, prepare_student_merge, record_merge,
+)
+from file_utils import load_manifest, save_manifest
+from moodle_csv import SELF_GRADED_ASSIGNMENTS, default_paths as default_csv_paths, merge_gradebook
+from report_batch import (
+    REPORT_MANIFEST_NAME, build_report, collect_report_jobs, record_report, select_stale_jobs,
+)
+from report_template import TEMPLATE_VERSION, create_detailed_report
+
+STATE_NAME = ".runigrader_state.json"
+
+STAGES = ("report", "merge", "moodle")
+
+# Stages each assignment supports in this grading cycle
+ASSIGNMENT_STAGES = {
+    1: ("report", "merge", "moodle"),
+    2: ("report",),
+    3: ("report",),
+}
+
+# Bump whenever a whole-assignment node's outputs change for the same inputs
+NODE_VERSION = "1"
+
+
+def assignment_dirs(assignment_num):
+    """Return (assessments_dir, submissions_dir) for an assignment."""
+    return (Path(f"assessments_tier2_assignment{assignment_num}"),
+            Path(f"WorkSubmissions0{assignment_num}"))
+
+
+def moodle_paths(assignment_num):
+    """Return (source, FINAL) gradebook for an assignment: the Moodle CSV export if there is one, else the workbook."""
+    csv_source, csv_output = default_csv_paths(assignment_num)
+    if csv_source.exists():
+        return csv_source, csv_output
+    moodle_dir = Path("StudentGradesMoodleFormat")
+    return (moodle_dir / f"Assignment{assignment_num}_Moodle_Grades.xlsx",
+            moodle_dir / f"Assignment{assignment_num}_Moodle_Grades_FINAL.xlsx")
+
+
+def moodle_inputs(assignment_num):
+    """Every file the moodle(n) node reads."""
+    assessments_dir, submissions_dir = assignment_dirs(assignment_num)
+    source, _ = moodle_paths(assignment_num)
+
+    inputs = [source]
+    inputs.extend(sorted(assessments_dir.glob("tier2_assessment_*.json")))
+    inputs.extend(sorted(submissions_dir.glob("Participant_*_assignsubmission_file/submission_info.xlsx")))
+    return inputs
+
+
+def inputs_fingerprint(paths):
+    """Hash the path, size and mtime of every input (missing files included)."""
+    digest = hashlib.sha256(NODE_VERSION.encode())
+    for path in paths:
+        try:
+            stat = path.stat()
+            line = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n"
+        except OSError:
+            line = f"{path}\0missing\n"
+        digest.update(line.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _run_moodle(assignment_num):
+    """Run the moodle(n) node. Output is captured so it does not interleave with other tasks."""
+    assessments_dir, submissions_dir = assignment_dirs(assignment_num)
+    source, output = moodle_paths(assignment_num)
+
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            if source.suffix == '.csv':
+                merge_gradebook(source, output, submissions_dir, assessments_dir,
+                                self_graded=assignment_num in SELF_GRADED_ASSIGNMENTS)
+            else:
+                from update_moodle_grades_single_pass import update_assignment1_moodle
+                update_assignment1_moodle(source, output, submissions_dir, assessments_dir)
+        return assignment_num, log.getvalue(), None
+    except Exception as e:
+        return assignment_num, log.getvalue(), str(e)
+
+
+def new_stats():
+    """Per-assignment counters printed in the summary."""
+    return {
+        'reports_built': 0, 'reports_current': 0, 'reports_failed': 0,
+        'merges_built': 0, 'merges_current': 0, 'merges_failed': 0, 'merges_missing': 0,
+        'moodle': '-',
+    }
+
+
+def plan_assignment(assignment_num, stages, force):
+    """Load the manifests of one assignment and work out which reports are stale."""
+    assessments_dir, submissions_dir = assignment_dirs(assignment_num)
+    run = {
+        'num': assignment_num,
+        'name': f"Assignment {assignment_num}",
+        'assessments_dir': assessments_dir,
+        'submissions_dir': submissions_dir,
+        'stages': stages,
+        'stats': new_stats(),
+        'report_jobs': [],
+        'pending_reports': set(),
+    }
+
+    if "report" in stages:
+        run['report_manifest_path'] = assessments_dir / REPORT_MANIFEST_NAME
+        run['report_manifest'] = load_manifest(run['report_manifest_path'])
+
+        jobs = collect_report_jobs(assessments_dir, submissions_dir)
+        stale_jobs, current_ids, input_hashes = select_stale_jobs(
+            jobs, run['report_manifest'], TEMPLATE_VERSION, force=force)
+
+        run['report_jobs'] = stale_jobs
+        run['input_hashes'] = input_hashes
+        run['report_outputs'] = {student_id: output_path for student_id, _, output_path in stale_jobs}
+        run['pending_reports'] = {student_id for student_id, _, _ in stale_jobs}
+        run['stats']['reports_current'] = len(current_ids)
+
+    if "merge" in stages:
+        run['merge_manifest_path'] = submissions_dir / MERGE_MANIFEST_NAME
+        run['merge_manifest'] = load_manifest(run['merge_manifest_path'])
+        run['merge_entries'] = run['merge_manifest'].setdefault('students', {})
+        run['merge_fingerprints'] = {}
+
+    return run
+
+
+def save_run_manifests(run):
+    """Persist whatever manifests this assignment run touched."""
+    if "report_manifest" in run:
+        save_manifest(run['report_manifest_path'], run['report_manifest'])
+    if "merge_manifest" in run:
+        save_manifest(run['merge_manifest_path'], run['merge_manifest'])
+
+
+def run_cycle(assignments, stages, workers, force=False):
+    """Run the DAG for the given assignments and stages. Returns the number of failed tasks."""
+    state = load_manifest(STATE_NAME)
+    nodes = state.setdefault('nodes', {})
+
+    runs = []
+    for assignment_num in assignments:
+        assessments_dir, submissions_dir = assignment_dirs(assignment_num)
+        if not assessments_dir.exists() or not submissions_dir.exists():
+            print(f"ERROR: Assignment {assignment_num}: {assessments_dir} or {submissions_dir} not found")
+            continue
+
+        run_stages = [stage for stage in stages if stage in ASSIGNMENT_STAGES.get(assignment_num, ())]
+        runs.append(plan_assignment(assignment_num, run_stages, force))
+
+    futures = {}
+    failures = 0
+
+    def submit_merge(executor, run, participant_dir):
+        student_id, action, detail = prepare_student_merge(participant_dir, run['merge_entries'], force)
+        stats = run['stats']
+
+        if action == 'missing':
+            skip_reason, _ = detail
+            print(f"[{run['name']}] merge {student_id}: SKIP ({skip_reason})")
+            stats['merges_missing'] += 1
+        elif action == 'current':
+            stats['merges_current'] += 1
+        else:
+            task, run['merge_fingerprints'][student_id] = detail
+            futures[executor.submit(merge_student, task)] = ("merge", run)
+
+    start = time.time()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Seed the DAG with every node whose inputs are already available
+            for run in runs:
+                for student_id, json_file, output_path in run['report_jobs']:
+                    task = (create_detailed_report, student_id, json_file, output_path, (run['name'],))
+                    futures[executor.submit(build_report, task)] = ("report", run)
+
+                if "merge" in run['stages']:
+                    for participant_dir in sorted(run['submissions_dir'].glob("Participant_*_assignsubmission_file")):
+                        student_id = participant_dir.name.split("_")[1]
+                        # Students with a report in flight are merged once it is written
+                        if participant_dir.is_dir() and student_id not in run['pending_reports']:
+                            submit_merge(executor, run, participant_dir)
+
+                if "moodle" in run['stages']:
+                    _, output = moodle_paths(run['num'])
+                    node_key = f"moodle:{run['num']}"
+                    fingerprint = inputs_fingerprint(moodle_inputs(run['num']))
+                    entry = nodes.get(node_key, {})
+
+                    if not force and output.exists() and entry.get('inputs') == fingerprint:
+                        run['stats']['moodle'] = "up to date"
+                    else:
+                        run['moodle_fingerprint'] = fingerprint
+                        futures[executor.submit(_run_moodle, run['num'])] = ("moodle", run)
+
+            # Drain the pool, queueing downstream nodes as their inputs appear
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, run = futures.pop(future)
+                    stats = run['stats']
+
+                    if kind == "report":
+                        student_id, error = future.result()
+                        run['pending_reports'].discard(student_id)
+                        if error is None:
+                            print(f"[{run['name']}] report {student_id}: OK")
+                            record_report(run['report_manifest'], student_id, run['input_hashes'][student_id],
+                                          TEMPLATE_VERSION, run['report_outputs'][student_id])
+                            stats['reports_built'] += 1
+                        else:
+                            print(f"[{run['name']}] report {student_id}: FAILED ({error})")
+                            stats['reports_failed'] += 1
+                            failures += 1
+
+                        if "merge" in run['stages']:
+                            if error is None:
+                                participant_dir = run['submissions_dir'] / f"Participant_{student_id}_assignsubmission_file"
+                                submit_merge(executor, run, participant_dir)
+                            else:
+                                # Never merge (and record) a stale or partial report
+                                print(f"[{run['name']}] merge {student_id}: SKIP (report failed)")
+                                stats['merges_missing'] += 1
+
+                    elif kind == "merge":
+                        student_id, report_pages, submission_pages, error = future.result()
+                        if error is None:
+                            print(f"[{run['name']}] merge {student_id}: OK ({report_pages} + {submission_pages} pages)")
+                            record_merge(run['merge_entries'], student_id, run['merge_fingerprints'][student_id])
+                            stats['merges_built'] += 1
+                        else:
+                            print(f"[{run['name']}] merge {student_id}: FAILED ({error})")
+                            stats['merges_failed'] += 1
+                            failures += 1
+
+                    else:
+                        _, log, error = future.result()
+                        print(f"\n[{run['name']}] moodle output:")
+                        print(log.rstrip())
+                        if error is None:
+                            nodes[f"moodle:{run['num']}"] = {'inputs': run['moodle_fingerprint']}
+                            stats['moodle'] = "updated"
+                        else:
+                            print(f"[{run['name']}] moodle: FAILED ({error})")
+                            stats['moodle'] = "failed"
+                            failures += 1
+    finally:
+        # Keep finished work even if the cycle is interrupted
+        for run in runs:
+            save_run_manifests(run)
+        save_manifest(STATE_NAME, state)
+
+    print_summary(runs, time.time() - start)
+    return failures
+
+
+def print_summary(runs, elapsed):
+    """Print one line of counts per stage and assignment."""
+    print("\n" + "=" * 80)
+    print("GRADING CYCLE SUMMARY")
+    print("=" * 80)
+
+    for run in runs:
+        stats = run['stats']
+        print(f"\n{run['name']} (stages: {', '.join(run['stages']) or 'none'})")
+        if "report" in run['stages']:
+            print(f"  Reports: {stats['reports_built']} built, {stats['reports_current']} up to date, "
+                  f"{stats['reports_failed']} failed")
+        if "merge" in run['stages']:
+            print(f"  Merges:  {stats['merges_built']} built, {stats['merges_current']} up to date, "
+                  f"{stats['merges_failed']} failed, {stats['merges_missing']} missing inputs")
+        if "moodle" in run['stages']:
+            print(f"  Moodle:  {stats['moodle']}")
+
+    print(f"\nElapsed: {elapsed:.1f}s")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the grading cycle (reports, merges, Moodle) for all assignments")
+    parser.add_argument("--assignments", type=int, nargs="+", default=sorted(ASSIGNMENT_STAGES),
+                        help="Assignments to process (default: 1 2 3)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="Stages to run (default: all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: all CPUs)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every node, ignoring manifests and the state file")
+    args = parser.parse_args()
+
+    failed = run_cycle(args.assignments, args.stages, args.workers, force=args.force)
+    sys.exit(1 if failed else 0)
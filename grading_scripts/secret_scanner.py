@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Single-pass secret scanner for the config_security skill.
+
+All key patterns are compiled into one regular expression alternation, so
+each file is read and matched once no matter how many patterns there are.
+Files at or below the RepoIndex content-cache limit reuse the bytes other
+skills already loaded; larger files are memory-mapped and only their first
+MAX_SCAN_BYTES are searched. Binary files are skipped by sniffing their
+first block for NUL bytes.
+
+Usage:
+    python grading_scripts/secret_scanner.py path/to/repo
+"""
+import math
+import mmap
+import re
+from collections import Counter
+
+from repo_index import CONTENT_CACHE_LIMIT
+
+# Bytes searched per file; secrets past this point in a multi-MB file are rare
+MAX_SCAN_BYTES = 4 << 20
+
+# Bytes inspected to decide whether a file is binary
+SNIFF_BYTES = 8192
+
+# Extensions never scanned (media, archives, compiled artifacts)
+BINARY_EXTS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.svg', '.pdf', '.mp4', '.mov', '.mp3', '.wav',
+    '.zip', '.gz', '.tar', '.7z', '.rar', '.whl', '.jar', '.pyc', '.so', '.dll', '.exe', '.bin',
+    '.pt', '.pth', '.h5', '.pkl', '.npy', '.npz', '.parquet', '.xlsx', '.docx', '.pptx', '.woff', '.woff2', '.ttf',
+})
+
+# Files that document variables with dummy values by design
+EXAMPLE_FILE_NAMES = frozenset({'.env.example', '.env.sample', '.env.template', 'env.example', '.env.dist'})
+
+# (kind, pattern); earlier entries win when several could match at one
+# position. Patterns must not use groups: a capture anywhere in the combined
+# alternation disables the regex engine's first-character prefilter.
+SECRET_PATTERNS = [
+    ("Anthropic API Key", rb'sk-ant-[A-Za-z0-9_\-]{20,}'),
+    ("OpenAI API Key", rb'sk-(?:proj-)?[A-Za-z0-9_\-]{20,}'),
+    ("AWS Access Key", rb'(?:AKIA|ASIA)[0-9A-Z]{16}'),
+    ("GitHub Token", rb'gh[pousr]_[A-Za-z0-9]{36,}'),
+    ("Google API Key", rb'AIza[0-9A-Za-z_\-]{35}'),
+    ("Slack Token", rb'xox[abprs]-[A-Za-z0-9\-]{10,}'),
+    ("Private Key", rb'-----BEGIN (?:RSA |EC |OPENSSH |DSA )?PRIVATE KEY-----'),
+    ("MongoDB URL with credentials", rb'mongodb(?:\+srv)?://[^\s:/@"\']+:[^\s@/"\']+@'),
+    # A quoted token assigned to something; the name is checked separately
+    ("API Key (hardcoded)", rb'[:=]\s*["\'][A-Za-z0-9_\-+/=.]{16,}["\']'),
+]
+GENERIC_KIND = "API Key (hardcoded)"
+
+COMBINED_PATTERN = re.compile(b'|'.join(b'(?:' + pattern + b')' for _, pattern in SECRET_PATTERNS))
+KIND_PATTERNS = [(kind, re.compile(pattern)) for kind, pattern in SECRET_PATTERNS]
+# The generic match starts at the '=', so provider keys inside it are looked for separately
+PROVIDER_PATTERN = re.compile(
+    b'|'.join(b'(?:' + pattern + b')' for kind, pattern in SECRET_PATTERNS if kind != GENERIC_KIND))
+
+# The name a generic token is assigned to, looked up just before the match
+KEY_NAME = re.compile(
+    rb'(?i:api[_-]?key|secret[_-]?key|client[_-]?secret|access[_-]?token|auth[_-]?token|password)["\']?\s*$')
+KEY_NAME_WINDOW = 48
+
+# Generic tokens must look random to count
+MIN_ENTROPY = 3.0
+
+PLACEHOLDER = re.compile(rb'(?i)your[_-]|xxxx|example|placeholder|dummy|changeme|<[^>]+>|\.\.\.|\*{4}')
+
+
+def shannon_entropy(value):
+    """Bits per character of a byte string."""
+    if not value:
+        return 0.0
+    counts = Counter(value)
+    return -sum(n / len(value) * math.log2(n / len(value)) for n in counts.values())
+
+
+def _is_binary(header):
+    return b'\0' in header[:SNIFF_BYTES]
+
+
+def scan_buffer(buffer, path, end=None):
+    """Return findings [{'kind', 'path', 'line', 'offset'}] for one file's bytes (or mmap)."""
+    end = len(buffer) if end is None else end
+    findings = []
+    line = 1
+    last = 0
+
+    for match in COMBINED_PATTERN.finditer(buffer, 0, end):
+        start = match.start()
+        secret = match.group(0)
+        if PLACEHOLDER.search(secret):
+            continue
+
+        # Matches are rare, so classify them by re-trying each pattern in order
+        kind = next(kind for kind, pattern in KIND_PATTERNS if pattern.match(buffer, start, end))
+        if kind == GENERIC_KIND:
+            provider = PROVIDER_PATTERN.search(buffer, start, match.end())
+            if provider:
+                start = provider.start()
+                kind = next(kind for kind, pattern in KIND_PATTERNS if pattern.match(buffer, start, end))
+            elif not KEY_NAME.search(buffer[max(0, start - KEY_NAME_WINDOW):start]):
+                continue
+            elif shannon_entropy(secret.lstrip(b':= \t\r\n')[1:-1]) < MIN_ENTROPY:
+                continue
+
+        line += buffer[last:start].count(b'\n')
+        last = start
+        findings.append({'kind': kind, 'path': path, 'line': line, 'offset': start})
+
+    return findings
+
+
+def scan_file(repo_file):
+    """
+    Scan one RepoFile. Returns (findings, status) where status is
+    'scanned', 'truncated', 'binary' or 'unreadable'.
+    """
+    if repo_file.size <= CONTENT_CACHE_LIMIT:
+        data = repo_file.read_bytes()
+        if _is_binary(data):
+            return [], 'binary'
+        return scan_buffer(data, repo_file.path), 'scanned'
+
+    try:
+        with repo_file.open() as f:
+            if _is_binary(f.read(SNIFF_BYTES)):
+                return [], 'binary'
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = min(len(mapped), MAX_SCAN_BYTES)
+                findings = scan_buffer(mapped, repo_file.path, end)
+                return findings, 'truncated' if end < len(mapped) else 'scanned'
+    except (OSError, ValueError):
+        return [], 'unreadable'
+
+
+def scan_repository(index):
+    """
+    Scan every text file of a RepoIndex once.
+    Returns (findings, stats) with stats counting files per status and bytes searched.
+    """
+    findings = []
+    stats = Counter()
+
+    for repo_file in index:
+        if repo_file.ext in BINARY_EXTS or repo_file.name.lower() in EXAMPLE_FILE_NAMES or repo_file.size == 0:
+            stats['skipped'] += 1
+            continue
+
+        file_findings, status = scan_file(repo_file)
+        findings.extend(file_findings)
+        stats[status] += 1
+        if status in ('scanned', 'truncated'):
+            stats['bytes'] += min(repo_file.size, MAX_SCAN_BYTES)
+
+    return findings, dict(stats)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+
+    parser = argparse.ArgumentParser(description="Scan a repository for hardcoded secrets")
+    parser.add_argument("repository", help="Path to the repository")
+    args = parser.parse_args()
+
+    start = time.time()
+    findings, stats = scan_repository(build_repo_index(args.repository))
+    elapsed = time.time() - start
+
+    print(f"Scanned {stats.get('scanned', 0) + stats.get('truncated', 0)} files "
+          f"({stats.get('bytes', 0) / 1024:.0f} KB) in {elapsed:.2f}s; "
+          f"skipped {stats.get('skipped', 0)}, binary {stats.get('binary', 0)}, "
+          f"truncated {stats.get('truncated', 0)}")
+    if not findings:
+        print("No hardcoded secrets found")
+    for finding in findings:
+        print(f"  - {finding['kind']} in {finding['path']}:{finding['line']} (offset {finding['offset']})")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Cached index of the submission_info.xlsx files in a WorkSubmissions folder.
+
+Each workbook is streamed once (openpyxl read-only mode) and its self-grade,
+GitHub repository and team fields are stored in .submission_info_cache.json
+next to the participant folders, keyed by file mtime and size. Later grading
+passes only stat the files and skip XLSX parsing for anything unchanged.
+
+Usage:
+    python grading_scripts/submission_info_index.py WorkSubmissions01
+    python grading_scripts/submission_info_index.py WorkSubmissions03 --format csv --output urls.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+
+import openpyxl
+
+from file_utils import load_manifest, save_manifest
+
+CACHE_NAME = ".submission_info_cache.json"
+
+# Bump when the extracted fields or their semantics change
+EXTRACTOR_VERSION = "1"
+
+FOLDER_PREFIX = "Participant_"
+FOLDER_SUFFIX = "_assignsubmission_file"
+
+# Row labels in column A of submission_info.xlsx
+FIELD_LABELS = {
+    'participant id': 'participant_id',
+    'group code': 'team',
+    'team name': 'team',
+    'student 1': 'student_1',
+    'student 2': 'student_2',
+    'github repository': 'github_repository',
+    'suggested grade': 'suggested_grade',
+    'pdf filename': 'pdf_filename',
+}
+
+INFO_FIELDS = [
+    'participant_id', 'team', 'student_1', 'student_2', 'github_repository',
+    'suggested_grade', 'scan_grade', 'labeled_grade', 'pdf_filename', 'error',
+]
+
+# In-process cache: resolved submissions dir -> index
+_INDEXES = {}
+
+
+def _text(value):
+    """Normalize a cell value to a stripped string (None for empty cells)."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _grade(value):
+    """Convert a numeric cell or numeric string to a grade in 0-100."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        grade = float(value)
+    else:
+        try:
+            grade = float(str(value).strip())
+        except (TypeError, ValueError):
+            return None
+    return grade if 0 <= grade <= 100 else None
+
+
+def _scan_grade(rows):
+    """First number 0-100 in A1:E14, row by row (update_moodle_grades_assignment1 rule)."""
+    for row in rows[:14]:
+        for cell_value in row[:5]:
+            if cell_value and isinstance(cell_value, (int, float)):
+                if 0 <= cell_value <= 100:
+                    return float(cell_value)
+    return None
+
+
+def _labeled_grade(rows):
+    """Number next to a "grade" label in rows 1-10, else B2/C2/D2/B3/C3 (update_moodle_grades rule)."""
+    for row in rows[:10]:
+        for idx, cell_value in enumerate(row):
+            if cell_value and "grade" in str(cell_value).lower():
+                if idx + 1 < len(row):
+                    grade_value = row[idx + 1]
+                    if grade_value and isinstance(grade_value, (int, float)):
+                        return float(grade_value)
+
+    for row_idx, col_idx in [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2)]:
+        value = rows[row_idx][col_idx] if row_idx < len(rows) else None
+        if value and isinstance(value, (int, float)) and 0 <= value <= 100:
+            return float(value)
+
+    return None
+
+
+def read_submission_info(submission_info):
+    """Parse one submission_info.xlsx into a dict of INFO_FIELDS."""
+    info = dict.fromkeys(INFO_FIELDS)
+
+    try:
+        wb = openpyxl.load_workbook(submission_info, read_only=True)
+        try:
+            rows = [list(row) for row in wb.active.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+    except Exception as e:
+        info['error'] = str(e)
+        return info
+
+    # Read-only rows can be ragged; pad them like the full worksheet would be
+    width = max([len(row) for row in rows] + [5])
+    for row in rows:
+        row.extend([None] * (width - len(row)))
+
+    for row in rows:
+        field = FIELD_LABELS.get(str(row[0]).strip().lower()) if row[0] else None
+        if field and info[field] is None:
+            info[field] = row[1]
+
+    info['participant_id'] = _text(info['participant_id'])
+    info['team'] = _text(info['team'])
+    info['student_1'] = _text(info['student_1'])
+    info['student_2'] = _text(info['student_2'])
+    info['github_repository'] = _text(info['github_repository'])
+    info['pdf_filename'] = _text(info['pdf_filename'])
+    info['suggested_grade'] = _grade(info['suggested_grade'])
+
+    # Some workbooks only mention the repository outside the labeled row
+    if info['github_repository'] is None:
+        for row in rows:
+            for cell_value in row:
+                if isinstance(cell_value, str) and 'github.com' in cell_value.lower():
+                    info['github_repository'] = cell_value.strip()
+                    break
+            if info['github_repository']:
+                break
+
+    info['scan_grade'] = _scan_grade(rows)
+    info['labeled_grade'] = _labeled_grade(rows)
+    if info['suggested_grade'] is None:
+        info['suggested_grade'] = info['scan_grade']
+
+    return info
+
+
+def build_submission_index(submissions_dir, rebuild=False):
+    """
+    Return {student_id: info} for every participant folder with a
+    submission_info.xlsx, parsing only workbooks whose mtime or size changed.
+    """
+    submissions_dir = Path(submissions_dir)
+    cache_path = submissions_dir / CACHE_NAME
+
+    cache = {} if rebuild else load_manifest(cache_path)
+    if cache.get('version') != EXTRACTOR_VERSION:
+        cache = {}
+    cached_entries = cache.get('entries', {})
+
+    entries = {}
+    parsed = 0
+
+    for folder in sorted(submissions_dir.glob(f"{FOLDER_PREFIX}*{FOLDER_SUFFIX}")):
+        student_id = folder.name[len(FOLDER_PREFIX):-len(FOLDER_SUFFIX)]
+        submission_info = folder / "submission_info.xlsx"
+
+        try:
+            stat = submission_info.stat()
+        except OSError:
+            continue
+
+        entry = cached_entries.get(student_id)
+        if not entry or entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+            entry = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'info': read_submission_info(submission_info),
+            }
+            parsed += 1
+
+        entries[student_id] = entry
+
+    if parsed or entries.keys() != cached_entries.keys():
+        try:
+            save_manifest(cache_path, {'version': EXTRACTOR_VERSION, 'entries': entries})
+        except OSError as e:
+            print(f"Warning: Could not write {cache_path}: {e}")
+
+    return {student_id: entry['info'] for student_id, entry in entries.items()}
+
+
+def get_submission_info(student_id, submissions_dir):
+    """Look up one student's submission_info fields (index built once per process)."""
+    key = os.path.abspath(submissions_dir)
+    if key not in _INDEXES:
+        _INDEXES[key] = build_submission_index(submissions_dir)
+    return _INDEXES[key].get(str(student_id))
+
+
+def write_index(index, output, fmt):
+    """Write the index as JSON or CSV to an open text stream."""
+    if fmt == 'json':
+        json.dump(index, output, indent=2, ensure_ascii=False)
+        output.write("\n")
+        return
+
+    writer = csv.writer(output)
+    writer.writerow(['student_id'] + INFO_FIELDS)
+    for student_id, info in index.items():
+        writer.writerow([student_id] + [info.get(field) for field in INFO_FIELDS])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Dump the cached submission_info.xlsx index")
+    parser.add_argument("submissions_dir", type=Path, help="WorkSubmissions folder to index")
+    parser.add_argument("--format", choices=['json', 'csv'], default='json',
+                        help="Output format (default: json)")
+    parser.add_argument("--output", type=Path, help="Write to this file instead of stdout")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Ignore the cache and re-parse every workbook")
+    args = parser.parse_args()
+
+    index = build_submission_index(args.submissions_dir, rebuild=args.rebuild)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8-sig' if args.format == 'csv' else 'utf-8',
+                  newline='') as f:
+            write_index(index, f, args.format)
+        print(f"Wrote {len(index)} entries to {args.output}")
+    else:
+        sys.stdout.reconfigure(encoding='utf-8')
+        write_index(index, sys.stdout, args.format)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Static test-suite analyzer for the testing_quality skill.
+
+Test files are never executed. Python tests are parsed with ast: test
+functions are counted the way pytest and unittest collect them, parametrize
+decorators are expanded to their number of cases, and assert statements
+plus assert*/raises/warns calls are counted as assertions. JavaScript/
+TypeScript and Java tests go through a small tokenizer that drops comments
+and string contents before counting it()/test() and @Test cases, so
+commented-out tests are not counted.
+
+Results are cached per file by content (analysis_cache.py), and Python
+trees are shared in memory with docstring_scanner.py and import_graph.py. As
+in docstring_scanner.py, the command line analyzes uncached files across a
+process pool once there are enough of them; the library default is
+in-process.
+
+Usage:
+    python grading_scripts/test_analyzer.py path/to/repo
+    python grading_scripts/test_analyzer.py path/to/repo --workers 4 --no-cache
+"""
+import ast
+import os
+import re
+from collections import Counter
+
+from analysis_cache import AnalysisCache, analyze_files, parse_python
+
+# Bump when the per-file result below changes so cached results are ignored
+ANALYZER_VERSION = "1"
+
+# Below this many uncached files, analyzing in-process beats starting a pool
+PARALLEL_MIN_FILES = 200
+
+JS_EXTS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+JAVA_EXTS = ('.java', '.kt')
+
+# Calls counted as assertions besides assert statements
+ASSERTION_CALLS = ('raises', 'warns', 'fail')
+
+# Comments and string/template literals, for the C-family tokenizer
+C_TOKENS = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`', re.S)
+
+JS_TEST = re.compile(r'\b(?:it|test)(?:\.(?:only|skip|concurrent|todo))?\s*\(\s*["\'`]')
+JS_TEST_EACH = re.compile(r'\b(?:it|test)(?:\.(?:only|skip))?\.each\s*(?:\(\s*(\[)?|`)')
+JS_ASSERTION = re.compile(r'\bexpect\s*\(|\bassert(?:\.\w+)?\s*\(|\.should\b')
+JS_FRAMEWORKS = (
+    ('vitest', re.compile(r'from\s+["\']vitest["\']|\bvi\.fn\b')),
+    ('mocha', re.compile(r'require\(\s*["\'](?:mocha|chai)["\']\s*\)|from\s+["\']chai["\']')),
+    ('jest', re.compile(r'\bjest\.\w+|@jest/globals|\bexpect\s*\(')),
+)
+
+JAVA_TEST = re.compile(r'@(?:Test|ParameterizedTest|RepeatedTest|TestFactory)\b')
+JAVA_PARAMETERIZED = re.compile(r'@ParameterizedTest\b')
+JAVA_SOURCE = re.compile(r'@(?:ValueSource|CsvSource|EnumSource)\s*\(([^)]*)\)')
+JAVA_ASSERTION = re.compile(r'\bassert\w*\s*\(|\bverify\s*\(|\bassertThat\b')
+JAVA_FRAMEWORKS = (
+    ('junit5', re.compile(r'org\.junit\.jupiter')),
+    ('junit4', re.compile(r'org\.junit\.(?:Test|Assert|runner)')),
+    ('testng', re.compile(r'org\.testng')),
+    ('kotest', re.compile(r'io\.kotest')),
+)
+
+
+def _empty_result(language):
+    return {'parsed': True, 'language': language, 'tests': 0, 'cases': 0, 'parametrized': 0,
+            'assertions': 0, 'frameworks': []}
+
+
+def _call_name(node):
+    """'pytest.mark.parametrize' for a Call/Attribute/Name chain, '' otherwise."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _parametrize_cases(decorator):
+    """Number of cases one parametrize decorator generates (1 when not a literal)."""
+    if not isinstance(decorator, ast.Call):
+        return 1
+    values = decorator.args[1] if len(decorator.args) > 1 else None
+    for keyword in decorator.keywords:
+        if keyword.arg == 'argvalues':
+            values = keyword.value
+    if isinstance(values, (ast.List, ast.Tuple, ast.Set)):
+        return max(1, len(values.elts))
+    return 1
+
+
+def _is_test_class(node):
+    """pytest collects Test* classes without __init__; unittest collects TestCase subclasses."""
+    bases = [_call_name(base) for base in node.bases]
+    if any(base.endswith('TestCase') for base in bases):
+        return True
+    has_init = any(isinstance(child, ast.FunctionDef) and child.name == '__init__' for child in node.body)
+    return node.name.startswith('Test') and not has_init
+
+
+def analyze_python(data):
+    """
+    Analyze one Python test file:
+      {'parsed', 'language', 'tests', 'cases', 'parametrized', 'assertions', 'frameworks'}
+    'cases' expands parametrized tests to their number of generated cases.
+    """
+    result = _empty_result('python')
+    tree = parse_python(data)
+    if tree is None:
+        result['parsed'] = False
+        return result
+
+    frameworks = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            names = [node.module or '']
+        elif isinstance(node, ast.Assert):
+            result['assertions'] += 1
+            continue
+        elif isinstance(node, ast.Call):
+            name = _call_name(node).rsplit('.', 1)[-1]
+            if name.startswith('assert') or name in ASSERTION_CALLS:
+                result['assertions'] += 1
+            continue
+        else:
+            continue
+        for name in names:
+            root = name.split('.')[0]
+            if root in ('pytest', 'unittest', 'hypothesis'):
+                frameworks.add(root)
+
+    # (scope, name) -> cases; a redefined name shadows the earlier test, as at collection
+    collected = {}
+    stack = [(node, "") for node in tree.body]
+    while stack:
+        node, scope = stack.pop(0)
+        if isinstance(node, ast.ClassDef):
+            if _is_test_class(node):
+                if any(_call_name(base).endswith('TestCase') for base in node.bases):
+                    frameworks.add('unittest')
+                stack.extend((child, f"{scope}{node.name}.") for child in node.body)
+            continue
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.name.startswith('test'):
+            continue
+
+        cases = 1
+        for decorator in node.decorator_list:
+            if _call_name(decorator).endswith('parametrize'):
+                cases *= _parametrize_cases(decorator)
+        collected[(scope, node.name)] = cases
+
+    result['tests'] = len(collected)
+    result['cases'] = sum(collected.values())
+    result['parametrized'] = sum(1 for cases in collected.values() if cases > 1)
+
+    if result['tests'] and not frameworks & {'pytest', 'unittest'}:
+        # Bare test_* functions with plain asserts are pytest-style
+        frameworks.add('pytest')
+    result['frameworks'] = sorted(frameworks)
+    return result
+
+
+def _strip_c_tokens(text):
+    """Drop comments and empty string literals, keeping the quote characters."""
+    def replace(match):
+        token = match.group(0)
+        return ' ' if token[0] == '/' else token[0] * 2
+    return C_TOKENS.sub(replace, text)
+
+
+def _literal_rows(text, start):
+    """Number of top-level elements of the array literal opening at text[start] ('[')."""
+    depth = 0
+    rows = 0
+    in_element = False
+    for char in text[start:start + 100000]:
+        if char in '])}':
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and char == ',':
+            rows += in_element
+            in_element = False
+            continue
+        if depth >= 1 and not char.isspace():
+            in_element = True
+        if char in '[({':
+            depth += 1
+    return rows + in_element
+
+
+def analyze_js(data):
+    """Analyze one JavaScript/TypeScript test file (same result keys as analyze_python)."""
+    raw = data.decode('utf-8', errors='replace')
+    text = _strip_c_tokens(raw)
+    result = _empty_result('javascript')
+
+    result['tests'] = len(JS_TEST.findall(text))
+    result['cases'] = result['tests']
+    for match in JS_TEST_EACH.finditer(text):
+        rows = _literal_rows(text, match.start(1)) if match.group(1) else 1
+        result['tests'] += 1
+        result['cases'] += max(1, rows)
+        result['parametrized'] += 1
+    result['assertions'] = len(JS_ASSERTION.findall(text))
+    # Module names are string literals, so frameworks are detected on the raw source
+    result['frameworks'] = [name for name, pattern in JS_FRAMEWORKS if pattern.search(raw)][:1]
+    return result
+
+
+def analyze_java(data):
+    """Analyze one Java/Kotlin test file (same result keys as analyze_python)."""
+    text = _strip_c_tokens(data.decode('utf-8', errors='replace'))
+    result = _empty_result('java')
+
+    result['tests'] = len(JAVA_TEST.findall(text))
+    parameterized = len(JAVA_PARAMETERIZED.findall(text))
+    # Source annotations pair up with the parameterized tests in order; one case when a source is missing
+    rows = [source.count(',') + 1 for source in JAVA_SOURCE.findall(text)][:parameterized]
+    rows += [1] * (parameterized - len(rows))
+    result['parametrized'] = parameterized
+    result['cases'] = result['tests'] - parameterized + sum(rows)
+    result['assertions'] = len(JAVA_ASSERTION.findall(text))
+    result['frameworks'] = [name for name, pattern in JAVA_FRAMEWORKS if pattern.search(text)][:1]
+    return result
+
+
+def analyze_test_source(data, ext):
+    """Dispatch on file extension; None for languages without an analyzer."""
+    if ext == '.py':
+        return analyze_python(data)
+    if ext in JS_EXTS:
+        return analyze_js(data)
+    if ext in JAVA_EXTS:
+        return analyze_java(data)
+    return None
+
+
+def summarize(file_results):
+    """Aggregate per-file results (path -> result) into suite totals."""
+    frameworks = Counter()
+    languages = Counter()
+    for file_result in file_results.values():
+        frameworks.update(file_result['frameworks'])
+        languages[file_result['language']] += 1
+
+    tests = sum(file_result['tests'] for file_result in file_results.values())
+    assertions = sum(file_result['assertions'] for file_result in file_results.values())
+    return {
+        'files': len(file_results),
+        'tests': tests,
+        'cases': sum(file_result['cases'] for file_result in file_results.values()),
+        'parametrized': sum(file_result['parametrized'] for file_result in file_results.values()),
+        'assertions': assertions,
+        'assertions_per_test': round(assertions / tests, 1) if tests else 0.0,
+        'frameworks': [name for name, _ in frameworks.most_common()],
+        'languages': dict(languages),
+        'syntax_errors': sorted(path for path, file_result in file_results.items() if not file_result['parsed']),
+        'empty_files': sorted(path for path, file_result in file_results.items() if not file_result['tests']),
+    }
+
+
+def analyze_tests(test_files, workers=1, use_cache=True):
+    """
+    Analyze test files (RepoFiles), across a process pool of workers
+    processes when there are many uncached files. Files in languages without
+    an analyzer are skipped. Returns (summary, {path: file result}).
+    """
+    cache = AnalysisCache('tests', ANALYZER_VERSION) if use_cache else None
+    supported = [repo_file for repo_file in test_files if repo_file.ext == '.py' or repo_file.ext in JS_EXTS + JAVA_EXTS]
+    # The analyzer depends on the extension as well as the bytes
+    file_results, analyzed_now = analyze_files(supported, analyze_test_source, cache, workers, by_ext=True)
+
+    summary = summarize(file_results)
+    summary['cache_hits'] = cache.hits if cache else 0
+    summary['analyzed_now'] = analyzed_now
+    return summary, file_results
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+    from tier2_skills import is_test_file
+
+    parser = argparse.ArgumentParser(description="Count tests and assertions in a repository without running them")
+    parser.add_argument("repository", help="Path to the repository")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to analyze uncached files (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Analyze every file, ignoring the cache")
+    parser.add_argument("--files", action="store_true", help="List per-file counts")
+    args = parser.parse_args()
+
+    start = time.time()
+    index = build_repo_index(args.repository)
+    summary, file_results = analyze_tests([f for f in index if is_test_file(f)], workers=args.workers,
+                                          use_cache=not args.no_cache)
+    elapsed = time.time() - start
+
+    print("=" * 70)
+    print(f"TEST SUITE ANALYSIS: {args.repository}")
+    print("=" * 70)
+    print(f"Test files: {summary['files']} (analyzed {summary['analyzed_now']}, "
+          f"cached {summary['cache_hits']}) in {elapsed:.2f}s")
+    print(f"Tests: {summary['tests']} ({summary['cases']} cases, {summary['parametrized']} parametrized)")
+    print(f"Assertions: {summary['assertions']} ({summary['assertions_per_test']} per test)")
+    print(f"Frameworks: {', '.join(summary['frameworks']) or 'none detected'}")
+    if summary['syntax_errors']:
+        print(f"Could not parse: {', '.join(summary['syntax_errors'][:10])}")
+
+    if args.files:
+        for path, file_result in sorted(file_results.items()):
+            print(f"  {path}: {file_result['tests']} tests, {file_result['cases']} cases, "
+                  f"{file_result['assertions']} assertions")
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Tier 2 assessment orchestrator.
+
+Runs the ten skill scorers (tier2_skills.py) against each student repository
+and writes assessments_tier2_assignmentN/tier2_assessment_<id>.json in the
+format the report generators and Moodle scripts already read.
+
+Each repository is indexed once (repo_index.py) and the skills run
+concurrently in threads over that shared index, so a student costs one tree
+walk instead of ten. The skill threads run in a child process that is killed
+at the --skill-timeout deadline, so a hung skill cannot stall the run: a
+skill that raises or has not finished by then scores 0 and is listed in the
+assessment's "errors" field; the other nine are kept. Students are assessed
+in parallel across --workers processes.
+
+Skill results are cached by repository content and skill version
+(result_cache.py): a regrade after one skill's rubric changes reruns only
+that skill, and unchanged resubmissions reuse every skill.
+
+Repositories are expected inside the participant folder
+(WorkSubmissionsN/Participant_<id>_assignsubmission_file/<repo name>).
+Students without a GitHub URL in submission_info.xlsx get the
+"manual_no_repository" assessment.
+
+Usage:
+    python grading_scripts/tier2_orchestrator.py --assignment 2
+    python grading_scripts/tier2_orchestrator.py --assignment 3 --students 48973 63709 --overwrite
+    python grading_scripts/tier2_orchestrator.py --assignment 1 --overwrite --no-cache
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+
+from analysis_cache import DEFAULT_LIMIT_BYTES, evict
+from repo_fetcher import checkout_name, parse_repository_url
+from repo_index import build_repo_index
+from result_cache import SkillResultCache, tree_hash
+from submission_info_index import FOLDER_PREFIX, FOLDER_SUFFIX, build_submission_index
+from tier2_skills import MAX_SKILL_SCORE, SKILL_SCORERS
+
+ORCHESTRATOR_VERSION = "3.0.0"
+
+# Seconds a single skill may run before it is scored 0
+DEFAULT_SKILL_TIMEOUT = 120
+
+NO_URL_ERROR = "No GitHub repository URL provided in submission"
+
+# (minimum total, tier, description), highest first
+PERFORMANCE_TIERS = [
+    (90, "Excellence", "90-100 points"),
+    (80, "Good", "80-89 points"),
+    (55, "Potential", "55-79 points"),
+    (0, "Below Standard", "0-54 points"),
+]
+
+STRENGTH_SCORE = 8.0
+WEAKNESS_SCORE = 5.0
+
+# Written instead of an empty list; the report and Moodle feedback generators skip these
+NO_STRENGTHS = "No skills with excellent scores (8+/10)"
+NO_WEAKNESSES = "No critical weaknesses (<5/10)"
+NO_IMMEDIATE_ACTIONS = "All critical areas addressed - focus on optimization"
+NO_HIGH_PRIORITY_ACTIONS = "Maintain current standards across all skills"
+
+# Seconds a terminated skill process gets to exit before it is killed outright
+KILL_GRACE = 5
+
+
+def skill_title(skill):
+    """'ui_ux' -> 'Ui Ux', as used in recommended actions and strengths."""
+    return skill.replace('_', ' ').title()
+
+
+def performance_tier(total_score):
+    for minimum, tier, description in PERFORMANCE_TIERS:
+        if total_score >= minimum:
+            return tier, description
+    return PERFORMANCE_TIERS[-1][1:]
+
+
+def repo_name_from_url(github_url):
+    """'https://github.com/user/repo.git', '.../user/repo/tree/main' or 'GitHub - user/repo' -> 'repo' (None if unparseable)."""
+    parsed = parse_repository_url(github_url)
+    return checkout_name(parsed[0]) if parsed else None
+
+
+def find_repository(participant_dir, github_url):
+    """
+    Return the repository to assess inside participant_dir: the folder named
+    after the GitHub repository, else the only subfolder containing .git.
+    A link into a folder of the repository (.../tree/main/ex1) selects that
+    folder; None if it does not exist in the checkout.
+    """
+    parsed = parse_repository_url(github_url)
+    url, subpath = parsed if parsed else (None, None)
+
+    if url and (participant_dir / checkout_name(url)).is_dir():
+        repository = participant_dir / checkout_name(url)
+    else:
+        clones = [d for d in sorted(participant_dir.iterdir()) if d.is_dir() and (d / '.git').exists()]
+        repository = clones[0] if len(clones) == 1 else None
+
+    if repository is None or not subpath:
+        return repository
+    return repository / subpath if (repository / subpath).is_dir() else None
+
+
+def checkout_root(participant_dir, repository):
+    """The clone containing a find_repository() result (the repository itself unless a folder was selected)."""
+    return participant_dir / repository.relative_to(participant_dir).parts[0]
+
+
+def failed_skill_details(skill, error):
+    return {
+        'score': 0.0,
+        'max_score': MAX_SKILL_SCORE,
+        'notes': [f"Skill assessment failed: {error}"],
+        'recommendations': [],
+        'skill': skill,
+    }
+
+
+def _skill_process(index, skills, results):
+    """Run skills in threads and put (skill, details, error) on results as each finishes. Runs in a child process."""
+    with ThreadPoolExecutor(max_workers=len(skills), thread_name_prefix="skill") as executor:
+        futures = {executor.submit(SKILL_SCORERS[skill], index): skill for skill in skills}
+        for future in as_completed(futures):
+            try:
+                results.put((futures[future], future.result(), None))
+            except Exception as e:
+                results.put((futures[future], None, f"{type(e).__name__}: {e}"))
+
+
+def run_skills(index, skill_timeout=DEFAULT_SKILL_TIMEOUT, result_cache=None):
+    """
+    Run every skill concurrently over one shared index.
+    Returns (skill_details in canonical order, list of error strings, skills reused from cache).
+
+    With a result_cache, skills whose (tree hash, version) is cached are not
+    run; fresh successful results are stored. The skills run in a child
+    process; whatever has not finished skill_timeout seconds after the start
+    is scored 0 and the process is killed.
+    """
+    tree = tree_hash(index) if result_cache is not None else None
+    cached = {}
+    if result_cache is not None:
+        for skill in SKILL_SCORERS:
+            details = result_cache.get(tree, skill)
+            if details is not None:
+                cached[skill] = details
+
+    to_run = [skill for skill in SKILL_SCORERS if skill not in cached]
+    finished = {}
+    stop_reason = f"timed out after {skill_timeout}s"
+    if to_run:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_skill_process, args=(index, to_run, results), daemon=True)
+        process.start()
+        deadline = time.monotonic() + skill_timeout
+        try:
+            while len(finished) < len(to_run):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    skill, details, error = results.get(timeout=min(remaining, 1.0))
+                except queue.Empty:
+                    if not process.is_alive() and results.empty():
+                        stop_reason = f"skill process exited with code {process.exitcode}"
+                        break
+                    continue
+                finished[skill] = (details, error)
+        finally:
+            if process.is_alive():
+                process.terminate()
+                process.join(KILL_GRACE)
+                if process.is_alive():
+                    process.kill()
+            process.join()
+            results.close()
+
+    details = {}
+    errors = []
+    for skill in SKILL_SCORERS:
+        if skill in cached:
+            details[skill] = cached[skill]
+            continue
+        skill_details, error = finished.get(skill, (None, stop_reason))
+        if error is None:
+            details[skill] = skill_details
+            if result_cache is not None:
+                result_cache.put(tree, skill, skill_details)
+        else:
+            details[skill] = failed_skill_details(skill, error)
+            errors.append(f"{skill}: {error}")
+
+    return details, errors, len(cached)
+
+
+def build_assessment(student_id, assignment_num, repository_path, skill_details, errors):
+    """Assemble the tier2_assessment JSON document from the skill results."""
+    skills = {skill: skill_details[skill]['score'] for skill in SKILL_SCORERS}
+    total_score = round(sum(skills.values()), 1)
+    tier, tier_description = performance_tier(total_score)
+
+    immediate = [f"Address {skill_title(s)} (0/10 points)" for s, score in skills.items() if score == 0]
+    high_priority = [f"Improve {skill_title(s)} ({score}/10 points)"
+                     for s, score in skills.items() if 0 < score < WEAKNESS_SCORE]
+    strengths = [f"{skill_title(s)} ({score}/10)" for s, score in skills.items() if score >= STRENGTH_SCORE]
+    weaknesses = [f"{skill_title(s)} ({score}/10)" for s, score in skills.items() if score < WEAKNESS_SCORE]
+
+    return {
+        'student_id': str(student_id),
+        'assignment': f"Assignment {assignment_num}",
+        'repository_name': Path(repository_path).name,
+        'repository_path': str(repository_path),
+        'assessment_date': date.today().isoformat(),
+        'orchestration_method': "parallel_skill_invocation",
+        'orchestrator_version': ORCHESTRATOR_VERSION,
+        'skills': skills,
+        'skill_details': skill_details,
+        'total_score': total_score,
+        'final_grade': total_score,
+        'performance_tier': tier,
+        'tier_description': tier_description,
+        'errors': "; ".join(errors) if errors else None,
+        'recommended_actions': {
+            'immediate': immediate or [NO_IMMEDIATE_ACTIONS],
+            'high_priority': high_priority or [NO_HIGH_PRIORITY_ACTIONS],
+        },
+        'overall_assessment': {
+            'summary': f"Assessment completed with {total_score}/100 points ({tier} tier)",
+            'strengths': strengths or [NO_STRENGTHS],
+            'weaknesses': weaknesses or [NO_WEAKNESSES],
+            'parallel_execution': True,
+            'skills_assessed': len(skills),
+        },
+    }
+
+
+def no_repository_assessment(student_id, assignment_num, error=NO_URL_ERROR):
+    """The assessment written for students whose repository cannot be assessed."""
+    tier, tier_description = performance_tier(0)
+    return {
+        'student_id': str(student_id),
+        'assignment': f"Assignment {assignment_num}",
+        'repository_name': "N/A",
+        'repository_path': "N/A",
+        'assessment_date': date.today().isoformat(),
+        'orchestration_method': "manual_no_repository",
+        'orchestrator_version': ORCHESTRATOR_VERSION,
+        'skills': {skill: 0.0 for skill in SKILL_SCORERS},
+        'skill_details': {},
+        'total_score': 0.0,
+        'final_grade': 0.0,
+        'performance_tier': tier,
+        'tier_description': tier_description,
+        'errors': error,
+        'recommended_actions': {
+            'immediate': ["Provide GitHub repository URL for assessment"],
+        },
+        'overall_assessment': {
+            'summary': "Cannot assess - no repository URL provided",
+            'strengths': [],
+            'weaknesses': [error],
+            'parallel_execution': False,
+            'skills_assessed': 0,
+        },
+    }
+
+
+def write_assessment(assessment, output_path):
+    """Write the JSON next to its final name and rename, so readers never see half a file."""
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(assessment, f, indent=2)
+    os.replace(tmp_path, output_path)
+
+
+def assess_student(task):
+    """
+    Assess one student and write their JSON. Runs inside a worker process.
+    Returns (student_id, status, total_score, message).
+    """
+    student_id, assignment_num, participant_dir, github_url, output_path, skill_timeout, use_cache = task
+
+    try:
+        if not github_url:
+            write_assessment(no_repository_assessment(student_id, assignment_num), output_path)
+            return student_id, 'no_repository', 0.0, NO_URL_ERROR
+
+        repository = find_repository(participant_dir, github_url)
+        if repository is None:
+            # Nothing to score yet; do not write a zero assessment for a repo that was never fetched
+            return student_id, 'failed', None, f"Repository not found in {participant_dir.name} ({github_url})"
+
+        start = time.time()
+        index = build_repo_index(repository, git_root=checkout_root(participant_dir, repository))
+        result_cache = SkillResultCache() if use_cache else None
+        skill_details, errors, reused = run_skills(index, skill_timeout, result_cache)
+        assessment = build_assessment(student_id, assignment_num, repository, skill_details, errors)
+        write_assessment(assessment, output_path)
+
+        message = f"{len(index)} files, {time.time() - start:.1f}s"
+        if reused:
+            message += f", {reused}/{len(SKILL_SCORERS)} skills cached"
+        if errors:
+            message += f" - {len(errors)} skill error(s)"
+        return student_id, 'assessed', assessment['total_score'], message
+    except Exception as e:
+        return student_id, 'failed', None, f"{type(e).__name__}: {e}"
+
+
+def assess_cohort(assignment_num, students=None, workers=1, skill_timeout=DEFAULT_SKILL_TIMEOUT,
+                  output_dir=None, overwrite=False, use_cache=True, cache_limit=DEFAULT_LIMIT_BYTES):
+    """Assess every participant folder of an assignment (or just the given student IDs)."""
+    submissions_dir = Path(f"WorkSubmissions0{assignment_num}")
+    output_dir = Path(output_dir or f"assessments_tier2_assignment{assignment_num}")
+
+    print("=" * 70)
+    print(f"TIER 2 ASSESSMENT - ASSIGNMENT {assignment_num}")
+    print("=" * 70)
+
+    if not submissions_dir.exists():
+        print(f"ERROR: Submissions directory not found: {submissions_dir}")
+        return None
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    submission_info = build_submission_index(submissions_dir)
+
+    stats = {'assessed': 0, 'no_repository': 0, 'existing': 0, 'failed': 0}
+    tasks = []
+
+    for participant_dir in sorted(submissions_dir.glob(f"{FOLDER_PREFIX}*{FOLDER_SUFFIX}")):
+        student_id = participant_dir.name[len(FOLDER_PREFIX):-len(FOLDER_SUFFIX)]
+        if students and student_id not in students:
+            continue
+
+        output_path = output_dir / f"tier2_assessment_{student_id}.json"
+        if output_path.exists() and not overwrite:
+            stats['existing'] += 1
+            continue
+
+        github_url = (submission_info.get(student_id) or {}).get('github_repository')
+        tasks.append((student_id, assignment_num, participant_dir, github_url, output_path, skill_timeout,
+                      use_cache))
+
+    print(f"Assessing {len(tasks)} students ({stats['existing']} existing, skipped) "
+          f"with {workers} worker(s)...\n")
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = map(assess_student, tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(assess_student, tasks)
+
+    try:
+        for student_id, status, total_score, message in results:
+            stats[status] += 1
+            if status == 'assessed':
+                print(f"  [OK] {student_id}: {total_score}/100 ({message})")
+            elif status == 'no_repository':
+                print(f"  [NO REPO] {student_id}: {message}")
+            else:
+                print(f"  [FAIL] {student_id}: {message}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if use_cache:
+            evicted, _ = evict(max_bytes=cache_limit)
+            if evicted:
+                print(f"\nEvicted {evicted} least recently used cache entries")
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Assessed: {stats['assessed']}")
+    print(f"No repository URL: {stats['no_repository']}")
+    print(f"Existing (skipped): {stats['existing']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Output directory: {output_dir}")
+    print("=" * 70)
+
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the Tier 2 skill assessment for an assignment")
+    parser.add_argument("--assignment", type=int, required=True, choices=[1, 2, 3],
+                        help="Assignment number")
+    parser.add_argument("--students", nargs="+",
+                        help="Only assess these student IDs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to assess students (default: CPU count)")
+    parser.add_argument("--skill-timeout", type=float, default=DEFAULT_SKILL_TIMEOUT,
+                        help=f"Seconds a single skill may run before it scores 0 (default: {DEFAULT_SKILL_TIMEOUT})")
+    parser.add_argument("--output-dir",
+                        help="Where to write the JSON files (default: assessments_tier2_assignmentN)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Re-assess students that already have an assessment JSON")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every skill, ignoring cached results from earlier grading runs")
+    parser.add_argument("--cache-limit-mb", type=float, default=DEFAULT_LIMIT_BYTES / (1 << 20),
+                        help=f"Size limit of the result cache (default: {DEFAULT_LIMIT_BYTES >> 20})")
+    args = parser.parse_args()
+
+    stats = assess_cohort(args.assignment, students=args.students, workers=args.workers,
+                          skill_timeout=args.skill_timeout, output_dir=args.output_dir,
+                          overwrite=args.overwrite, use_cache=not args.no_cache,
+                          cache_limit=int(args.cache_limit_mb * (1 << 20)))
+    if stats is None or stats['failed']:
+        raise SystemExit(1)
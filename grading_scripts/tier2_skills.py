@@ -0,0 +1,1001 @@
+#!/usr/bin/env python3
+"""
+The ten Tier 2 skill scorers.
+
+Each scorer takes a RepoIndex (see repo_index.py) and returns the
+skill_details entry written to tier2_assessment_<id>.json: score,
+max_score, the skill's sub-scores, notes, recommendations and skill name.
+Scorers only query the index, never the filesystem directly (version
+management also reads the .git directory through git_history.py).
+
+The rubric, sub-score caps and note/recommendation wording follow the
+existing assessments so new and old cohorts grade the same way.
+"""
+import re
+import zlib
+
+from doc_index import doc_index_for, is_number, phrase, starts_with
+from docstring_scanner import scan_repository
+from git_history import GitFormatError, read_history
+from image_inspector import inspect_images
+from import_graph import build_import_graph, summarize as summarize_graph
+from notebook_analyzer import analyze_notebook, has_visualizations
+from secret_scanner import EXAMPLE_FILE_NAMES, scan_repository as scan_secrets
+from test_analyzer import analyze_tests
+from tool_config import describe as describe_tools, detect_tools
+
+MAX_SKILL_SCORE = 10.0
+
+DOC_EXTS = ('.md', '.rst', '.txt')
+CODE_EXTS = ('.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.go', '.rb', '.cs', '.cpp', '.c', '.rs', '.php')
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
+README_NAMES = ('README.md', 'README.rst', 'README.txt', 'README')
+
+HEADING = re.compile(r'^#{1,6}\s*(.+?)\s*#*\s*$', re.MULTILINE)
+
+# Files larger than this are skipped by content scans
+MAX_SCAN_SIZE = 2 << 20
+
+
+def _result(skill, fields, notes, recommendations):
+    """Build a skill_details entry; score is the sum of the *_score fields."""
+    score = sum(value for key, value in fields if key.endswith('_score'))
+    details = {'score': round(score, 1), 'max_score': MAX_SKILL_SCORE}
+    details.update(fields)
+    details['notes'] = notes
+    details['recommendations'] = recommendations
+    details['skill'] = skill
+    return details
+
+
+def find_readme(index):
+    """The shallowest README of a RepoIndex (None if there is none)."""
+    return index.first_named(*README_NAMES)
+
+
+def file_text(repo_file):
+    """File contents as text, or '' for files too large to scan."""
+    if repo_file is None or repo_file.size > MAX_SCAN_SIZE:
+        return ""
+    return repo_file.read_text()
+
+
+def headings(text):
+    """Lower-case Markdown headings of a text."""
+    return [heading.lower() for heading in HEADING.findall(text)]
+
+
+def _docs(index):
+    return index.with_ext(*DOC_EXTS)
+
+
+def _code(index):
+    return index.with_ext(*CODE_EXTS)
+
+
+def _is_readme(repo_file):
+    return repo_file.name.lower().startswith('readme')
+
+
+def name_has(repo_file, keywords):
+    """True if the file name, without its extension, contains one of keywords (lower-case)."""
+    stem = repo_file.name.lower().rsplit('.', 1)[0]
+    return any(keyword in stem for keyword in keywords)
+
+
+def _listing(files, limit=3):
+    return ", ".join(repo_file.path for repo_file in files[:limit])
+
+
+# ---------------------------------------------------------------------------
+# 1. Project planning
+# ---------------------------------------------------------------------------
+
+# Section -> doc_index queries (terms or phrases) that mark it in the PRD
+PRD_SECTIONS = (
+    ('problem', (phrase('problem', ('statement', 'definition')), phrase('the', 'problem'))),
+    ('functional', (phrase('functional', ('requirement', 'requirements')),)),
+    ('metrics', ('metrics', 'kpi', 'kpis', phrase('success', 'criteria'))),
+)
+
+
+def score_project_planning(index):
+    """PRD with its key sections (5 points) and architecture documentation (5 points)."""
+    notes = []
+    recommendations = []
+    docs = doc_index_for(index)
+
+    prd_files = [f for f in _docs(index) if name_has(f, ('prd', 'product_requirements', 'product-requirements'))]
+    prd_score = 0.0
+    if prd_files:
+        prd = prd_files[0]
+        notes.append(f"{prd.name} found")
+        prd_id = docs.doc_id(prd)
+        found = {name for name, queries in PRD_SECTIONS if prd_id is not None and docs.matches(prd_id, *queries)}
+
+        prd_score = 2.5
+        if 'functional' in found:
+            prd_score += 1.0
+            notes.append("Functional Requirements found in PRD")
+        else:
+            recommendations.append("Add Functional Requirements section to PRD.md (+1.0 point)")
+        if 'metrics' in found:
+            prd_score += 0.5
+            notes.append("Success Metrics found in PRD")
+        else:
+            recommendations.append("Add Success Metrics section to PRD.md (+0.5 points)")
+        if 'problem' in found:
+            prd_score += 1.0
+            notes.append("Problem Statement found in PRD")
+        else:
+            recommendations.append("Add Problem Statement section to PRD.md (+1.0 point)")
+    else:
+        recommendations.append("Create PRD.md with Problem Statement, Functional Requirements, and Success Metrics (+4.0 points)")
+
+    architecture_files = [f for f in _docs(index) if name_has(f, ('architecture',))]
+    architecture_score = 0.0
+    if architecture_files:
+        architecture_score = 5.0
+        notes.append(f"{architecture_files[0].name} found")
+    elif any(docs.docs[doc_id].ext in DOC_EXTS for doc_id in docs.prefix_docs('architecture')):
+        architecture_score = 2.0
+        notes.append("Some architectural information found in documentation")
+        recommendations.append("Document architecture in README or ARCHITECTURE.md (+3.0 points)")
+    else:
+        recommendations.append("Document architecture in README or ARCHITECTURE.md (+5.0 points)")
+
+    fields = [
+        ('prd_found', bool(prd_files)),
+        ('prd_score', prd_score),
+        ('architecture_found', bool(architecture_files)),
+        ('architecture_score', architecture_score),
+    ]
+    return _result('project_planning', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 2. Code documentation
+# ---------------------------------------------------------------------------
+
+README_MIN_BYTES = 1024
+INSTALL_PATTERN = re.compile(r'install|setup|requirements', re.I)
+USAGE_PATTERN = re.compile(r'usage|example|how\s+to\s+run|getting\s+started|quick\s*start', re.I)
+STRUCTURE_PATTERN = re.compile(r'structure|architecture|layout|director|folder|organi[sz]ation|components|modules', re.I)
+
+
+def score_code_documentation(index):
+    """README (3) with install/usage sections (1 each), code structure docs (2), docstrings (3)."""
+    notes = []
+    recommendations = []
+
+    readme = find_readme(index)
+    readme_text = file_text(readme)
+    readme_score = 0.0
+    readme_sections = 0.0
+    if readme is None:
+        recommendations.append("Create README.md with installation and usage instructions (+5.0 points)")
+    else:
+        if readme.size >= README_MIN_BYTES:
+            readme_score = 3.0
+            notes.append(f"README.md found ({readme.size} bytes)")
+        else:
+            readme_score = 1.0
+            notes.append(f"README.md found but too small ({readme.size} bytes)")
+            recommendations.append("Expand README.md to at least 1KB (+2.0 points)")
+
+        if INSTALL_PATTERN.search(readme_text):
+            readme_sections += 1.0
+            notes.append("Installation instructions found in README")
+        else:
+            recommendations.append("Add installation instructions to README.md (+1.0 point)")
+        if USAGE_PATTERN.search(readme_text):
+            readme_sections += 1.0
+            notes.append("Usage examples found in README")
+        else:
+            recommendations.append("Add usage examples to README.md (+1.0 point)")
+
+    has_docs_dir = index.has_dir('docs')
+    structure_documented = (
+        any(STRUCTURE_PATTERN.search(h) for h in headings(readme_text)) or '├──' in readme_text
+    )
+    if structure_documented:
+        structure_score = 2.0
+        notes.append("Code structure documented in README")
+    elif has_docs_dir or readme is not None:
+        structure_score = 1.0
+        recommendations.append("Improve code structure documentation (+1.0 points)")
+    else:
+        structure_score = 0.0
+        recommendations.append("Document code structure in README or create docs/ directory (+2.0 points)")
+
+    if has_docs_dir:
+        notes.append("docs/ directory found")
+
+    docstrings, py_results = scan_repository(index, workers=1)
+    if any(result['modules'][1] for path, result in py_results.items() if path.endswith('__init__.py')):
+        notes.append("Package __init__.py with documentation found")
+
+    coverage = docstrings['file_coverage'] if docstrings['files'] else None
+    if coverage is None:
+        docstring_score = 3.0
+        notes.append("No Python files found (N/A for docstrings)")
+    elif coverage > 50:
+        docstring_score = 3.0
+        notes.append(f"Python docstring coverage: {coverage:.0f}%")
+    elif coverage >= 25:
+        docstring_score = 1.5
+        notes.append(f"Python docstring coverage: {coverage:.0f}% (needs improvement)")
+        recommendations.append("Increase docstring coverage to >50% of files (+1.5 points)")
+    else:
+        docstring_score = 0.0
+        notes.append(f"Python docstring coverage: {coverage:.0f}% (too low)")
+        recommendations.append("Add docstrings to Python functions and classes (+3.0 points)")
+
+    if docstrings['definitions']:
+        by_kind = docstrings['coverage_by_kind']
+        notes.append(
+            f"Docstrings: {docstrings['docstring_count']} of {docstrings['definitions']} definitions "
+            f"(modules {by_kind['modules']['documented']}/{by_kind['modules']['total']}, "
+            f"classes {by_kind['classes']['documented']}/{by_kind['classes']['total']}, "
+            f"functions {by_kind['functions']['documented']}/{by_kind['functions']['total']})")
+
+    fields = [
+        ('readme_score', readme_score),
+        ('structure_score', structure_score),
+        ('docstring_score', docstring_score),
+        ('docstring_count', docstrings['docstring_count']),
+        ('docstring_coverage', docstrings['docstring_coverage']),
+    ]
+    details = _result('code_documentation', fields, notes, recommendations)
+    # Installation and usage sections are worth a point each on top of the sub-scores
+    details['score'] = round(details['score'] + readme_sections, 1)
+    return details
+
+
+# ---------------------------------------------------------------------------
+# 3. Configuration & security
+# ---------------------------------------------------------------------------
+
+ENV_USAGE_PATTERN = re.compile(r'os\.getenv\(|os\.environ|process\.env\b|load_dotenv\(|getenv\(|dotenv')
+ENV_DOC_PATTERN = re.compile(r'\.env\b|environment\s+variable', re.I)
+GITIGNORE_COVERAGE = (
+    ('.env',), ('__pycache__', '*.pyc', '*.py[cod]'), ('venv', '.venv', 'env/'),
+    ('node_modules',), ('*.log', 'logs'), ('.ds_store',), ('.idea', '.vscode'),
+    ('*.key', '*.pem', 'secrets', 'credentials'),
+)
+
+
+def score_config_security(index):
+    """No secrets (2), .env.example (2), .gitignore (2), env var usage (2), .gitignore coverage (2)."""
+    notes = []
+    recommendations = []
+
+    secrets, _ = scan_secrets(index)
+    if secrets:
+        secrets_score = 0.0
+        notes.append(f"WARNING: {len(secrets)} hardcoded secret(s) found in production code!")
+        for finding in secrets[:5]:
+            notes.append(f"  - {finding['kind']} in {finding['path']}:{finding['line']}")
+        recommendations.append("Remove hardcoded secrets and use environment variables (+2.0 points)")
+    else:
+        secrets_score = 2.0
+        notes.append("No hardcoded secrets found in production code")
+
+    if index.named(*EXAMPLE_FILE_NAMES):
+        env_example_score = 2.0
+        notes.append(".env.example file found")
+    else:
+        env_example_score = 0.0
+        recommendations.append("Create .env.example file to document required environment variables (+2.0 points)")
+
+    gitignore = index.first_named('.gitignore')
+    gitignore_lines = [line.strip().lower() for line in file_text(gitignore).splitlines()
+                       if line.strip() and not line.strip().startswith('#')]
+    if gitignore is None:
+        gitignore_score = 0.0
+        recommendations.append("Create .gitignore file and add .env to it (+2.0 points)")
+    elif any(line.lstrip('/').startswith('.env') or line == '*.env' for line in gitignore_lines):
+        gitignore_score = 2.0
+        notes.append(".gitignore file found with .env properly ignored")
+    else:
+        gitignore_score = 1.0
+        notes.append(".gitignore file found")
+        recommendations.append("Add .env to .gitignore to prevent committing secrets (+1.0 point)")
+
+    env_uses = sum(len(ENV_USAGE_PATTERN.findall(file_text(f))) for f in _code(index))
+    documented = bool(ENV_DOC_PATTERN.search(file_text(find_readme(index))))
+    if env_uses >= 2:
+        env_vars_score = 2.0
+        notes.append(f"Uses environment variables ({env_uses} instances)")
+    elif env_uses == 1 and documented:
+        env_vars_score = 1.5
+        notes.append(f"Uses environment variables ({env_uses} instances) and documented in README")
+        recommendations.append("Increase environment variable usage (+0.5 points)")
+    elif env_uses == 1 or documented:
+        env_vars_score = 1.0
+        if documented:
+            notes.append("Environment variables documented in README")
+            recommendations.append("Implement environment variable usage in code (+1.0 point)")
+        else:
+            notes.append(f"Uses environment variables ({env_uses} instances)")
+            recommendations.append("Increase environment variable usage (+1.0 point)")
+    else:
+        env_vars_score = 0.0
+        recommendations.append("Use environment variables for configuration (+2.0 points)")
+
+    covered = sum(1 for patterns in GITIGNORE_COVERAGE
+                  if any(p in line for p in patterns for line in gitignore_lines))
+    if gitignore is not None and covered >= 5:
+        coverage_score = 2.0
+        notes.append("Good security configuration overall")
+    elif gitignore is not None and covered >= 2:
+        coverage_score = 1.0
+        notes.append("Adequate security configuration")
+        recommendations.append("Improve overall security practices (+1.0 point)")
+    else:
+        coverage_score = 0.0
+        recommendations.append("Improve .gitignore coverage for better security (+2.0 points)")
+
+    fields = [
+        ('secrets_score', secrets_score),
+        ('env_example_score', env_example_score),
+        ('gitignore_score', gitignore_score),
+        ('env_vars_score', env_vars_score),
+        ('gitignore_coverage_score', coverage_score),
+    ]
+    return _result('config_security', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 4. Testing & quality
+# ---------------------------------------------------------------------------
+
+TEST_COUNT_TARGET = 10
+TEST_FRAMEWORK_FILES = (
+    'pytest.ini', '.coveragerc', 'coverage.xml', 'jest.config.js', 'jest.config.ts', 'jest.config.mjs',
+    'karma.conf.js', 'vitest.config.js', 'vitest.config.ts', 'phpunit.xml', 'tox.ini',
+)
+PYTEST_SECTION = re.compile(r'^\[(?:tool:pytest|tool\.pytest[^\]]*)\]', re.MULTILINE)
+
+
+def is_test_file(repo_file):
+    """Test modules by naming convention or by living in a tests directory."""
+    if repo_file.ext not in CODE_EXTS or repo_file.name in ('__init__.py', 'conftest.py'):
+        return False
+    name = repo_file.name.lower()
+    if name.startswith('test_') or name.rsplit('.', 1)[0].endswith(('_test', '.test', '.spec')):
+        return True
+    return any(part.lower() in ('tests', 'test', '__tests__') for part in repo_file.parts[:-1])
+
+
+def score_testing_quality(index):
+    """Tests exist (3), several test files (2), framework config (2), >10 test functions (3)."""
+    notes = []
+    recommendations = []
+
+    test_files = [f for f in index if is_test_file(f)]
+    suite, _ = analyze_tests(test_files, workers=1)
+    test_count = suite['tests']
+
+    if test_files:
+        test_exists_score = 3.0
+        multiple_tests_score = 2.0
+        notes.append(f"Found {len(test_files)} test file(s)")
+        if len(test_files) >= 4:
+            notes.append(f"Excellent test coverage with {len(test_files)} test files")
+        else:
+            notes.append(f"Good test coverage with {len(test_files)} test file(s)")
+    else:
+        test_exists_score = 0.0
+        multiple_tests_score = 0.0
+        recommendations.append("Create test files for your code (+3.0 points)")
+        recommendations.append("Create test files for your code (+2.0 points)")
+
+    framework_files = index.named(*TEST_FRAMEWORK_FILES)
+    framework_files = [f for f in framework_files if f.name != 'tox.ini' or PYTEST_SECTION.search(file_text(f))]
+    framework_files += [f for f in index.named('pyproject.toml', 'setup.cfg') if PYTEST_SECTION.search(file_text(f))]
+    if framework_files:
+        framework_score = 2.0
+        notes.append(f"Test framework configured: {_listing(framework_files)}")
+    else:
+        framework_score = 0.0
+        recommendations.append("Configure a test framework (pytest, jest, etc.) (+2.0 points)")
+
+    if test_count > TEST_COUNT_TARGET:
+        test_count_score = 3.0
+        notes.append(f"Excellent test count: {test_count} test functions")
+    elif test_count > 0:
+        test_count_score = 1.5
+        notes.append(f"Some test functions: {test_count}")
+        recommendations.append("Write test functions (target: >10) (+1.5 points)")
+    else:
+        test_count_score = 0.0
+        recommendations.append("Write test functions (target: >10) (+3.0 points)")
+
+    if test_count:
+        notes.append(f"Test suite: {suite['cases']} test case(s) ({suite['parametrized']} parametrized), "
+                     f"{suite['assertions']} assertions ({suite['assertions_per_test']} per test)")
+    if suite['frameworks']:
+        notes.append(f"Test framework(s) in use: {', '.join(suite['frameworks'])}")
+    if suite['syntax_errors']:
+        notes.append(f"Could not parse {len(suite['syntax_errors'])} test file(s): {', '.join(suite['syntax_errors'][:3])}")
+
+    total = test_exists_score + multiple_tests_score + framework_score + test_count_score
+    if total >= 9:
+        notes.append("Overall test quality: Excellent")
+    elif total >= 7:
+        notes.append("Overall test quality: Good")
+    elif total > 0:
+        notes.append("Overall test quality: Needs improvement")
+
+    fields = [
+        ('test_exists_score', test_exists_score),
+        ('multiple_tests_score', multiple_tests_score),
+        ('framework_score', framework_score),
+        ('test_count_score', test_count_score),
+    ]
+    return _result('testing_quality', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 5. Research & analysis
+# ---------------------------------------------------------------------------
+
+RESEARCH_KEYWORDS = ('research', 'analysis', 'experiment', 'results', 'findings', 'study',
+                     'evaluation', 'benchmark', 'report', 'comparison')
+CORE_ANALYSIS_LIBRARIES = {'pandas', 'numpy', 'scipy'}
+METHODOLOGY_PATTERN = re.compile(r'methodolog|method|approach|hypothes|conclusion|findings|results', re.I)
+DATA_EXTS = ('.csv', '.tsv', '.xlsx', '.xls', '.parquet', '.feather', '.h5', '.hdf5')
+DATA_DIRS = ('data', 'results', 'datasets', 'output', 'outputs', 'experiments')
+
+
+def score_research_analysis(index):
+    """Research artifacts exist (4), more than two (2), visualizations (2), methodology (2)."""
+    notes = []
+    recommendations = []
+
+    notebooks = index.with_ext('.ipynb')
+    documents = [f for f in index.with_ext('.md', '.pdf')
+                 if not _is_readme(f) and name_has(f, RESEARCH_KEYWORDS)]
+    data_files = [f for f in index if f.ext in DATA_EXTS or
+                  (f.ext == '.json' and any(p.lower() in DATA_DIRS for p in f.parts[:-1]))]
+    total = len(notebooks) + len(documents)
+
+    if notebooks:
+        notes.append(f"Found {len(notebooks)} Jupyter notebook(s) and {len(documents)} research document(s)")
+    elif documents:
+        notes.append(f"Found {len(documents)} research document(s)")
+
+    if total == 0:
+        if data_files:
+            notes.append(f"Found {len(data_files)} data file(s) for analysis")
+        recommendations.extend([
+            "Create research documentation (Jupyter notebooks, research PDFs, or analysis markdown) (+4.0 points)",
+            "Create at least 3 research documents for different analyses (+2.0 points)",
+            "Create research documentation with data visualizations (+2.0 points)",
+            "Document analysis methodology in research documentation (+2.0 points)",
+        ])
+        fields = [
+            ('notebooks_exist_score', 0.0),
+            ('multiple_notebooks_score', 0.0),
+            ('visualizations_score', 0.0),
+            ('documentation_score', 0.0),
+        ]
+        return _result('research_analysis', fields, notes, recommendations)
+
+    if total > 2:
+        multiple_score = 2.0
+        notes.append("Multiple research artifacts for comprehensive analysis")
+    else:
+        multiple_score = 0.0
+        recommendations.append(f"Create more research documentation (currently {total}, need >2) (+2.0 points)")
+
+    notebook_stats = [analyze_notebook(nb.abs_path) for nb in notebooks]
+    analysis_notebooks = [nb for nb in notebook_stats if CORE_ANALYSIS_LIBRARIES & set(nb['analysis_libraries'])]
+    visual_notebooks = [nb for nb in notebook_stats if has_visualizations(nb)]
+    if notebook_stats:
+        notes.append(f"Notebook contents: {sum(nb['code_cells'] for nb in notebook_stats)} code cell(s), "
+                     f"{sum(nb['markdown_cells'] for nb in notebook_stats)} markdown cell(s), "
+                     f"{sum(nb['image_outputs'] for nb in notebook_stats)} plot output(s)")
+    if analysis_notebooks:
+        notes.append(f"Analysis libraries (pandas/numpy/scipy) used in {len(analysis_notebooks)} notebook(s)")
+
+    markdown_docs = [d for d in documents if d.ext == '.md']
+    if visual_notebooks:
+        visualizations_score = 2.0
+        notes.append(f"Visualizations found in {len(visual_notebooks)} notebook(s)")
+    elif any(d.ext == '.pdf' or '![' in file_text(d) or '<img' in file_text(d) for d in documents):
+        visualizations_score = 2.0
+        notes.append("Research documentation includes visualizations")
+    else:
+        visualizations_score = 0.0
+        recommendations.append("Create research documentation with data visualizations (+2.0 points)")
+
+    if notebooks or any(d.ext == '.pdf' or METHODOLOGY_PATTERN.search(file_text(d)) for d in documents):
+        documentation_score = 2.0
+        if markdown_docs or not notebooks:
+            notes.append("Research documentation provides analysis methodology")
+    else:
+        documentation_score = 0.0
+        recommendations.append("Document analysis methodology in research documentation (+2.0 points)")
+
+    if data_files:
+        notes.append(f"Found {len(data_files)} data file(s) for analysis")
+
+    fields = [
+        ('notebooks_exist_score', 4.0),
+        ('multiple_notebooks_score', multiple_score),
+        ('visualizations_score', visualizations_score),
+        ('documentation_score', documentation_score),
+    ]
+    return _result('research_analysis', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 6. UI / UX
+# ---------------------------------------------------------------------------
+
+MANY_IMAGES = 5
+UI_DOC_KEYWORDS = ('ui', 'ux', 'design', 'interface', 'guide', 'usage', 'screenshot', 'quickstart', 'quick_start')
+
+
+def score_ui_ux(index):
+    """Screenshots (3), five or more (3), screenshots in README (2), UI/user guide docs (2)."""
+    notes = []
+    recommendations = []
+
+    report = inspect_images(index, index.with_ext(*IMAGE_EXTS), find_readme(index))
+    image_count = report['unique']
+    if image_count:
+        basic_images_score = 3.0
+        notes.append(f"Found {image_count} image(s)/screenshot(s)")
+    else:
+        basic_images_score = 0.0
+        recommendations.append("Add screenshots of your application (+3.0 points)")
+    if report['duplicates']:
+        notes.append(f"{sum(len(group) - 1 for group in report['duplicates'])} duplicate image(s) counted once")
+    if report['invalid']:
+        notes.append(f"{len(report['invalid'])} file(s) with image extensions are not valid images: "
+                     f"{', '.join(report['invalid'][:3])}")
+
+    if image_count >= MANY_IMAGES:
+        multiple_images_score = 3.0
+        notes.append(f"Excellent visual documentation with {MANY_IMAGES}+ images")
+    else:
+        multiple_images_score = 0.0
+        if image_count:
+            recommendations.append(f"Add more screenshots (currently {image_count}, need {MANY_IMAGES}+) (+3.0 points)")
+        else:
+            recommendations.append(f"Add at least {MANY_IMAGES} screenshots showing different features (+3.0 points)")
+
+    if report['referenced'] or report['remote']:
+        readme_ui_score = 2.0
+        notes.append("README includes UI screenshots/documentation")
+    else:
+        readme_ui_score = 0.0
+        recommendations.append("Add UI screenshots to README.md (+2.0 points)")
+    if report['missing']:
+        notes.append(f"README references missing image(s): {', '.join(report['missing'][:3])}")
+
+    ui_docs = [f for f in index.with_ext('.md', '.txt', '.pdf')
+               if not _is_readme(f) and name_has(f, UI_DOC_KEYWORDS)]
+    if ui_docs:
+        user_guide_score = 2.0
+        notes.append(f"UI documentation found: {_listing(ui_docs)}")
+    else:
+        user_guide_score = 0.0
+        recommendations.append("Create user guide or UI documentation (+2.0 points)")
+
+    fields = [
+        ('basic_images_score', basic_images_score),
+        ('multiple_images_score', multiple_images_score),
+        ('readme_ui_score', readme_ui_score),
+        ('user_guide_score', user_guide_score),
+    ]
+    return _result('ui_ux', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 7. Version management
+# ---------------------------------------------------------------------------
+
+GOOD_COMMIT_COUNT = 10
+MODERATE_COMMIT_COUNT = 5
+
+
+def score_version_management(index, history=None):
+    """Commit count (2), meaningful messages (2), prompt documentation (5), branches (1)."""
+    notes = []
+    recommendations = []
+
+    if history is None:
+        try:
+            history = read_history(index.git_root)
+        except (OSError, ValueError, GitFormatError, zlib.error):
+            history = None
+    commits = history['commits'] if history else 0
+    branches = history['branches'] if history else []
+
+    if commits > GOOD_COMMIT_COUNT:
+        commits_score = 2.0
+        notes.append(f"Good commit history: {commits} commits")
+    elif commits >= MODERATE_COMMIT_COUNT:
+        commits_score = 1.0
+        notes.append(f"Moderate commit history: {commits} commits")
+        recommendations.append("Make more commits to document project evolution (+1.0 point)")
+    elif commits > 0:
+        commits_score = 0.0
+        notes.append(f"Limited commit history: {commits} commits")
+        recommendations.append("Make more commits (target: >10) (+2.0 points)")
+    else:
+        commits_score = 0.0
+        recommendations.append("Initialize git repository and make regular commits (+2.0 points)")
+
+    meaningful_score = 0.0
+    if commits:
+        percent = history['meaningful_percent']
+        if percent >= 60:
+            meaningful_score = 2.0
+            notes.append(f"Excellent commit message quality ({percent:.0f}% meaningful)")
+        elif percent >= 40:
+            meaningful_score = 1.0
+            notes.append(f"Good commit message quality ({percent:.0f}% meaningful)")
+            recommendations.append("Improve commit message quality (+1.0 point)")
+        else:
+            notes.append(f"Poor commit message quality ({percent:.0f}% meaningful)")
+            recommendations.append("Write meaningful commit messages explaining changes (+2.0 points)")
+    else:
+        recommendations.append("Write meaningful commit messages explaining changes (+2.0 points)")
+
+    prompt_docs = [f for f in index.with_ext('.md', '.txt') if name_has(f, ('prompt',))]
+    if prompt_docs:
+        prompt_book_score = 5.0
+        notes.append(f"Prompt documentation found: {prompt_docs[0].path}")
+    else:
+        prompt_book_score = 0.0
+        recommendations.append("Create PROMPT_BOOK.md to document AI interactions (+5.0 points)")
+
+    # Distinct names: a clone's main and origin/main are one branch
+    branching_score = 1.0 if len(branches) > 1 else 0.0
+    if branching_score:
+        notes.append(f"Branching strategy in use ({len(branches)} branches)")
+    else:
+        recommendations.append("Develop features on separate branches (+1.0 point)")
+
+    fields = [
+        ('commits_score', commits_score),
+        ('meaningful_score', meaningful_score),
+        ('prompt_book_score', prompt_book_score),
+        ('branching_score', branching_score),
+    ]
+    return _result('version_management', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 8. Costs & pricing
+# ---------------------------------------------------------------------------
+
+COST_TERMS = ('cost', 'costs', 'pricing', 'price', 'prices', 'budget', 'expense', 'billing')
+DOLLAR_AMOUNT = phrase('$', is_number)
+COST_HEADING_KEYWORDS = ('cost', 'pricing', 'budget')
+API_PRICING_PHRASES = (
+    phrase('per', ('1k', '1m', '1000', '1,000', 'million', 'thousand'), 'tokens'),
+    phrase('$', is_number, '/', ('1k', '1m', 'm')),
+    phrase('token', starts_with('pric')),
+)
+COST_CODE_PATTERN = re.compile(r'def\s+\w*(?:cost|price|budget)\w*|\w*(?:cost|price)\w*\s*[+*]?=(?!=)', re.I)
+
+
+def score_costs_pricing(index):
+    """Cost analysis document (5), amount of cost discussion (3), budget tracking (2)."""
+    notes = []
+    recommendations = []
+
+    docs = doc_index_for(index)
+    mention_counts = docs.term_counts(*COST_TERMS)
+    for doc_id, count in docs.phrase_counts(DOLLAR_AMOUNT).items():
+        mention_counts[doc_id] = mention_counts.get(doc_id, 0) + count
+    mentions = sum(mention_counts.values())
+    mention_files = len(mention_counts)
+
+    if any(docs.phrase_counts(query) for query in API_PRICING_PHRASES):
+        notes.append("API pricing analysis found (excellent for LLM projects)")
+
+    cost_docs = [f for f in index if f.ext in ('.md', '.xlsx', '.csv', '.json', '.pdf')
+                 and name_has(f, ('cost', 'pricing', 'budget'))]
+    detailed_docs = [docs.docs[doc_id] for doc_id in docs.heading_docs(COST_HEADING_KEYWORDS, exts=('.md',))]
+
+    if len(cost_docs) > 1:
+        cost_analysis_score = 5.0
+        notes.append(f"Multiple cost documents found ({len(cost_docs)}): {_listing(cost_docs, 2)}")
+    elif cost_docs:
+        cost_analysis_score = 5.0
+        notes.append(f"Cost analysis document found: {cost_docs[0].path}")
+    elif detailed_docs:
+        cost_analysis_score = 3.0
+        notes.append(f"Detailed cost analysis found in: {_listing(detailed_docs, 2)}")
+        recommendations.append("Create dedicated cost analysis document (e.g., COSTS.md) for better organization (+2.0 points)")
+    elif mentions >= 10:
+        cost_analysis_score = 2.0
+        notes.append(f"Substantial cost discussion found ({mentions} mentions)")
+        recommendations.append("Consolidate into dedicated cost analysis document (+3.0 points)")
+    else:
+        cost_analysis_score = 0.0
+        recommendations.append("Create cost analysis document (e.g., COSTS.md, budget.xlsx) (+5.0 points)")
+
+    if mentions >= 20:
+        cost_mentions_score = 3.0
+        notes.append(f"Comprehensive cost documentation ({mentions} mentions in {mention_files} files)")
+    elif mentions >= 10:
+        cost_mentions_score = 2.0
+        notes.append(f"Good cost documentation ({mentions} mentions in {mention_files} files)")
+        recommendations.append("Add more detailed cost analysis (+1.0 point)")
+    elif mentions >= 6:
+        cost_mentions_score = 1.5
+        notes.append(f"Moderate cost documentation ({mentions} mentions)")
+        recommendations.append("Expand cost documentation with more details (+1.5 points)")
+    elif mentions > 0:
+        cost_mentions_score = 0.5
+        notes.append(f"Limited cost documentation ({mentions} mentions)")
+        recommendations.append("Add detailed cost analysis (+2.5 points)")
+    else:
+        cost_mentions_score = 0.0
+        recommendations.append("Document costs, pricing, and budget considerations (+3.0 points)")
+
+    budget_docs = [f for f in cost_docs if name_has(f, ('budget',))]
+    if budget_docs:
+        budget_tracking_score = 2.0
+        notes.append(f"Budget tracking document found: {budget_docs[0].path}")
+    elif any(COST_CODE_PATTERN.search(file_text(f)) for f in _code(index)):
+        budget_tracking_score = 1.5
+        notes.append("Cost calculations found in code")
+        recommendations.append("Create dedicated budget tracking document (+0.5 points)")
+    elif docs.prefix_docs('budget'):
+        budget_tracking_score = 1.0
+        notes.append("Some budget information in documentation")
+        recommendations.append("Create dedicated budget tracking system (+1.0 point)")
+    else:
+        budget_tracking_score = 0.0
+        recommendations.append("Create budget tracking system/document (+2.0 points)")
+
+    fields = [
+        ('cost_analysis_score', cost_analysis_score),
+        ('cost_mentions_score', cost_mentions_score),
+        ('budget_tracking_score', budget_tracking_score),
+    ]
+    return _result('costs_pricing', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 9. Extensibility
+# ---------------------------------------------------------------------------
+
+PLUGIN_DIRS = ('plugins', 'plugin', 'extensions', 'addons', 'hooks')
+PLUGIN_CODE_PATTERN = re.compile(
+    r'class\s+\w*Plugin\w*|register_plugin|PluginManager|entry_points|importlib\.import_module|pluggy')
+INTERFACE_CODE_PATTERN = re.compile(
+    r'\bABC\b|@abstractmethod|\bProtocol\b|^\s*(?:export\s+)?(?:interface|abstract\s+class)\s+\w+', re.MULTILINE)
+EXTENSION_DOC_KEYWORDS = ('extensib', 'extend', 'plugin', 'developer_guide', 'developer-guide', 'customiz')
+EXTENSION_HEADING_PATTERN = re.compile(r'extensib|extend|customi[sz]|plugin', re.I)
+EXTENSION_TEXT_PATTERN = re.compile(r'\bextend\w*|customi[sz]\w*|add(?:ing)?\s+a\s+new\s+\w+', re.I)
+# Plugin patterns import_graph.py reports that make up an extension mechanism
+PLUGIN_MECHANISMS = ('entry_points', 'registry', 'register_decorator', 'subclass_hook', 'subclass_discovery',
+                     'dynamic_import')
+
+
+def _count_lines(repo_file):
+    text = file_text(repo_file)
+    return text.count('\n') + (1 if text and not text.endswith('\n') else 0)
+
+
+def score_extensibility(index):
+    """Plugin system (3), modular file sizes (3), interfaces (2), extension docs (2)."""
+    notes = []
+    recommendations = []
+    code = [f for f in _code(index) if not is_test_file(f)]
+    graph = build_import_graph(index, workers=1)
+    code_paths = {f.path for f in code}
+    py_modules = {path: name for name, path in graph['modules'].items() if path in code_paths}
+    mechanisms = {}
+    for name in py_modules.values():
+        kinds = [kind for kind in graph['plugins'].get(name, ()) if kind in PLUGIN_MECHANISMS]
+        if kinds:
+            mechanisms[name] = kinds
+
+    # Python modules are judged from their syntax tree, other languages by pattern
+    plugin_files = [f for f in code if any(p.lower() in PLUGIN_DIRS for p in f.parts[:-1])
+                    or (f.path in py_modules and py_modules[f.path] in mechanisms)
+                    or (f.ext != '.py' and PLUGIN_CODE_PATTERN.search(file_text(f)))]
+    docs_mention_plugins = any('plugin' in file_text(d).lower() for d in _docs(index))
+    if plugin_files:
+        plugin_score = 3.0
+        location = plugin_files[0].path.rsplit('/', 1)[0] if '/' in plugin_files[0].path else '.'
+        notes.append(f"Plugin/extension system found: {location}")
+        for name, kinds in sorted(mechanisms.items())[:3]:
+            notes.append(f"Extension mechanism in {name}: {', '.join(kinds)}")
+    elif docs_mention_plugins:
+        plugin_score = 1.0
+        notes.append("Plugin architecture documented but not implemented")
+        recommendations.append("Implement actual plugin/extension system (+2.0 points)")
+    else:
+        plugin_score = 0.0
+        recommendations.append("Create plugin/extension system for modularity (+3.0 points)")
+
+    avg_lines = sum(_count_lines(f) for f in code) / len(code) if code else 0
+    if avg_lines <= 150:
+        modular_score = 3.0
+        notes.append(f"Excellent modular structure (avg {avg_lines:.0f} lines/file)")
+    elif avg_lines <= 200:
+        modular_score = 2.0
+        notes.append(f"Good modular structure (avg {avg_lines:.0f} lines/file)")
+        recommendations.append("Further refactor to smaller modules (+1.0 point)")
+    elif avg_lines <= 300:
+        modular_score = 1.0
+        notes.append(f"Somewhat modular (avg {avg_lines:.0f} lines/file)")
+        recommendations.append("Break down large files into smaller modules (+2.0 points)")
+    else:
+        modular_score = 0.0
+        notes.append(f"Large files detected (avg {avg_lines:.0f} lines/file)")
+        recommendations.append("Refactor into modular structure with smaller files (+3.0 points)")
+
+    if py_modules:
+        structure = summarize_graph(graph)
+        notes.append(f"Import graph: {structure['modules']} modules, {structure['dependencies']} internal "
+                     f"dependencies (max fan-in {structure['max_fan_in'][1]}: {structure['max_fan_in'][0]})")
+    cycles = [component for component in graph['cycles'] if any(name in py_modules.values() for name in component)]
+    if cycles and modular_score > 0:
+        modular_score -= 1.0
+        notes.append(f"{len(cycles)} import cycle(s): {' <-> '.join(cycles[0][:4])}")
+        recommendations.append("Break circular imports between modules (+1.0 point)")
+
+    interface_files = [f for f in code if name_has(f, ('interface', 'abstract', 'protocol', 'base'))
+                       or (f.path in py_modules and py_modules[f.path] in graph['interfaces'])
+                       or (f.ext != '.py' and INTERFACE_CODE_PATTERN.search(file_text(f)))]
+    if len(interface_files) >= 3:
+        interface_score = 2.0
+        notes.append(f"Well-defined interfaces/APIs ({len(interface_files)} interface files)")
+        if graph['implementations']:
+            notes.append(f"{graph['implementations']} class(es) implement the repository's interfaces")
+    elif interface_files:
+        interface_score = 1.0
+        notes.append(f"Some interfaces defined ({len(interface_files)} interface files)")
+        recommendations.append("Define more interfaces for better extensibility (+1.0 point)")
+    else:
+        interface_score = 0.0
+        recommendations.append("Define interfaces/APIs for extensibility (+2.0 points)")
+
+    readme_text = file_text(find_readme(index))
+    extension_docs = [d for d in _docs(index) if not _is_readme(d) and name_has(d, EXTENSION_DOC_KEYWORDS)]
+    readme_section = any(EXTENSION_HEADING_PATTERN.search(h) for h in headings(readme_text))
+    if extension_docs:
+        extension_docs_score = 2.0
+        notes.append(f"Comprehensive extensibility documentation: {_listing(extension_docs, 2)}")
+    elif readme_section and '```' in readme_text:
+        extension_docs_score = 1.5
+        notes.append("Good extensibility documentation: README.md (extensibility section)")
+        recommendations.append("Expand extensibility docs with more examples (+0.5 points)")
+    elif readme_section:
+        extension_docs_score = 1.0
+        notes.append("Basic extensibility documentation found: README.md (extensibility section)")
+        recommendations.append("Add extension points and code examples (+1.0 point)")
+    elif any(EXTENSION_TEXT_PATTERN.search(file_text(d)) for d in _docs(index)):
+        extension_docs_score = 1.0
+        notes.append("Partial extension documentation")
+        recommendations.append("Document how to extend/customize the system (+1.0 point)")
+    elif plugin_files or interface_files:
+        extension_docs_score = 0.5
+        notes.append("Partial extension support in code")
+        recommendations.append("Document how to extend/customize the system (+1.5 points)")
+    else:
+        extension_docs_score = 0.0
+        recommendations.append("Document extension/customization approach (+2.0 points)")
+
+    fields = [
+        ('plugin_score', plugin_score),
+        ('modular_score', modular_score),
+        ('interface_score', interface_score),
+        ('extension_docs_score', extension_docs_score),
+    ]
+    return _result('extensibility', fields, notes, recommendations)
+
+
+# ---------------------------------------------------------------------------
+# 10. Quality standards
+# ---------------------------------------------------------------------------
+
+STYLE_GUIDE_KEYWORDS = ('contributing', 'code_of_conduct', 'style_guide', 'styleguide', 'coding_standards',
+                        'code_style', 'style-guide', 'coding-standards')
+QUALITY_HEADING_PATTERN = re.compile(r'quality|style|standard|lint|convention', re.I)
+
+
+def score_quality_standards(index):
+    """Linting (2), CI/CD (3), style guide (3), pre-commit (1), several quality tools (1)."""
+    notes = []
+    recommendations = []
+
+    tools = detect_tools(index)
+
+    if tools['lint']:
+        linting_score = 2.0
+        notes.append(f"Linting configured: {describe_tools(tools['lint'], 2)}")
+    else:
+        linting_score = 0.0
+        recommendations.append("Configure linting tools (pylint, eslint, etc.) (+2.0 points)")
+
+    if tools['ci']:
+        ci_score = 3.0
+        ci_files = [path for paths in tools['ci'].values() for path in paths]
+        notes.append(f"CI/CD pipeline configured: {', '.join(sorted(ci_files)[:3])}")
+    else:
+        ci_score = 0.0
+        recommendations.append("Set up CI/CD pipeline (GitHub Actions, GitLab CI, etc.) (+3.0 points)")
+
+    style_docs = [d for d in _docs(index) if name_has(d, STYLE_GUIDE_KEYWORDS)]
+    if style_docs:
+        style_score = 3.0
+        notes.append(f"Code style guide found: {_listing(style_docs, 2)}")
+    elif any(QUALITY_HEADING_PATTERN.search(h) for h in headings(file_text(find_readme(index)))):
+        style_score = 1.5
+        notes.append("Code quality information in README: README.md (quality standards section)")
+        recommendations.append("Create dedicated style guide or CONTRIBUTING.md (+1.5 points)")
+    else:
+        style_score = 0.0
+        recommendations.append("Create code style guide or CONTRIBUTING.md (+3.0 points)")
+
+    if tools['pre_commit']:
+        pre_commit_score = 1.0
+        hooks = f" ({', '.join(tools['hooks'][:5])})" if tools['hooks'] else ""
+        notes.append(f"Pre-commit hooks configured: {', '.join(sorted(tools['pre_commit']))}{hooks}")
+    else:
+        pre_commit_score = 0.0
+        recommendations.append("Set up pre-commit hooks for automatic quality checks (+1.0 point)")
+
+    quality_tools = set(tools['lint']) | set(tools['quality'])
+    if len(quality_tools) >= 2:
+        quality_tools_score = 1.0
+        notes.append(f"Multiple quality tools configured: {', '.join(sorted(quality_tools))}")
+    elif quality_tools:
+        quality_tools_score = 0.0
+        recommendations.append("Add more quality tools (+1.0 point)")
+    else:
+        quality_tools_score = 0.0
+        recommendations.append("Configure quality assurance tools (+1.0 point)")
+
+    fields = [
+        ('linting_score', linting_score),
+        ('ci_score', ci_score),
+        ('style_score', style_score),
+        ('pre_commit_score', pre_commit_score),
+        ('quality_tools_score', quality_tools_score),
+    ]
+    return _result('quality_standards', fields, notes, recommendations)
+
+
+# Canonical skill order used in the assessment JSON
+SKILL_SCORERS = {
+    'project_planning': score_project_planning,
+    'code_documentation': score_code_documentation,
+    'config_security': score_config_security,
+    'testing_quality': score_testing_quality,
+    'research_analysis': score_research_analysis,
+    'ui_ux': score_ui_ux,
+    'version_management': score_version_management,
+    'costs_pricing': score_costs_pricing,
+    'extensibility': score_extensibility,
+    'quality_standards': score_quality_standards,
+}
+
+# Bump a skill's version whenever its rubric or wording changes: cached
+# results (result_cache.py) are reused only for an unchanged version
+SKILL_VERSIONS = {
+    'project_planning': "3",
+    'code_documentation': "1",
+    'config_security': "1",
+    'testing_quality': "2",
+    'research_analysis': "2",
+    'ui_ux': "2",
+    'version_management': "2",
+    'costs_pricing': "2",
+    'extensibility': "3",
+    'quality_standards': "3",
+}
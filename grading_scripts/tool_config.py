@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Quality tool detection for the quality_standards skill.
+
+Linters, formatters, CI pipelines and pre-commit hooks are recognized from
+a static signature table: file names (.flake8, ruff.toml,
+.pre-commit-config.yaml, ...), directories (.github/workflows, .husky),
+sections of shared config files (pyproject.toml [tool.*], setup.cfg and
+tox.ini sections) and package.json dependencies and scripts. The repository
+index is walked once with dict lookups per file; a config file's contents
+are read and parsed only when its name is one of the shared config
+candidates, so detection costs O(files) with a small constant. Each tool
+has a single category (TOOL_CATEGORIES), so mypy or black count the same
+whether they are configured in their own file or in pyproject.toml.
+
+Usage:
+    python grading_scripts/tool_config.py path/to/repo
+"""
+import json
+import re
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: fall back to scanning section headers
+    tomllib = None
+
+LINT = 'lint'
+CI = 'ci'
+PRE_COMMIT = 'pre_commit'
+QUALITY = 'quality'
+CATEGORIES = (LINT, CI, PRE_COMMIT, QUALITY)
+
+# Every tool has exactly one category, whichever file configures it
+TOOL_CATEGORIES = {
+    'flake8': LINT, 'pylint': LINT, 'ruff': LINT, 'pycodestyle': LINT, 'pydocstyle': LINT,
+    'eslint': LINT, 'tslint': LINT, 'stylelint': LINT, 'biome': LINT,
+    'black': QUALITY, 'isort': QUALITY, 'prettier': QUALITY, 'editorconfig': QUALITY,
+    'mypy': QUALITY, 'pyright': QUALITY, 'coverage': QUALITY, 'bandit': QUALITY,
+    'pre-commit': PRE_COMMIT, 'husky': PRE_COMMIT, 'lint-staged': PRE_COMMIT,
+    'github-actions': CI, 'gitlab-ci': CI, 'jenkins': CI, 'azure-pipelines': CI, 'travis': CI,
+    'bitbucket-pipelines': CI, 'circleci': CI,
+}
+
+# Lower-case file name -> tool; matched at any depth
+FILE_SIGNATURES = {
+    '.flake8': 'flake8',
+    '.pylintrc': 'pylint',
+    'pylintrc': 'pylint',
+    'ruff.toml': 'ruff',
+    '.ruff.toml': 'ruff',
+    'tslint.json': 'tslint',
+    '.eslintrc': 'eslint',
+    '.eslintrc.js': 'eslint',
+    '.eslintrc.cjs': 'eslint',
+    '.eslintrc.json': 'eslint',
+    '.eslintrc.yml': 'eslint',
+    '.eslintrc.yaml': 'eslint',
+    'eslint.config.js': 'eslint',
+    'eslint.config.mjs': 'eslint',
+    'eslint.config.cjs': 'eslint',
+    '.stylelintrc': 'stylelint',
+    '.stylelintrc.json': 'stylelint',
+    'biome.json': 'biome',
+    '.prettierrc': 'prettier',
+    '.prettierrc.json': 'prettier',
+    '.prettierrc.js': 'prettier',
+    'prettier.config.js': 'prettier',
+    '.editorconfig': 'editorconfig',
+    'mypy.ini': 'mypy',
+    '.mypy.ini': 'mypy',
+    '.coveragerc': 'coverage',
+    '.bandit': 'bandit',
+    '.pre-commit-config.yaml': 'pre-commit',
+    '.pre-commit-config.yml': 'pre-commit',
+    '.gitlab-ci.yml': 'gitlab-ci',
+    'jenkinsfile': 'jenkins',
+    'azure-pipelines.yml': 'azure-pipelines',
+    '.travis.yml': 'travis',
+    'bitbucket-pipelines.yml': 'bitbucket-pipelines',
+}
+
+# Lower-case relative path -> tool; matched from the repository root
+PATH_SIGNATURES = {
+    '.circleci/config.yml': 'circleci',
+}
+
+# Lower-case directory -> (tool, file extensions or None for any file)
+DIRECTORY_SIGNATURES = {
+    '.github/workflows': ('github-actions', ('.yml', '.yaml')),
+    '.husky': ('husky', None),
+}
+
+# Tool sections of pyproject.toml ([tool.X]), setup.cfg and tox.ini ([X] / [X:...])
+SECTION_SIGNATURES = (
+    'ruff', 'pylint', 'flake8', 'black', 'isort', 'mypy', 'pycodestyle', 'pydocstyle',
+    'coverage', 'bandit', 'pyright',
+)
+
+# package.json dependency names and script commands -> tool
+PACKAGE_SIGNATURES = {
+    'eslint': 'eslint',
+    'stylelint': 'stylelint',
+    'tslint': 'tslint',
+    '@biomejs/biome': 'biome',
+    'prettier': 'prettier',
+    'husky': 'husky',
+    'lint-staged': 'lint-staged',
+}
+
+# Config files read only when present; larger ones are ignored
+CONFIG_FILES = ('pyproject.toml', 'setup.cfg', 'tox.ini', 'package.json')
+MAX_CONFIG_SIZE = 1 << 20
+
+SECTION_HEADER = re.compile(r'^\s*\[([^\]\n]+)\]', re.MULTILINE)
+PRE_COMMIT_HOOK = re.compile(r'^\s*-\s*id:\s*["\']?([\w.-]+)', re.MULTILINE)
+SCRIPT_WORD = re.compile(r'[@\w][\w@/.-]*')
+
+
+def _toml_sections(text):
+    """Names X of the [tool.X] tables of a pyproject.toml."""
+    if tomllib is not None:
+        try:
+            return list(tomllib.loads(text).get('tool', {}))
+        except (tomllib.TOMLDecodeError, AttributeError):
+            pass
+    return [header.split('.')[1] for header in SECTION_HEADER.findall(text)
+            if header.startswith('tool.') and '.' in header]
+
+
+def _cfg_sections(text):
+    """Tool names of the [X], [X:...] and [X-...] sections of an INI file."""
+    return [re.split(r'[:.\-\s]', header.strip(), 1)[0].lower() for header in SECTION_HEADER.findall(text)]
+
+
+def _package_tools(text):
+    """Tools declared in package.json dependencies or used by its scripts."""
+    try:
+        package = json.loads(text)
+    except ValueError:
+        return []
+    if not isinstance(package, dict):
+        return []
+
+    names = set()
+    for key in ('dependencies', 'devDependencies'):
+        if isinstance(package.get(key), dict):
+            names.update(package[key])
+    if isinstance(package.get('scripts'), dict):
+        for command in package['scripts'].values():
+            if isinstance(command, str):
+                names.update(SCRIPT_WORD.findall(command))
+    return [PACKAGE_SIGNATURES[name] for name in sorted(names) if name in PACKAGE_SIGNATURES]
+
+
+def _config_tools(repo_file):
+    """Tools found inside one shared config file."""
+    if repo_file.size > MAX_CONFIG_SIZE:
+        return []
+    text = repo_file.read_text()
+    name = repo_file.name.lower()
+    if name == 'package.json':
+        return _package_tools(text)
+    sections = _toml_sections(text) if name == 'pyproject.toml' else _cfg_sections(text)
+    return [section for section in dict.fromkeys(sections) if section in SECTION_SIGNATURES]
+
+
+def detect_tools(index):
+    """
+    Detect quality tooling in a RepoIndex. Returns
+    {category: {tool: [paths where it is configured]}} for the categories
+    lint, ci, pre_commit and quality, plus 'hooks': the pre-commit hook ids.
+    """
+    found = {category: {} for category in CATEGORIES}
+    hooks = []
+
+    for repo_file in index:
+        name = repo_file.name.lower()
+        path = repo_file.path.lower()
+        directory = path.rsplit('/', 1)[0] if '/' in path else ''
+
+        matches = []
+        if name in FILE_SIGNATURES:
+            matches.append(FILE_SIGNATURES[name])
+        if path in PATH_SIGNATURES:
+            matches.append(PATH_SIGNATURES[path])
+        if directory in DIRECTORY_SIGNATURES:
+            tool, exts = DIRECTORY_SIGNATURES[directory]
+            if exts is None or repo_file.ext in exts:
+                matches.append(tool)
+        if name in CONFIG_FILES:
+            matches.extend(_config_tools(repo_file))
+
+        for tool in matches:
+            found[TOOL_CATEGORIES[tool]].setdefault(tool, []).append(repo_file.path)
+        if name in ('.pre-commit-config.yaml', '.pre-commit-config.yml') and repo_file.size <= MAX_CONFIG_SIZE:
+            hooks.extend(PRE_COMMIT_HOOK.findall(repo_file.read_text()))
+
+    found['hooks'] = list(dict.fromkeys(hooks))
+    return found
+
+
+def describe(tools, limit=3):
+    """'ruff (pyproject.toml), flake8 (.flake8)' for one category of detect_tools()."""
+    return ", ".join(f"{tool} ({paths[0]})" for tool, paths in sorted(tools.items())[:limit])
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from repo_index import build_repo_index
+
+    parser = argparse.ArgumentParser(description="List the quality tooling configured in a repository")
+    parser.add_argument("repository", help="Path to the repository")
+    args = parser.parse_args()
+
+    index = build_repo_index(args.repository)
+    start = time.perf_counter()
+    tools = detect_tools(index)
+    elapsed = time.perf_counter() - start
+
+    for category in CATEGORIES:
+        print(f"{category}: {describe(tools[category], limit=20) or 'none'}")
+    if tools['hooks']:
+        print(f"pre-commit hooks: {', '.join(tools['hooks'])}")
+    print(f"\n{len(index)} files scanned in {elapsed * 1000:.1f} ms")
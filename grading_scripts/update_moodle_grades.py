@@ -10,38 +10,19 @@ import json
 import math
 from pathlib import Path
 
+from submission_info_index import get_submission_info
+
 def get_self_submitted_grade(student_id, submissions_dir):
     """Get self-submitted grade from submission_info.xlsx"""
-    student_folder = submissions_dir / f"Participant_{student_id}_assignsubmission_file"
-    submission_info = student_folder / "submission_info.xlsx"
-
-    if not submission_info.exists():
+    # Value next to a "Grade" label, read from the cached submission_info index
+    info = get_submission_info(student_id, submissions_dir)
+    if not info:
         return None
 
-    try:
-        wb = openpyxl.load_workbook(submission_info)
-        ws = wb.active
-
-        # Find the self-submitted grade (usually in a cell labeled "Grade" or similar)
-        for row in ws.iter_rows(min_row=1, max_row=10):
-            for idx, cell in enumerate(row):
-                if cell.value and "grade" in str(cell.value).lower():
-                    # Grade is likely in the next cell or same row
-                    if idx + 1 < len(row):
-                        grade_value = row[idx + 1].value
-                        if grade_value and isinstance(grade_value, (int, float)):
-                            return float(grade_value)
-
-        # Alternative: check specific cells
-        for cell_ref in ['B2', 'C2', 'D2', 'B3', 'C3']:
-            value = ws[cell_ref].value
-            if value and isinstance(value, (int, float)) and 0 <= value <= 100:
-                return float(value)
-
-    except Exception as e:
-        print(f"  Warning: Could not read self-grade for {student_id}: {e}")
-
-    return None
+    if info['error']:
+        print(f"  Warning: Could not read self-grade for {student_id}: {info['error']}")
+
+    return info['labeled_grade']
 
 def get_assessment_data(student_id, assessments_dir):
     """Get assessment data from JSON"""
@@ -12,33 +12,23 @@ from pathlib import Path
 import sys
 import re
 
+from submission_info_index import get_submission_info
+
 sys.stdout.reconfigure(encoding='utf-8')
 
+# Opening message for column H
+OPENING_MESSAGE = ("Thank you for your submission. For this first assignment I have decided to take "
+                   "your self-submitted grade as your grade for this assignment since many students "
+                   "over-estimated their grades, and suffered severe penalties. You can see the grade "
+                   "you would have gotten on this assignment in the next column. Do not let this "
+                   "discourage you, you have a lot of potential, and can perform strongly in the "
+                   "future with more effort.\n\n")
+
 def get_self_submitted_grade(student_id, submissions_dir):
     """Get self-submitted grade from submission_info.xlsx"""
-    student_folder = submissions_dir / f"Participant_{student_id}_assignsubmission_file"
-    submission_info = student_folder / "submission_info.xlsx"
-
-    if not submission_info.exists():
-        return None
-
-    try:
-        wb = openpyxl.load_workbook(submission_info)
-        ws = wb.active
-
-        # Check multiple possible locations for grade
-        # Often in B2, C2, or nearby
-        for row in range(1, 15):
-            for col in ['A', 'B', 'C', 'D', 'E']:
-                cell_value = ws[f'{col}{row}'].value
-                if cell_value and isinstance(cell_value, (int, float)):
-                    if 0 <= cell_value <= 100:
-                        return float(cell_value)
-
-    except Exception as e:
-        pass
-
-    return None
+    # First number 0-100 in A1:E14, read from the cached submission_info index
+    info = get_submission_info(student_id, submissions_dir)
+    return info['scan_grade'] if info else None
 
 def get_assessment_data(student_id, assessments_dir):
     """Get assessment data from JSON"""
@@ -112,14 +102,6 @@ def update_assignment1_grades():
     submissions_dir = Path("WorkSubmissions01")
     assessments_dir = Path("assessments_tier2_assignment1")
 
-    # Opening message for column H
-    opening_message = ("Thank you for your submission. For this first assignment I have decided to take "
-                      "your self-submitted grade as your grade for this assignment since many students "
-                      "over-estimated their grades, and suffered severe penalties. You can see the grade "
-                      "you would have gotten on this assignment in the next column. Do not let this "
-                      "discourage you, you have a lot of potential, and can perform strongly in the "
-                      "future with more effort.\n\n")
-
     print("\nProcessing students...")
 
     updates = {
@@ -175,7 +157,7 @@ def update_assignment1_grades():
 
             # Column H: Feedback with opening message
             feedback_text = generate_feedback_text(assessment)
-            full_feedback = opening_message + feedback_text
+            full_feedback = OPENING_MESSAGE + feedback_text
             ws[f'H{row_idx}'] = full_feedback
             updates['feedback_added'] += 1
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Single-pass Moodle grade update for Assignment 1.
+
+Replaces running update_moodle_grades_assignment1.py followed by
+calculate_weighted_grades_assignment1.py. Every submission_info.xlsx and
+assessment JSON is read at most once, and the Moodle workbook is loaded and
+saved once:
+1. Column C: self-submitted grade (calculated grade if no self-grade found)
+2. Column G: date the grade was last modified (the assessment date)
+3. Column H: opening message + detailed feedback text
+4. Column I: weighted grade with the exponential penalty (rounded up)
+
+The per-student values come from moodle_csv.merge_student() and
+moodle_csv.weighted_calculations(), the same functions that fill the Moodle
+CSV export.
+"""
+import openpyxl
+import json
+from pathlib import Path
+
+from calculate_weighted_grades_assignment1 import print_penalty_statistics
+from moodle_csv import merge_student, parse_student_id, weighted_calculations
+from update_moodle_grades_assignment1 import get_self_submitted_grade
+
+def build_student_index(ws):
+    """Map each student ID to its worksheet row (header row 1 is skipped)."""
+    index = {}
+
+    for row_idx, (identifier,) in enumerate(
+            ws.iter_rows(min_row=2, max_col=1, values_only=True), start=2):
+        if not identifier:
+            continue
+
+        student_id = parse_student_id(identifier)
+        if not student_id:
+            print(f"Row {row_idx}: Could not extract student ID from {identifier}")
+            continue
+
+        index[student_id] = row_idx
+
+    return index
+
+def load_student_records(student_ids, submissions_dir, assessments_dir):
+    """Read each student's self-grade and assessment JSON exactly once."""
+    records = {}
+
+    for student_id in student_ids:
+        json_file = assessments_dir / f"tier2_assessment_{student_id}.json"
+        assessment = None
+        if json_file.exists():
+            with open(json_file, 'r', encoding='utf-8') as f:
+                assessment = json.load(f)
+
+        records[student_id] = {
+            'self_grade': get_self_submitted_grade(student_id, submissions_dir),
+            'assessment': assessment,
+        }
+
+    return records
+
+def update_assignment1_moodle(excel_path, output_path, submissions_dir, assessments_dir):
+    """Fill columns C/G/H/I of the Assignment 1 Moodle workbook in one save."""
+
+    print("=" * 80)
+    print("UPDATING ASSIGNMENT 1 MOODLE GRADES (SINGLE PASS)")
+    print("=" * 80)
+
+    wb = openpyxl.load_workbook(excel_path)
+    ws = wb.active
+
+    student_index = build_student_index(ws)
+    records = load_student_records(student_index, submissions_dir, assessments_dir)
+
+    print(f"\nProcessing {len(student_index)} students...")
+
+    updates = {
+        'processed': len(student_index),
+        'self_grades_found': 0,
+        'self_grades_missing': 0,
+        'feedback_added': 0
+    }
+    graded = []
+
+    for student_id, row_idx in student_index.items():
+        record = records[student_id]
+        assessment = record['assessment']
+
+        if not assessment:
+            print(f"Row {row_idx}: Student {student_id} - No assessment data found")
+            continue
+
+        # Column C: self-grade, or the calculated grade if none was submitted
+        # Column G: date the grade was last modified
+        # Column H: Feedback with opening message
+        grade_used, assessment_date, feedback = merge_student(
+            assessment, record['self_grade'], True, updates)
+        ws[f'C{row_idx}'] = grade_used
+        if assessment_date is not None:
+            ws[f'G{row_idx}'] = assessment_date
+        ws[f'H{row_idx}'] = feedback
+
+        graded.append((student_id, row_idx, grade_used, assessment.get('total_score', 0)))
+
+    # Column I: weighted grade the student would have gotten (rounded up),
+    # computed for the whole cohort in one batch
+    calculations = weighted_calculations(graded)
+    for (_, row_idx, _, _), calc in zip(graded, calculations):
+        ws[f'I{row_idx}'] = calc['weighted_display']
+
+    ws['I1'] = 'Calculated Grade (Tier 2)'
+
+    wb.save(output_path)
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Students processed: {updates['processed']}")
+    print(f"Self-grades found and used: {updates['self_grades_found']}")
+    print(f"Self-grades missing (used calculated): {updates['self_grades_missing']}")
+    print(f"Feedback messages added: {updates['feedback_added']}")
+
+    print_penalty_statistics(calculations)
+
+    print(f"\nFile saved: {output_path}")
+    print("=" * 80)
+
+    return calculations
+
+if __name__ == '__main__':
+    update_assignment1_moodle(
+        Path("StudentGradesMoodleFormat/Assignment1_Moodle_Grades.xlsx"),
+        Path("StudentGradesMoodleFormat/Assignment1_Moodle_Grades_FINAL.xlsx"),
+        Path("WorkSubmissions01"),
+        Path("assessments_tier2_assignment1"),
+    )
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Exponential self-grading penalty formula, scalar and batch versions.
+
+calculate_weighted_grades() evaluates the formula over whole arrays of self
+grades and base grades at once (and over arrays of candidate A/B constants,
+which broadcast against the grades). Results are bit-for-bit identical to
+calculate_weighted_grade(): round(weighted, 2), then math.ceil for display.
+
+NumPy is optional; without it the batch API falls back to a plain loop and
+only accepts scalar constants.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Constants from weighted-grade-calculator skill
+SCALE_COEFFICIENT_A = 0.086603
+SCALE_EXPONENT_B = 0.027465
+
+# Upper edges of the penalty buckets (points); the last bucket is open-ended
+PENALTY_BUCKET_EDGES = (0.1, 5, 15)
+PENALTY_BUCKET_LABELS = [
+    "No penalty (accurate/humble)",
+    "Small penalty (0-5 points)",
+    "Medium penalty (5-15 points)",
+    "Large penalty (>15 points)",
+]
+
+# round(x, 2) is only ambiguous when x * 100 sits this close to a .5 boundary
+_ROUNDING_TOLERANCE = 1e-6
+
+
+def calculate_weighted_grade(self_grade, base_grade,
+                             coefficient_a=SCALE_COEFFICIENT_A, exponent_b=SCALE_EXPONENT_B):
+    """
+    Calculate weighted grade using exponential penalty formula.
+
+    Formula:
+    1. scale = 0.086603 × e^(0.027465 × self_grade)
+    2. if self_grade > base_grade:
+           penalty = (self_grade - base_grade) × scale
+           weighted = max(0, base_grade - penalty)
+       else:
+           weighted = base_grade  # No penalty for humility
+    """
+    # Calculate scale multiplier
+    scale = coefficient_a * math.exp(exponent_b * self_grade)
+
+    # Apply penalty only if overestimated
+    if self_grade > base_grade:
+        difference = self_grade - base_grade
+        penalty = difference * scale
+        weighted_grade = max(0, base_grade - penalty)
+    else:
+        # Humble or accurate - no penalty
+        weighted_grade = base_grade
+
+    return round(weighted_grade, 2)
+
+
+def penalty_bucket(penalty):
+    """Index into PENALTY_BUCKET_LABELS for a single penalty."""
+    for idx, edge in enumerate(PENALTY_BUCKET_EDGES):
+        if penalty <= edge:
+            return idx
+    return len(PENALTY_BUCKET_EDGES)
+
+
+def penalty_histogram(penalties):
+    """
+    Count penalties per bucket. Works along the last axis, so a 2-D array of
+    penalties (one row per A/B candidate) yields one histogram per row.
+    """
+    if np is None:
+        counts = [0] * len(PENALTY_BUCKET_LABELS)
+        for penalty in penalties:
+            counts[penalty_bucket(penalty)] += 1
+        return counts
+
+    buckets = np.digitize(np.asarray(penalties, dtype=float), PENALTY_BUCKET_EDGES, right=True)
+    return (buckets[..., None] == np.arange(len(PENALTY_BUCKET_LABELS))).sum(axis=-2)
+
+
+def top_overestimators(penalties, count=5):
+    """Indices of the largest penalties, ties kept in input order (like sorted(reverse=True))."""
+    if np is None:
+        order = sorted(range(len(penalties)), key=lambda i: penalties[i], reverse=True)
+        return order[:count]
+
+    return np.argsort(-np.asarray(penalties, dtype=float), kind='stable')[:count].tolist()
+
+
+def calculate_weighted_grades(self_grades, base_grades,
+                              coefficient_a=SCALE_COEFFICIENT_A, exponent_b=SCALE_EXPONENT_B):
+    """
+    Batch version of calculate_weighted_grade.
+
+    Returns a dict with:
+        weighted  - round(weighted, 2) per student
+        display   - math.ceil of the rounded grade (what goes into Moodle)
+        penalty   - base_grade - weighted
+        buckets   - penalty_histogram() counts (last axis = students)
+
+    With NumPy all inputs broadcast, e.g. coefficient_a of shape (k, 1) against
+    n students gives (k, n) results for a parameter sweep.
+    """
+    if np is None:
+        return _calculate_weighted_grades_loop(self_grades, base_grades, coefficient_a, exponent_b)
+
+    self_grades = np.asarray(self_grades, dtype=float)
+    base_grades = np.asarray(base_grades, dtype=float)
+    coefficient_a = np.asarray(coefficient_a, dtype=float)
+    exponent_b = np.asarray(exponent_b, dtype=float)
+
+    scale = coefficient_a * np.exp(exponent_b * self_grades)
+    overestimated = self_grades > base_grades
+    penalized = np.maximum(0, base_grades - (self_grades - base_grades) * scale)
+    raw = np.where(overestimated, penalized, base_grades)
+
+    weighted = np.round(raw, 2)
+
+    # np.round scales by 100 before rounding, which can differ from Python's
+    # correctly rounded round() (and np.exp from math.exp by an ulp) right at
+    # a .5 boundary. Recompute just those elements with the scalar formula.
+    scaled = raw * 100
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < _ROUNDING_TOLERANCE
+    if ambiguous.any():
+        s, base, a, b = np.broadcast_arrays(self_grades, base_grades, coefficient_a, exponent_b)
+        for idx in zip(*np.nonzero(ambiguous)):
+            weighted[idx] = calculate_weighted_grade(float(s[idx]), float(base[idx]),
+                                                     float(a[idx]), float(b[idx]))
+
+    penalty = base_grades - weighted
+
+    return {
+        'weighted': weighted,
+        'display': np.ceil(weighted).astype(int),
+        'penalty': penalty,
+        'buckets': penalty_histogram(penalty),
+    }
+
+
+def _calculate_weighted_grades_loop(self_grades, base_grades, coefficient_a, exponent_b):
+    """Pure-Python fallback for calculate_weighted_grades (scalar constants only)."""
+    if not isinstance(coefficient_a, (int, float)) or not isinstance(exponent_b, (int, float)):
+        raise RuntimeError("NumPy is required to evaluate several A/B constants at once")
+
+    weighted = [calculate_weighted_grade(self_grade, base_grade, coefficient_a, exponent_b)
+                for self_grade, base_grade in zip(self_grades, base_grades)]
+    penalty = [base_grade - grade for base_grade, grade in zip(base_grades, weighted)]
+
+    return {
+        'weighted': weighted,
+        'display': [math.ceil(grade) for grade in weighted],
+        'penalty': penalty,
+        'buckets': penalty_histogram(penalty),
+    }
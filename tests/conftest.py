@@ -0,0 +1,5 @@
+"""The grading scripts import each other as top-level modules."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "grading_scripts"))
@@ -0,0 +1,162 @@
+"""git_history against the git binary on generated repositories."""
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from git_history import OBJ_OFS_DELTA, OBJ_REF_DELTA, TYPE_NAMES, ObjectStore, PackFile, read_history
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+def git(repo, *args, env=None):
+    return subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True,
+                          env=env, text=True).stdout.strip()
+
+
+@pytest.fixture
+def git_env(tmp_path, monkeypatch):
+    """Isolate git from the user's configuration and fix identities and dates."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('GIT_CONFIG_NOSYSTEM', '1')
+    for who in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{who}_NAME', 'Student')
+        monkeypatch.setenv(f'GIT_{who}_EMAIL', 'student@example.com')
+        monkeypatch.setenv(f'GIT_{who}_DATE', '2025-11-04T12:00:00')
+    return os.environ.copy()
+
+
+@pytest.fixture
+def repo(tmp_path, git_env):
+    """
+    A repository with loose objects only: 12 commits on main editing a large
+    file (so repacking produces deltas), a merged feature branch, an
+    annotated tag and a lightweight tag on a commit no branch contains.
+    """
+    path = tmp_path / 'repo'
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+
+    lines = [f"line {i}: {'x' * 60}\n" for i in range(400)]
+    for number in range(12):
+        lines[number * 7] = f"changed in commit {number}\n"
+        (path / 'data.txt').write_text(''.join(lines))
+        git(path, 'add', '-A')
+        message = f"Add change number {number} to the data file\n\n" + "Details of the change.\n" * 20
+        git(path, 'commit', '-q', '-m', message)
+
+    git(path, 'checkout', '-q', '-b', 'feature')
+    (path / 'feature.py').write_text("print('feature')\n")
+    git(path, 'add', '-A')
+    git(path, 'commit', '-q', '-m', 'feat: add the feature module')
+    git(path, 'checkout', '-q', 'main')
+    git(path, 'merge', '-q', '--no-ff', '-m', 'Merge branch feature', 'feature')
+    git(path, 'tag', '-a', 'v1.0', '-m', 'First release')
+
+    # A commit reachable only through tags
+    git(path, 'checkout', '-q', '-b', 'experiment')
+    (path / 'experiment.txt').write_text("experiment\n")
+    git(path, 'add', '-A')
+    git(path, 'commit', '-q', '-m', 'Try an experiment that was abandoned')
+    git(path, 'tag', '-a', 'experiment-tag', '-m', 'Keep the experiment')
+    git(path, 'tag', 'experiment-light')
+    git(path, 'checkout', '-q', 'main')
+    git(path, 'branch', '-q', '-D', 'experiment')
+    return path
+
+
+def assert_matches_git(path):
+    history = read_history(path)
+    assert history is not None
+    assert history['commits'] == int(git(path, 'rev-list', '--all', '--count'))
+    assert history['merge_commits'] == int(git(path, 'rev-list', '--all', '--merges', '--count'))
+    assert history['missing_objects'] == 0
+    return history
+
+
+def assert_objects_match_git(path):
+    """Every object read through ObjectStore is byte-identical to `git cat-file`."""
+    shas = git(path, 'cat-file', '--batch-all-objects', '--batch-check=%(objectname) %(objecttype)').splitlines()
+    store = ObjectStore(path / '.git')
+    try:
+        for line in shas:
+            sha, obj_type = line.split()
+            expected = subprocess.run(['git', '-C', str(path), 'cat-file', obj_type, sha],
+                                      check=True, capture_output=True).stdout
+            assert store.read(bytes.fromhex(sha)) == (TYPE_NAMES[obj_type.encode()], expected), sha
+    finally:
+        store.close()
+    return len(shas)
+
+
+def pack_entry_types(path):
+    """Types of the entries of every pack, as stored (deltas not resolved)."""
+    types = set()
+    for idx_path in (path / '.git' / 'objects' / 'pack').glob('pack-*.idx'):
+        pack = PackFile(idx_path)
+        try:
+            for position in range(pack.count):
+                types.add((pack.pack[pack._offset_at(position)] >> 4) & 7)
+        finally:
+            pack.close()
+    return types
+
+
+def test_loose_objects(repo):
+    assert not list((repo / '.git' / 'objects' / 'pack').glob('*.pack'))
+    history = assert_matches_git(repo)
+    assert history['commits'] == 15
+    assert history['root_commits'] == 1
+    assert history['conventional_commits'] == 1
+    assert history['branches'] == ['feature', 'main']
+    assert assert_objects_match_git(repo) > 0
+
+
+def test_packed_and_gced(repo):
+    git(repo, 'gc', '-q', '--aggressive', '--prune=now')
+    loose = [d for d in (repo / '.git' / 'objects').iterdir() if d.name not in ('pack', 'info')]
+    assert not loose
+    assert (repo / '.git' / 'packed-refs').is_file()
+
+    history = assert_matches_git(repo)
+    assert history['commits'] == 15
+    assert_objects_match_git(repo)
+
+
+@pytest.mark.parametrize('offsets, delta_type', [('true', OBJ_OFS_DELTA), ('false', OBJ_REF_DELTA)])
+def test_deltas(repo, offsets, delta_type):
+    git(repo, '-c', f'repack.useDeltaBaseOffset={offsets}', 'repack', '-q', '-a', '-d', '-f')
+    git(repo, 'prune-packed')
+    assert delta_type in pack_entry_types(repo)
+
+    assert_matches_git(repo)
+    assert_objects_match_git(repo)
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_annotated_tags(repo, packed):
+    if packed:
+        git(repo, 'pack-refs', '--all')
+        assert not list((repo / '.git' / 'refs' / 'tags').iterdir())
+
+    history = assert_matches_git(repo)
+    assert history['tags'] == ['experiment-light', 'experiment-tag', 'v1.0']
+    # The abandoned experiment is only reachable through its tags
+    assert history['commits'] == 15
+
+
+def test_shallow_clone(repo, tmp_path):
+    clone = tmp_path / 'shallow'
+    subprocess.run(['git', 'clone', '-q', '--depth', '3', '--no-single-branch', repo.as_uri(), str(clone)],
+                   check=True, capture_output=True)
+    assert (clone / '.git' / 'shallow').is_file()
+
+    history = assert_matches_git(clone)
+    assert history['shallow']
+    assert history['commits'] < 15
+    assert history['root_commits'] >= 1
+
+
+def test_not_a_repository(tmp_path):
+    assert read_history(tmp_path) is None
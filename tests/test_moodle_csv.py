@@ -0,0 +1,119 @@
+"""moodle_csv round trips on the real Moodle export (BOM, CRLF records, quoted multi-line feedback)."""
+import json
+import math
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from moodle_csv import (
+    FEEDBACK_COLUMN, GRADE_COLUMN, ID_COLUMN, MODIFIED_COLUMN, WEIGHTED_COLUMN,
+    format_grade, merge_gradebook, open_writer, parse_student_id, read_rows,
+)
+from update_moodle_grades_assignment1 import OPENING_MESSAGE, generate_feedback_text, get_self_submitted_grade
+from weighted_grades import calculate_weighted_grade
+
+ROOT = Path(__file__).resolve().parent.parent
+EXPORT = ROOT / "work1-runi-grade-format.csv"
+STUDENT = "38984"
+
+pytestmark = pytest.mark.skipif(not EXPORT.is_file(), reason="Moodle export not available")
+
+
+def rows_of(path):
+    return list(read_rows(path))
+
+
+def test_export_format():
+    data = EXPORT.read_bytes()
+    assert data.startswith(b'\xef\xbb\xbf')
+    rows = rows_of(EXPORT)
+    assert rows[0][0] == ID_COLUMN
+    feedback = rows[0].index(FEEDBACK_COLUMN)
+    multi_line = [row[feedback] for row in rows[1:] if '\n' in row[feedback]]
+    assert multi_line and not any('\r' in text for text in multi_line)
+    # One CRLF per record; line breaks inside feedback are bare LF
+    assert data.count(b'\r\n') == len(rows)
+
+
+def test_rows_round_trip_byte_for_byte(tmp_path):
+    output = tmp_path / "copy.csv"
+    with open(output, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = open_writer(f)
+        for row in read_rows(EXPORT):
+            writer.writerow(row)
+    assert output.read_bytes() == EXPORT.read_bytes()
+
+
+def test_merge_without_assessments_is_byte_identical(tmp_path, capsys):
+    output = tmp_path / "FINAL.csv"
+    merge_gradebook(EXPORT, output, tmp_path / "submissions", tmp_path / "assessments", self_graded=False)
+    assert output.read_bytes() == EXPORT.read_bytes()
+
+
+@pytest.fixture
+def student_dirs(tmp_path):
+    """An assessment JSON and submission_info.xlsx for one student, from the repository's data."""
+    assessment = ROOT / "assessments_tier2_assignment1" / f"tier2_assessment_{STUDENT}.json"
+    folder = f"Participant_{STUDENT}_assignsubmission_file"
+    info = ROOT / "WorkSubmissions01" / folder / "submission_info.xlsx"
+    if not assessment.is_file() or not info.is_file():
+        pytest.skip("assignment 1 data not available")
+
+    assessments_dir = tmp_path / "assessments"
+    assessments_dir.mkdir()
+    data = json.loads(assessment.read_text(encoding='utf-8'))
+    # Quotes, commas and line breaks must survive quoting
+    data['assessment_date'] = 'יום שלישי, 4 נובמבר 2025, "8:39" PM'
+    (assessments_dir / assessment.name).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    submissions_dir = tmp_path / "submissions"
+    (submissions_dir / folder).mkdir(parents=True)
+    shutil.copy(info, submissions_dir / folder / "submission_info.xlsx")
+    return submissions_dir, assessments_dir, data
+
+
+def test_merge_round_trip(tmp_path, student_dirs, capsys):
+    submissions_dir, assessments_dir, assessment = student_dirs
+    output = tmp_path / "FINAL.csv"
+    # str paths are accepted as well as Path
+    merge_gradebook(str(EXPORT), str(output), str(submissions_dir), str(assessments_dir), self_graded=True)
+
+    source_rows = rows_of(EXPORT)
+    rows = rows_of(output)
+    header = rows[0]
+    assert header == source_rows[0] + [WEIGHTED_COLUMN]
+    assert len(rows) == len(source_rows)
+
+    data = output.read_bytes()
+    assert data.startswith(b'\xef\xbb\xbf')
+    assert data.count(b'\r\n') == len(rows)
+
+    column = {name: header.index(name) for name in (GRADE_COLUMN, MODIFIED_COLUMN, FEEDBACK_COLUMN, WEIGHTED_COLUMN)}
+    for source_row, row in zip(source_rows[1:], rows[1:]):
+        if parse_student_id(row[0]) != STUDENT:
+            assert row == source_row + ['']
+            continue
+
+        self_grade = get_self_submitted_grade(STUDENT, submissions_dir)
+        grade = self_grade if self_grade is not None else math.ceil(assessment['final_grade'])
+        assert row[column[GRADE_COLUMN]] == format_grade(grade)
+        assert row[column[MODIFIED_COLUMN]] == assessment['assessment_date']
+        assert row[column[FEEDBACK_COLUMN]] == OPENING_MESSAGE + generate_feedback_text(assessment)
+        assert '\n' in row[column[FEEDBACK_COLUMN]]
+        weighted = calculate_weighted_grade(grade, assessment.get('total_score', 0))
+        assert row[column[WEIGHTED_COLUMN]] == str(math.ceil(weighted))
+
+
+def test_merge_in_place_keeps_a_readable_mode(tmp_path, student_dirs, capsys):
+    submissions_dir, assessments_dir, _ = student_dirs
+    gradebook = tmp_path / "gradebook.csv"
+    shutil.copy(EXPORT, gradebook)
+    merge_gradebook(gradebook, gradebook, submissions_dir, assessments_dir, self_graded=True)
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert gradebook.stat().st_mode & 0o777 == 0o666 & ~umask
+    assert not list(tmp_path.glob(".moodle_*"))
+    assert rows_of(gradebook)[0][-1] == WEIGHTED_COLUMN
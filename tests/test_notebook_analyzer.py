@@ -0,0 +1,170 @@
+"""notebook_analyzer's incremental reader against json.load, at chunk sizes that split every token."""
+import base64
+import json
+
+import pytest
+
+import notebook_analyzer
+from notebook_analyzer import (
+    ANALYSIS_LIBRARIES, IMAGE_MIME_PREFIX, V3_IMAGE_KEYS, VISUALIZATION_LIBRARIES, _Reader, analyze_notebook,
+)
+
+CHUNK_SIZES = [1, 2, 3, 5, 17, 64, 1 << 16]
+
+STRINGS = [
+    "",
+    "plain",
+    'quote " and backslash \\ and slash /',
+    "escapes \b \f \n \r \t and \x01 control",
+    "accents café, Hebrew שלום",
+    "non-BMP 😀 𝔘𝔫𝔦 and a lone \u2028 separator",
+    "\\u0041 looks like an escape but is not",
+    "ends with a backslash \\",
+]
+
+VALUES = [
+    0, -12, 3.5e-7, 1e300, True, False, None,
+    [], {}, [[[]]], {"a": {"b": [1, "}", "]", {"c": "\\\""}]}},
+    {"text": STRINGS, "nested": [{"k": s} for s in STRINGS]},
+]
+
+
+def reader_for(tmp_path, data):
+    path = tmp_path / "value.json"
+    path.write_bytes(data)
+    return _Reader(open(path, 'rb'))
+
+
+@pytest.fixture(params=CHUNK_SIZES)
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(notebook_analyzer, 'CHUNK_SIZE', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('ensure_ascii', [True, False])
+@pytest.mark.parametrize('text', STRINGS)
+def test_read_string(tmp_path, chunk_size, text, ensure_ascii):
+    encoded = json.dumps(text, ensure_ascii=ensure_ascii).encode('utf-8')
+    reader = reader_for(tmp_path, encoded + b' ,')
+    assert reader.read_string(1 << 20) == json.loads(encoded)
+    assert reader.peek() == ord(',')
+    reader.f.close()
+
+
+@pytest.mark.parametrize('value', VALUES, ids=range(len(VALUES)))
+def test_skip_value(tmp_path, chunk_size, value):
+    reader = reader_for(tmp_path, json.dumps([value, "after"], ensure_ascii=False).encode('utf-8'))
+    items = reader.iter_array()
+    next(items)
+    reader.skip_value()
+    next(items)
+    assert reader.read_string(100) == "after"
+    assert next(items, 'done') == 'done'
+    reader.f.close()
+
+
+@pytest.mark.parametrize('value', [0, -12, 3.5e-7, 1e300, True, False, None])
+def test_read_scalar(tmp_path, chunk_size, value):
+    reader = reader_for(tmp_path, json.dumps(value).encode('ascii'))
+    assert reader.read_scalar() == value
+    reader.f.close()
+
+
+def reference_stats(notebook):
+    """The statistics analyze_notebook() reports, computed from json.load."""
+    stats = {
+        'cells': 0, 'code_cells': 0, 'markdown_cells': 0,
+        'outputs': 0, 'image_outputs': 0, 'error_outputs': 0,
+        'analysis_libraries': set(), 'visualization_libraries': set(),
+        'language': None, 'nbformat': notebook.get('nbformat'), 'error': None,
+    }
+    cells = list(notebook.get('cells', []))
+    for sheet in notebook.get('worksheets', []):
+        cells.extend(sheet.get('cells', []))
+
+    for cell in cells:
+        stats['cells'] += 1
+        source = cell.get('source', cell.get('input', ''))
+        sources = source if isinstance(source, list) else [source]
+        for output in cell.get('outputs', []):
+            stats['outputs'] += 1
+            stats['error_outputs'] += output.get('output_type') == 'error'
+            stats['image_outputs'] += sum(mime.startswith(IMAGE_MIME_PREFIX) for mime in output.get('data', {}))
+            stats['image_outputs'] += sum(key in output for key in V3_IMAGE_KEYS)
+        if cell.get('cell_type') == 'code':
+            stats['code_cells'] += 1
+            for text in sources:
+                stats['analysis_libraries'].update(m.group(1) for m in ANALYSIS_LIBRARIES.finditer(text))
+                stats['visualization_libraries'].update(m.group(1) or 'matplotlib'
+                                                        for m in VISUALIZATION_LIBRARIES.finditer(text))
+        elif cell.get('cell_type') in ('markdown', 'heading'):
+            stats['markdown_cells'] += 1
+
+    for section in ('kernelspec', 'language_info'):
+        for key, value in notebook.get('metadata', {}).get(section, {}).items():
+            if key in ('language', 'name') and isinstance(value, str) and not stats['language']:
+                stats['language'] = value
+
+    stats['analysis_libraries'] = sorted(stats['analysis_libraries'])
+    stats['visualization_libraries'] = sorted(stats['visualization_libraries'])
+    return stats
+
+
+PNG = base64.b64encode(bytes(range(256)) * 8).decode('ascii')
+
+NBFORMAT_4 = {
+    "metadata": {
+        "kernelspec": {"display_name": "Python 3 😀", "language": "python", "name": "python3"},
+        "language_info": {"name": "python", "version": "3.11"},
+    },
+    "nbformat": 4,
+    "nbformat_minor": 5,
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Results \"quoted\" \\ שלום 😀\n", "more"]},
+        {"cell_type": "code", "execution_count": 1, "metadata": {"tags": ["a]", "{b"]},
+         "source": "import pandas as pd\nimport numpy as np\npath = \"C:\\\\data\\\\x.csv\"",
+         "outputs": [{"output_type": "stream", "name": "stdout", "text": ["é\t\u2028 ok\n"]}]},
+        {"cell_type": "code", "execution_count": 2, "metadata": {},
+         "source": ["import seaborn as sns\n", "plt.plot([1, 2])\n"],
+         "outputs": [
+             {"output_type": "display_data", "metadata": {},
+              "data": {"text/plain": ["<Figure>"], "image/png": PNG}},
+             {"output_type": "error", "ename": "ValueError", "evalue": "bad \"value\"", "traceback": ["\u001b[0;31m"]},
+         ]},
+        {"cell_type": "raw", "metadata": {}, "source": []},
+    ],
+}
+
+NBFORMAT_3 = {
+    "metadata": {"name": "", "signature": "sha256:abc"},
+    "nbformat": 3,
+    "nbformat_minor": 0,
+    "worksheets": [{
+        "metadata": {},
+        "cells": [
+            {"cell_type": "heading", "level": 1, "metadata": {}, "source": ["Old notebook 𝔘"]},
+            {"cell_type": "code", "collapsed": False, "language": "python", "metadata": {},
+             "input": ["import scipy\n", "import matplotlib.pyplot as plt"],
+             "outputs": [{"output_type": "display_data", "png": PNG, "metadata": {}},
+                         {"output_type": "pyerr", "ename": "KeyError", "evalue": "'x'", "traceback": []}],
+             "prompt_number": 1},
+        ],
+    }],
+}
+
+
+@pytest.mark.parametrize('ensure_ascii', [True, False])
+@pytest.mark.parametrize('notebook', [NBFORMAT_4, NBFORMAT_3], ids=['nbformat4', 'nbformat3'])
+def test_analyze_matches_json_load(tmp_path, chunk_size, notebook, ensure_ascii):
+    path = tmp_path / "notebook.ipynb"
+    path.write_text(json.dumps(notebook, indent=1, ensure_ascii=ensure_ascii), encoding='utf-8')
+
+    stats = analyze_notebook(path)
+    assert stats == reference_stats(json.loads(path.read_bytes()))
+    assert stats['cells'] == len(notebook.get('cells', [])) + sum(len(s['cells']) for s in notebook.get('worksheets', []))
+
+
+def test_invalid_json_reports_an_error(tmp_path, chunk_size):
+    path = tmp_path / "broken.ipynb"
+    path.write_text('{"cells": [{"cell_type": "code", "source": "unterminated', encoding='utf-8')
+    assert analyze_notebook(path)['error']
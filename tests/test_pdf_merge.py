@@ -0,0 +1,144 @@
+"""pdf_merge round trips: pages, text, outlines, named destinations and a strict reparse."""
+import io
+import re
+
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject, NumberObject, create_string_object
+
+from pdf_merge import merge_pdfs
+
+
+def make_report(path, title, pages):
+    """
+    A PDF with one line of text per page, an outline item and a named
+    destination (/Names tree) per page, an old-style /Dests entry for the
+    last page, and a link on the first page that refers to the last by name.
+    """
+    text = io.BytesIO()
+    pdf = canvas.Canvas(text)
+    for number in range(1, pages + 1):
+        pdf.drawString(72, 720, f"{title} page {number}")
+        pdf.showPage()
+    pdf.save()
+
+    writer = PdfWriter()
+    for page in PdfReader(text).pages:
+        writer.add_page(page)
+    key = title.lower()
+    for number in range(pages):
+        writer.add_outline_item(f"{title} section {number + 1}", number)
+        writer.add_named_destination(f"{key}-{number + 1}", number)
+    writer._root_object[NameObject("/Dests")] = DictionaryObject({
+        NameObject(f"/{key}-appendix"): ArrayObject([writer.pages[-1].indirect_reference, NameObject("/Fit")]),
+    })
+    link = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Annot"),
+        NameObject("/Subtype"): NameObject("/Link"),
+        NameObject("/Rect"): ArrayObject([NumberObject(72), NumberObject(700), NumberObject(200), NumberObject(716)]),
+        NameObject("/Dest"): create_string_object(f"{key}-{pages}"),
+    }))
+    writer.pages[0][NameObject("/Annots")] = ArrayObject([link])
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    report = tmp_path / "report.pdf"
+    submission = tmp_path / "submission.pdf"
+    make_report(report, "Report", 3)
+    make_report(submission, "Submission", 2)
+    return report, submission
+
+
+def named_dests(reader):
+    """
+    {name: page index} of the /Dests dictionary and the /Names /Dests tree.
+    (PyPDF2's named_destinations skips the tree when /Dests is present.)
+    """
+    pages = {page.indirect_reference.idnum: number for number, page in enumerate(reader.pages)}
+    root = reader.trailer["/Root"].get_object()
+    found = {}
+    for name, dest in root.get("/Dests", {}).items():
+        found[name] = pages[dest[0].idnum]
+    tree = root.get("/Names", {}).get("/Dests", {}).get("/Names", [])
+    for name, dest in zip(tree[0::2], tree[1::2]):
+        found[str(name)] = pages[dest.get_object()[0].idnum]
+    return found
+
+
+def merged_reader(tmp_path, inputs):
+    output = tmp_path / "merged.pdf"
+    counts = merge_pdfs(output, inputs)
+    return output, counts, PdfReader(str(output), strict=True)
+
+
+def test_pages_and_text(tmp_path, inputs):
+    _, counts, reader = merged_reader(tmp_path, inputs)
+    assert counts == [3, 2]
+    assert len(reader.pages) == 5
+    texts = [page.extract_text() for page in reader.pages]
+    expected = [f"Report page {n}" for n in (1, 2, 3)] + [f"Submission page {n}" for n in (1, 2)]
+    for text, line in zip(texts, expected):
+        assert line in text
+
+
+def test_outline(tmp_path, inputs):
+    _, _, reader = merged_reader(tmp_path, inputs)
+    outline = [(entry.title, reader.get_destination_page_number(entry)) for entry in reader.outline]
+    assert outline == [
+        ("Report section 1", 0), ("Report section 2", 1), ("Report section 3", 2),
+        ("Submission section 1", 3), ("Submission section 2", 4),
+    ]
+
+
+def test_named_destinations(tmp_path, inputs):
+    _, _, reader = merged_reader(tmp_path, inputs)
+    dests = named_dests(reader)
+    assert dests["report-3"] == 2
+    assert dests["submission-1"] == 3
+    assert dests["/report-appendix"] == 2
+    assert dests["/submission-appendix"] == 4
+
+    # The link on the first page of each input still finds its target by name
+    for first_page, last_page in ((0, 2), (3, 4)):
+        link = reader.pages[first_page]["/Annots"][0].get_object()
+        assert dests[str(link["/Dest"])] == last_page
+
+
+def test_duplicate_names_keep_the_first(tmp_path, inputs):
+    report, _ = inputs
+    _, counts, reader = merged_reader(tmp_path, [report, report])
+    assert counts == [3, 3]
+    dests = named_dests(reader)
+    assert dests["report-2"] == 1
+
+
+def test_strict_reparse(tmp_path, inputs):
+    output, _, reader = merged_reader(tmp_path, inputs)
+    data = output.read_bytes()
+
+    # Every xref entry points at its own "N 0 obj" header
+    xref_offset = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+    assert data[xref_offset:].startswith(b"xref\n0 ")
+    size = int(reader.trailer["/Size"])
+    entries = data[xref_offset:].split(b"\n")[3:3 + size - 1]
+    for num, entry in enumerate(entries, start=1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b"%d 0 obj\n" % num)
+
+    for num in range(1, size):
+        assert reader.get_object(num) is not None
+    for page in reader.pages:
+        page.extract_text()
+
+
+def test_empty_input_list(tmp_path):
+    output, counts, reader = merged_reader(tmp_path, [])
+    assert counts == []
+    assert len(reader.pages) == 0